@@ -1,16 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends
+import hashlib
+import hmac
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request
+from fastapi.responses import PlainTextResponse
 from typing import List, Dict
 from datetime import datetime
-from ..automation.main import RealEstateAutomation
+from functools import lru_cache
+from automation.main import RealEstateAutomation
+from config import settings
+from services.llm_cache import llm_cache
+from services.messenger_ingest import MessengerIngestor
+from services.rate_governor import governor_metrics
 
 router = APIRouter()
-automation = RealEstateAutomation()
+
+
+@lru_cache()
+def get_automation() -> RealEstateAutomation:
+    """Build the automation stack on first request instead of at import time"""
+    return RealEstateAutomation()
+
+@lru_cache()
+def get_messenger_ingestor() -> MessengerIngestor:
+    return MessengerIngestor()
 
 @router.post("/properties")
 async def add_property(property_data: Dict):
     """Add a new property and process it through the automation system"""
     try:
-        result = await automation.process_new_property(property_data)
+        result = await get_automation().process_new_property(property_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -19,7 +36,7 @@ async def add_property(property_data: Dict):
 async def add_lead(lead_data: Dict):
     """Add a new lead and process it through the automation system"""
     try:
-        result = await automation.process_new_lead(lead_data)
+        result = await get_automation().process_new_lead(lead_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -28,7 +45,7 @@ async def add_lead(lead_data: Dict):
 async def schedule_appointment(appointment_data: Dict):
     """Schedule a property showing"""
     try:
-        result = await automation.schedule_property_showing(appointment_data)
+        result = await get_automation().schedule_property_showing(appointment_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,6 +54,7 @@ async def schedule_appointment(appointment_data: Dict):
 async def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
+        automation = get_automation()
         stats = {
             "total_properties": len(automation.lead_manager.properties),
             "total_leads": len(automation.lead_manager.leads),
@@ -46,4 +64,39 @@ async def get_dashboard_stats():
         }
         return stats
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+@router.get("/dashboard/rate-limits")
+async def get_rate_limit_metrics():
+    """Get outbound rate governor queue depth and wait times per provider"""
+    return governor_metrics()
+
+@router.get("/dashboard/llm-cache")
+async def get_llm_cache_metrics():
+    """Get GPT output cache hit rate and the tokens it saved"""
+    return llm_cache.metrics()
+
+@router.get("/messenger/webhook")
+async def verify_messenger_webhook(
+    mode: str = Query(..., alias="hub.mode"),
+    verify_token: str = Query(..., alias="hub.verify_token"),
+    challenge: str = Query(..., alias="hub.challenge")
+):
+    """Answer Facebook's webhook subscription check"""
+    if not settings.MESSENGER_VERIFY_TOKEN:
+        raise HTTPException(status_code=403, detail="Messenger webhook is not configured")
+    if mode != "subscribe" or not hmac.compare_digest(verify_token, settings.MESSENGER_VERIFY_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid verify token")
+    return PlainTextResponse(challenge)
+
+@router.post("/messenger/webhook")
+async def receive_messenger_webhook(request: Request, background_tasks: BackgroundTasks):
+    """Accept a Messenger delivery and process it after responding, as Facebook expects a fast 200"""
+    if not settings.FACEBOOK_APP_SECRET:
+        raise HTTPException(status_code=403, detail="Messenger webhook is not configured")
+    body = await request.body()
+    expected = "sha256=" + hmac.new(settings.FACEBOOK_APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(request.headers.get("X-Hub-Signature-256", ""), expected):
+        raise HTTPException(status_code=403, detail="Invalid signature")
+    background_tasks.add_task(get_messenger_ingestor().ingest, await request.json())
+    return {"status": "received"}
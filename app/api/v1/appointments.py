@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_active_user
+from app.core.serialization import orm_list_response
 from app.db.session import get_db
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.user import User
@@ -30,7 +31,7 @@ async def list_appointments(
         .limit(limit)
     )
     result = await db.execute(query)
-    return result.scalars().all()
+    return orm_list_response(result.scalars().all(), AppointmentSchema)
 
 
 @router.post("/", response_model=AppointmentSchema, status_code=status.HTTP_201_CREATED)
@@ -1,7 +1,15 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_active_user
+from app.core.conditional import (
+    collection_etag,
+    is_not_modified,
+    not_modified_response,
+    resource_etag,
+    validator_headers,
+)
+from app.core.serialization import ExportFormat, export_response, orm_list_response
 from app.db.session import get_db
 from app.db.repositories.lead import LeadRepository
 from app.models.lead import LeadStatus
@@ -14,6 +22,7 @@ lead_repo = LeadRepository()
 
 @router.get("/", response_model=List[LeadSchema])
 async def list_leads(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     status: Optional[LeadStatus] = None,
@@ -21,9 +30,32 @@ async def list_leads(
     current_user: User = Depends(get_current_active_user),
 ):
     """List leads, optionally filtered by status."""
+    version = await lead_repo.get_status_version(db, status=status)
+    etag = collection_etag(version.count, version.last_modified, request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
     if status:
-        return await lead_repo.get_by_status(db, status=status, skip=skip, limit=limit)
-    return await lead_repo.get_multi(db, skip=skip, limit=limit)
+        leads = await lead_repo.get_by_status(db, status=status, skip=skip, limit=limit)
+    else:
+        leads = await lead_repo.get_multi(db, skip=skip, limit=limit)
+    return orm_list_response(
+        leads, LeadSchema, headers=validator_headers(etag)
+    )
+
+
+@router.get("/export")
+async def export_leads(
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    status: Optional[LeadStatus] = None,
+    agent_id: Optional[int] = None,
+    source: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stream every lead matching the filters as NDJSON or CSV."""
+    rows = lead_repo.stream_filtered(db, status=status, agent_id=agent_id, source=source)
+    return export_response(rows, LeadSchema, fmt=format, filename="leads", compress=gzip)
 
 
 @router.post("/", response_model=LeadSchema, status_code=status.HTTP_201_CREATED)
@@ -45,6 +77,8 @@ async def create_lead(
 @router.get("/{lead_id}", response_model=LeadSchema)
 async def read_lead(
     lead_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -55,6 +89,10 @@ async def read_lead(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lead not found",
         )
+    etag = resource_etag(lead)
+    if is_not_modified(request, etag, lead.updated_at):
+        return not_modified_response(etag, lead.updated_at)
+    response.headers.update(validator_headers(etag, lead.updated_at))
     return lead
 
 
@@ -1,25 +1,112 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Awaitable, Callable, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_active_user
+from app.core.conditional import (
+    collection_etag,
+    is_not_modified,
+    not_modified_response,
+    resource_etag,
+    validator_headers,
+)
+from app.core.cache import response_cache
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.serialization import (
+    ExportFormat,
+    export_response,
+    orm_list_response,
+    row_to_dict,
+)
 from app.db.session import get_db
+from app.db.repositories.base import CollectionVersion
 from app.db.repositories.property import PropertyRepository
+from app.models.property import Property
 from app.models.user import User
-from app.schemas.property import Property as PropertySchema, PropertyCreate, PropertyUpdate
+from app.schemas.property import (
+    Property as PropertySchema,
+    PropertyCreate,
+    PropertyUpdate,
+    SimilarProperty,
+)
 
 router = APIRouter()
+settings = get_settings()
+logger = get_logger(__name__)
 property_repo = PropertyRepository()
 
 
+async def _cached_listing(
+    request: Request,
+    probe: Callable[[], Awaitable[CollectionVersion]],
+    load: Callable[[], Awaitable[List[Property]]],
+) -> Response:
+    """Serve a listing that is identical for every agent from the response cache.
+
+    On a miss the usual ETag probe runs, then the rows are loaded and the
+    serialized bytes are cached under surrogate keys for the collection and
+    for each listing in it. Cache-Control is ``private`` so only Redis, behind
+    the app's auth check, stores the authenticated body. Redis errors are
+    treated as a miss, or a skipped write, so an outage only costs speed.
+    """
+    key = response_cache.key_for(request)
+    try:
+        cached = await response_cache.get(key)
+    except RedisError as e:
+        logger.warning("listing_cache_read_failed", key=key, error=str(e))
+        cached = None
+    if cached is not None:
+        etag = cached.headers["ETag"]
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        return cached.to_response()
+
+    version = await probe()
+    etag = collection_etag(version.count, version.last_modified, request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    properties = await load()
+    surrogate_keys = ["properties", *(f"property:{prop.id}" for prop in properties)]
+    headers = {
+        **validator_headers(etag),
+        "Cache-Control": f"private, max-age={settings.LISTING_CACHE_TTL}",
+        "Vary": "Authorization",
+        "Surrogate-Key": " ".join(surrogate_keys),
+    }
+    response = orm_list_response(properties, PropertySchema, headers=headers)
+    try:
+        await response_cache.set(
+            key,
+            response.body,
+            headers=headers,
+            surrogate_keys=surrogate_keys,
+            expire=settings.LISTING_CACHE_TTL,
+        )
+    except RedisError as e:
+        logger.warning("listing_cache_write_failed", key=key, error=str(e))
+    return response
+
+
 @router.get("/", response_model=List[PropertySchema])
 async def list_properties(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """List all properties."""
-    return await property_repo.get_multi(db, skip=skip, limit=limit)
+    version = await property_repo.get_version(db)
+    etag = collection_etag(version.count, version.last_modified, request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    properties = await property_repo.get_multi(db, skip=skip, limit=limit)
+    return orm_list_response(
+        properties, PropertySchema, headers=validator_headers(etag)
+    )
 
 
 @router.post("/", response_model=PropertySchema, status_code=status.HTTP_201_CREATED)
@@ -34,6 +121,7 @@ async def create_property(
 
 @router.get("/search", response_model=List[PropertySchema])
 async def search_properties(
+    request: Request,
     q: str = "",
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
@@ -47,8 +135,7 @@ async def search_properties(
     current_user: User = Depends(get_current_active_user),
 ):
     """Search properties with filters."""
-    return await property_repo.search(
-        db,
+    filters = dict(
         query=q,
         min_price=min_price,
         max_price=max_price,
@@ -56,24 +143,60 @@ async def search_properties(
         property_type=property_type,
         bedrooms=bedrooms,
         bathrooms=bathrooms,
-        skip=skip,
-        limit=limit,
+    )
+    return await _cached_listing(
+        request,
+        probe=lambda: property_repo.get_search_version(db, **filters),
+        load=lambda: property_repo.search(db, skip=skip, limit=limit, **filters),
     )
 
 
 @router.get("/featured", response_model=List[PropertySchema])
 async def featured_properties(
+    request: Request,
     limit: int = 10,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get featured (most recent available) properties."""
-    return await property_repo.get_featured(db, limit=limit)
+    return await _cached_listing(
+        request,
+        probe=lambda: property_repo.get_featured_version(db),
+        load=lambda: property_repo.get_featured(db, limit=limit),
+    )
+
+
+@router.get("/export")
+async def export_properties(
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    available: Optional[bool] = None,
+    property_type: Optional[str] = None,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    owner_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stream every property matching the filters as NDJSON or CSV."""
+    rows = property_repo.stream_filtered(
+        db,
+        available=available,
+        property_type=property_type,
+        location=location,
+        min_price=min_price,
+        max_price=max_price,
+        owner_id=owner_id,
+    )
+    return export_response(rows, PropertySchema, fmt=format, filename="properties", compress=gzip)
 
 
 @router.get("/{property_id}", response_model=PropertySchema)
 async def read_property(
     property_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -84,9 +207,36 @@ async def read_property(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found",
         )
+    etag = resource_etag(prop)
+    if is_not_modified(request, etag, prop.updated_at):
+        return not_modified_response(etag, prop.updated_at)
+    response.headers.update(validator_headers(etag, prop.updated_at))
     return prop
 
 
+@router.get("/{property_id}/similar", response_model=List[SimilarProperty])
+async def similar_properties(
+    property_id: int,
+    limit: int = 5,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get the available properties most similar to this one."""
+    # Imported here so numpy stays off the startup path
+    from utils.similarity import similarity_index
+
+    ranked = await similarity_index.similar_to(db, property_id=property_id, k=limit)
+    if ranked is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found",
+        )
+    fields = tuple(PropertySchema.model_fields)
+    return ORJSONResponse(
+        [{**row_to_dict(prop, fields), "similarity": score} for prop, score in ranked]
+    )
+
+
 @router.put("/{property_id}", response_model=PropertySchema)
 async def update_property(
     property_id: int,
@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_active_user, get_current_admin_user
+from app.core.serialization import orm_list_response
 from app.db.session import get_db
 from app.db.repositories.user import UserRepository
 from app.models.user import User
@@ -38,7 +39,8 @@ async def list_users(
     _: User = Depends(get_current_admin_user),
 ):
     """List all users (admin only)."""
-    return await user_repo.get_multi(db, skip=skip, limit=limit)
+    users = await user_repo.get_multi(db, skip=skip, limit=limit)
+    return orm_list_response(users, UserSchema)
 
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -1,18 +1,43 @@
-from typing import Any, Optional, Union
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
 from redis import asyncio as aioredis
+from fastapi import Request, Response
 from app.core.config import get_settings
+import hashlib
 import json
 from datetime import timedelta
 
 settings = get_settings()
 
-class RedisCache:
-    def __init__(self):
-        self.redis = aioredis.from_url(
+_redis_pool: Optional[aioredis.ConnectionPool] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return a client on the process-wide Redis connection pool.
+
+    The pool is created on first use (normally from the app lifespan), so
+    importing the app does not open any connections.
+    """
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = aioredis.ConnectionPool.from_url(
             f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
             encoding="utf8",
             decode_responses=True,
         )
+    return aioredis.Redis(connection_pool=_redis_pool)
+
+
+async def close_redis() -> None:
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.disconnect()
+        _redis_pool = None
+
+
+class RedisCache:
+    @property
+    def redis(self) -> aioredis.Redis:
+        return get_redis()
 
     async def get(self, key: str) -> Optional[Any]:
         value = await self.redis.get(key)
@@ -45,6 +70,81 @@ class RedisCache:
 
 cache = RedisCache()
 
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={**self.headers, "X-Cache": "HIT"},
+        )
+
+
+class ResponseCache:
+    """Serialized-response cache with surrogate-key purging.
+
+    Entries are stored as Redis hashes under ``response:<digest>`` and every
+    surrogate key (e.g. ``properties`` or ``property:42``) keeps a set of the
+    entries tagged with it, so a write can drop exactly the responses that
+    contained the listing it touched.
+    """
+
+    def __init__(self, backend: RedisCache, prefix: str = "response"):
+        self.backend = backend
+        self.prefix = prefix
+
+    def key_for(self, request: Request) -> str:
+        """Build a key from the path and the sorted, non-empty query params."""
+        params = sorted(
+            (name, value) for name, value in request.query_params.multi_items() if value != ""
+        )
+        raw = json.dumps([request.url.path, params])
+        return f"{self.prefix}:{hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()}"
+
+    def _tag_key(self, surrogate_key: str) -> str:
+        return f"{self.prefix}:surrogate:{surrogate_key}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = await self.backend.redis.hgetall(key)
+        if not entry:
+            return None
+        return CachedResponse(
+            body=entry["body"].encode(),
+            headers=json.loads(entry["headers"]),
+        )
+
+    async def set(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        headers: Dict[str, str],
+        surrogate_keys: Iterable[str],
+        expire: int,
+    ) -> None:
+        async with self.backend.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={"body": body.decode(), "headers": json.dumps(headers)})
+            pipe.expire(key, expire)
+            for surrogate_key in surrogate_keys:
+                tag_key = self._tag_key(surrogate_key)
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, expire)
+            await pipe.execute()
+
+    async def purge(self, *surrogate_keys: str) -> None:
+        """Delete every cached response tagged with any of ``surrogate_keys``."""
+        tag_keys = [self._tag_key(surrogate_key) for surrogate_key in surrogate_keys]
+        keys = set()
+        for tag_key in tag_keys:
+            keys.update(await self.backend.redis.smembers(tag_key))
+        await self.backend.redis.delete(*keys, *tag_keys)
+
+
+response_cache = ResponseCache(cache)
+
 def cache_key(*args: Any, **kwargs: Any) -> str:
     """Generate a cache key from function arguments."""
     key_parts = [str(arg) for arg in args]
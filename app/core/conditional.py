@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response, status
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    return f"{value.timestamp():.6f}" if value else "0"
+
+
+def resource_etag(obj: Any) -> str:
+    """Weak ETag for a single row, derived from its id and ``updated_at``."""
+    return f'W/"{obj.id}-{_timestamp(obj.updated_at)}"'
+
+
+def collection_etag(
+    count: int, last_modified: Optional[datetime], request: Request
+) -> str:
+    """Weak ETag for a filtered collection page.
+
+    The ``count``/``max(updated_at)`` pair changes on every insert, update or
+    delete that touches the filtered set; the query string ties the tag to
+    the requested page and filters. Collections are validated by ETag only:
+    ``max(updated_at)`` does not advance when a row is deleted or leaves the
+    filter, so they must not send Last-Modified or honour If-Modified-Since.
+    """
+    raw = f"{request.url.path}?{request.url.query}:{count}:{_timestamp(last_modified)}"
+    return f'W/"{hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    modified = http_date(last_modified)
+    if modified:
+        headers["Last-Modified"] = modified
+    return headers
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """Evaluate ``If-None-Match`` (weak comparison) then ``If-Modified-Since``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        wanted = _strip_weak(etag)
+        return any(_strip_weak(tag) == wanted for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates only carry whole seconds
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
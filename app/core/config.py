@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     # Redis Configuration
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    LISTING_CACHE_TTL: int = 30  # seconds
 
     # JWT Configuration
     SECRET_KEY: str
@@ -36,6 +37,8 @@ class Settings(BaseSettings):
 
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
+    # Fraction of high-volume events (e.g. rate-limit decisions) that are logged
+    LOG_SAMPLE_RATE: float = 0.01
 
     class Config:
         case_sensitive = True
@@ -1,24 +1,91 @@
+import atexit
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 import structlog
-from typing import Any, Dict
 from app.core.config import get_settings
 
 settings = get_settings()
 
-def get_logger(name: str) -> structlog.BoundLogger:
+_listener: Optional[QueueListener] = None
+
+
+class _PassThroughQueueHandler(QueueHandler):
+    """Enqueue records untouched so rendering happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def sample_events(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop events logged with ``sample_rate=<0..1>`` with probability ``1 - rate``."""
+    rate = event_dict.pop("sample_rate", None)
+    # Sampling only thins log volume; nothing security-relevant depends on it
+    if rate is not None and random.random() >= rate:  # nosec B311
+        raise structlog.DropEvent
+    return event_dict
+
+
+def configure_logging() -> None:
+    """Configure structlog and stdlib logging once per process.
+
+    Events are filtered by level and sampled on the calling task, then handed
+    to a queue; JSON rendering and the blocking stdout write happen on a
+    background listener thread so the event loop never waits on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    timestamper = structlog.processors.TimeStamper(fmt="iso")
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.UnicodeDecoder(),
+                structlog.processors.JSONRenderer(),
+            ],
+            foreign_pre_chain=[
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.add_logger_name,
+                timestamper,
+            ],
+        )
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [_PassThroughQueueHandler(log_queue)]
+    root.setLevel(level)
+
     structlog.configure(
         processors=[
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.add_log_level,
+            sample_events,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            timestamper,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        wrapper_class=structlog.make_filtering_bound_logger(settings.LOG_LEVEL),
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
+
+
+def get_logger(name: str) -> structlog.BoundLogger:
+    configure_logging()
     return structlog.get_logger(name)
 
 class LogContext:
@@ -0,0 +1,127 @@
+import csv
+import enum
+import io
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+def _schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def row_to_dict(row: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Copy the schema's fields straight off an ORM row."""
+    return {field: getattr(row, field) for field in fields}
+
+
+def rows_to_dicts(rows: Iterable[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    fields = _schema_fields(schema)
+    return [row_to_dict(row, fields) for row in rows]
+
+
+def orm_list_response(
+    rows: Iterable[Any],
+    schema: Type[BaseModel],
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> ORJSONResponse:
+    """Serialize trusted repository rows without re-validating them.
+
+    Rows loaded by our repositories already satisfy the response schema, so
+    the per-row ``from_attributes`` validation FastAPI does for
+    ``response_model`` is skipped. Only the schema's fields are emitted,
+    which keeps columns such as ``hashed_password`` out of the payload.
+    Keep ``response_model`` on the route for the OpenAPI docs.
+    """
+    return ORJSONResponse(
+        rows_to_dicts(rows, schema), status_code=status_code, headers=headers
+    )
+
+
+async def iter_ndjson(
+    rows: AsyncIterator[Any], schema: Type[BaseModel], batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    """Encode streamed rows as newline-delimited JSON, one chunk per batch."""
+    fields = _schema_fields(schema)
+    buffer: List[bytes] = []
+    async for row in rows:
+        buffer.append(orjson.dumps(row_to_dict(row, fields)))
+        if len(buffer) >= batch_size:
+            yield b"\n".join(buffer) + b"\n"
+            buffer.clear()
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+async def iter_csv(
+    rows: AsyncIterator[Any], schema: Type[BaseModel], batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    """Encode streamed rows as CSV with a header row; JSON columns are inlined."""
+    fields = _schema_fields(schema)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    pending = 0
+    async for row in rows:
+        writer.writerow([_csv_value(getattr(row, field)) for field in fields])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_response(
+    rows: AsyncIterator[Any],
+    schema: Type[BaseModel],
+    *,
+    fmt: ExportFormat,
+    filename: str,
+    compress: bool = False,
+) -> StreamingResponse:
+    """Stream rows as a chunked NDJSON or CSV download, optionally gzipped."""
+    encoder = iter_ndjson if fmt == ExportFormat.NDJSON else iter_csv
+    body = encoder(rows, schema)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"',
+    }
+    if compress:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=_EXPORT_MEDIA_TYPES[fmt], headers=headers)
@@ -1,7 +1,8 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Generic, List, NamedTuple, Optional, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.base import BaseModel as DBBaseModel
 
@@ -9,6 +10,11 @@ ModelType = TypeVar("ModelType", bound=DBBaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+class CollectionVersion(NamedTuple):
+    count: int
+    last_modified: Optional[datetime]
+
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -25,6 +31,36 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_version(self, db: AsyncSession, *criteria: Any) -> CollectionVersion:
+        """Cheap ``count``/``max(updated_at)`` probe used for collection ETags."""
+        query = select(
+            func.count(self.model.id), func.max(self.model.updated_at)
+        ).filter(*criteria)
+        result = await db.execute(query)
+        count, last_modified = result.one()
+        return CollectionVersion(count, last_modified)
+
+    async def stream(
+        self, db: AsyncSession, *criteria: Any, chunk_size: int = 1000
+    ) -> AsyncIterator[ModelType]:
+        """Yield every matching row through a server-side cursor.
+
+        Rows are fetched ``chunk_size`` at a time and expunged once yielded,
+        so memory stays flat no matter how many rows match.
+        """
+        query = (
+            select(self.model)
+            .filter(*criteria)
+            .order_by(self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await db.stream_scalars(query)
+        async for partition in result.partitions():
+            for obj in partition:
+                yield obj
+                # expunge_all() would swap out the identity map the cursor still loads into
+                db.expunge(obj)
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
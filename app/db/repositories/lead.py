@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import BaseRepository, CollectionVersion
 from app.models.lead import Lead, LeadStatus
 from app.schemas.lead import LeadCreate, LeadUpdate
 
@@ -33,6 +33,13 @@ class LeadRepository(BaseRepository[Lead, LeadCreate, LeadUpdate]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_status_version(
+        self, db: AsyncSession, *, status: Optional[LeadStatus] = None
+    ) -> CollectionVersion:
+        if status:
+            return await self.get_version(db, Lead.status == status)
+        return await self.get_version(db)
+
     async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[Lead]:
         query = select(Lead).filter(Lead.email == email)
         result = await db.execute(query)
@@ -56,6 +63,23 @@ class LeadRepository(BaseRepository[Lead, LeadCreate, LeadUpdate]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    def stream_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        status: Optional[LeadStatus] = None,
+        agent_id: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> AsyncIterator[Lead]:
+        conditions = []
+        if status:
+            conditions.append(Lead.status == status)
+        if agent_id is not None:
+            conditions.append(Lead.assigned_agent_id == agent_id)
+        if source:
+            conditions.append(Lead.source == source)
+        return self.stream(db, *conditions)
+
     async def update_status(
         self, db: AsyncSession, *, lead_id: int, status: LeadStatus
     ) -> Lead:
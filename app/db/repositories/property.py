@@ -1,14 +1,67 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from redis.exceptions import RedisError
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.repositories.base import BaseRepository
+from app.core.cache import response_cache
+from app.core.logging import get_logger
+from app.db.repositories.base import BaseRepository, CollectionVersion
 from app.models.property import Property
 from app.schemas.property import PropertyCreate, PropertyUpdate
 
+logger = get_logger(__name__)
+
+# Columns that search/featured filter or sort on; changing one of them can
+# move a listing into cached results it was not part of before.
+LISTING_FILTER_FIELDS = {
+    "title",
+    "description",
+    "price",
+    "location",
+    "property_type",
+    "bedrooms",
+    "bathrooms",
+    "available",
+}
+
+
 class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate]):
     def __init__(self):
         super().__init__(Property)
 
+    async def _purge_listings(self, *surrogate_keys: str) -> None:
+        try:
+            await response_cache.purge(*surrogate_keys)
+        except RedisError as e:
+            logger.warning("listing_cache_purge_failed", keys=surrogate_keys, error=str(e))
+
+    async def create(self, db: AsyncSession, *, obj_in: PropertyCreate) -> Property:
+        db_obj = await super().create(db, obj_in=obj_in)
+        await self._purge_listings("properties")
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Property,
+        obj_in: Union[PropertyUpdate, Dict[str, Any]]
+    ) -> Property:
+        if isinstance(obj_in, dict):
+            changed = set(obj_in)
+        else:
+            changed = set(obj_in.model_dump(exclude_unset=True))
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        if changed & LISTING_FILTER_FIELDS:
+            await self._purge_listings("properties")
+        else:
+            await self._purge_listings(f"property:{db_obj.id}")
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Property:
+        obj = await super().remove(db, id=id)
+        await self._purge_listings(f"property:{id}")
+        return obj
+
     async def get_by_owner(
         self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> List[Property]:
@@ -21,9 +74,8 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
         result = await db.execute(query)
         return result.scalars().all()
 
-    async def search(
+    def _search_conditions(
         self,
-        db: AsyncSession,
         *,
         query: str,
         min_price: Optional[float] = None,
@@ -32,9 +84,7 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
         property_type: Optional[str] = None,
         bedrooms: Optional[int] = None,
         bathrooms: Optional[int] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[Property]:
+    ) -> list:
         conditions = []
         
         if query:
@@ -64,6 +114,31 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
             conditions.append(Property.bathrooms >= bathrooms)
         
         conditions.append(Property.available == True)
+        return conditions
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        query: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        bedrooms: Optional[int] = None,
+        bathrooms: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Property]:
+        conditions = self._search_conditions(
+            query=query,
+            min_price=min_price,
+            max_price=max_price,
+            location=location,
+            property_type=property_type,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+        )
         
         query = (
             select(Property)
@@ -75,6 +150,35 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_search_version(self, db: AsyncSession, **filters) -> CollectionVersion:
+        return await self.get_version(db, *self._search_conditions(**filters))
+
+    def stream_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        available: Optional[bool] = None,
+        property_type: Optional[str] = None,
+        location: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        owner_id: Optional[int] = None,
+    ) -> AsyncIterator[Property]:
+        conditions = []
+        if available is not None:
+            conditions.append(Property.available == available)
+        if property_type:
+            conditions.append(Property.property_type == property_type)
+        if location:
+            conditions.append(Property.location.ilike(f"%{location}%"))
+        if min_price is not None:
+            conditions.append(Property.price >= min_price)
+        if max_price is not None:
+            conditions.append(Property.price <= max_price)
+        if owner_id is not None:
+            conditions.append(Property.owner_id == owner_id)
+        return self.stream(db, *conditions)
+
     async def get_by_mls_id(self, db: AsyncSession, *, mls_id: str) -> Optional[Property]:
         query = select(Property).filter(Property.mls_id == mls_id)
         result = await db.execute(query)
@@ -90,4 +194,7 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
             .limit(limit)
         )
         result = await db.execute(query)
-        return result.scalars().all() 
\ No newline at end of file
+        return result.scalars().all()
+
+    async def get_featured_version(self, db: AsyncSession) -> CollectionVersion:
+        return await self.get_version(db, Property.available == True)
@@ -1,11 +1,12 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from app.core.config import get_settings
 
 settings = get_settings()
 
-# Create async engine (expects postgresql+asyncpg:// URI)
+# Create async engine (expects postgresql+asyncpg:// URI); no connection is
+# opened until the first session checks one out
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     pool_pre_ping=True,
@@ -19,20 +20,26 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
-# Create sync engine for migrations (swap asyncpg back to psycopg2)
-_sync_uri = settings.SQLALCHEMY_DATABASE_URI.replace("+asyncpg", "")
-sync_engine = create_engine(
-    _sync_uri,
-    pool_pre_ping=True,
-    echo=settings.ENVIRONMENT == "development",
-)
 
-# Create sync session factory
-SessionLocal = sessionmaker(
-    sync_engine,
-    autocommit=False,
-    autoflush=False,
-)
+@lru_cache()
+def get_sync_engine():
+    """Sync engine for migrations, built on first use (swaps asyncpg back to psycopg2)."""
+    from sqlalchemy import create_engine
+
+    return create_engine(
+        settings.SQLALCHEMY_DATABASE_URI.replace("+asyncpg", ""),
+        pool_pre_ping=True,
+        echo=settings.ENVIRONMENT == "development",
+    )
+
+
+@lru_cache()
+def get_sync_sessionmaker() -> sessionmaker:
+    return sessionmaker(
+        get_sync_engine(),
+        autocommit=False,
+        autoflush=False,
+    )
 
 
 async def get_db():
@@ -46,7 +53,7 @@ async def get_db():
 
 def get_sync_db():
     """Dependency that yields a sync database session (for migrations)."""
-    db = SessionLocal()
+    db = get_sync_sessionmaker()()
     try:
         yield db
     finally:
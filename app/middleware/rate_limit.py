@@ -4,18 +4,18 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from redis import asyncio as aioredis
 from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.cache import get_redis
 from app.core.config import get_settings
+from app.core.logging import get_logger
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 
 class RateLimiter:
-    def __init__(self):
-        self.redis = aioredis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-            encoding="utf8",
-            decode_responses=True,
-        )
+    @property
+    def redis(self) -> aioredis.Redis:
+        return get_redis()
 
     async def is_rate_limited(
         self, key: str, limit: int, window: int
@@ -48,6 +48,12 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
     is_limited, remaining = await rate_limiter.is_rate_limited(key, limit, window)
 
     if is_limited:
+        logger.info(
+            "rate_limit_exceeded",
+            client_ip=client_ip,
+            limit=limit,
+            sample_rate=settings.LOG_SAMPLE_RATE,
+        )
         return JSONResponse(
             status_code=429,
             content={"detail": "Rate limit exceeded"},
@@ -59,6 +65,12 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
             },
         )
 
+    logger.debug(
+        "rate_limit_allowed",
+        client_ip=client_ip,
+        remaining=remaining,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+    )
     response = await call_next(request)
     response.headers["X-RateLimit-Remaining"] = str(remaining)
     response.headers["X-RateLimit-Limit"] = str(limit)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, String, ForeignKey, Enum
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Enum
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from .base import BaseModel
+import enum
+
+class PublicationStatus(str, enum.Enum):
+    PENDING = "pending"
+    PUBLISHED = "published"
+    FAILED = "failed"
+    MISSING = "missing"  # published by us but no longer listed upstream
+
+class MarketplacePublication(BaseModel):
+    __tablename__ = "marketplace_publications"
+
+    status = Column(Enum(PublicationStatus), default=PublicationStatus.PENDING, index=True)
+    listing_id = Column(String, unique=True, index=True)  # Facebook listing ID once published
+    photo_ids = Column(JSON)  # Facebook photo IDs attached to the listing
+    error = Column(String)  # last publishing error
+    attempts = Column(Integer, default=0)
+    published_at = Column(DateTime(timezone=True))
+    last_seen_at = Column(DateTime(timezone=True))  # last time a listing sync saw it upstream
+    upstream_status = Column(String)  # availability reported by Facebook
+
+    # Relationships
+    property_id = Column(Integer, ForeignKey("properties.id"), unique=True, index=True)
+    property = relationship("Property")
+
+class MarketplaceMedia(BaseModel):
+    __tablename__ = "marketplace_media"
+
+    content_hash = Column(String, unique=True, index=True)  # sha256 of the image bytes
+    source_url = Column(String, index=True)  # first URL the image was fetched from
+    photo_id = Column(String)  # Facebook photo ID of the uploaded (unpublished) image
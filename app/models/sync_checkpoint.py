@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from .base import BaseModel
+
+class SyncCheckpoint(BaseModel):
+    __tablename__ = "sync_checkpoints"
+    
+    name = Column(String, unique=True, index=True)  # e.g. "mls"
+    watermark = Column(DateTime(timezone=True))  # start of the last completed run
+    run_started_at = Column(DateTime(timezone=True))  # set while a run is in progress
+    updated_since = Column(DateTime(timezone=True))  # filter used by the in-progress run
+    next_page = Column(Integer, default=1)  # first page not yet persisted
+    total_pages = Column(Integer)
+    stats = Column(JSON)  # throughput figures from the last run
@@ -43,4 +43,7 @@ class Property(PropertyInDB):
 class PropertyWithStats(Property):
     views_count: int = 0
     appointments_count: int = 0
-    leads_count: int = 0 
\ No newline at end of file
+    leads_count: int = 0
+
+class SimilarProperty(Property):
+    similarity: float
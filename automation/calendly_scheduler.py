@@ -1,13 +1,16 @@
-import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 from datetime import datetime, timedelta
 from config import settings
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.resilience import get_policy, raise_for_retryable_status
 
 logger = logging.getLogger(__name__)
 
 class CalendlyScheduler:
-    def __init__(self):
+    def __init__(self, session_manager: Optional[HTTPSessionManager] = None):
+        self.http = session_manager or http_session_manager
+        self.policy = get_policy("calendly")
         self.api_key = settings.CALENDLY_API_KEY
         self.base_url = settings.CALENDLY_API_URL
         self.headers = {
@@ -20,24 +23,23 @@ class CalendlyScheduler:
         Schedule a property showing through Calendly
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Create scheduling link
-                scheduling_link = await self._create_scheduling_link(session, appointment_data)
-                
-                # Send scheduling link to lead
-                await self._send_scheduling_link(appointment_data["lead_email"], scheduling_link)
-                
-                logger.info(f"Successfully scheduled appointment for lead {appointment_data['lead_id']}")
-                return {
-                    "status": "success",
-                    "scheduling_link": scheduling_link
-                }
-                
+            # Create scheduling link
+            scheduling_link = await self._create_scheduling_link(appointment_data)
+            
+            # Send scheduling link to lead
+            await self._send_scheduling_link(appointment_data["lead_email"], scheduling_link)
+            
+            logger.info("Successfully scheduled appointment for lead %s", appointment_data['lead_id'])
+            return {
+                "status": "success",
+                "scheduling_link": scheduling_link
+            }
+            
         except Exception as e:
-            logger.error(f"Error scheduling appointment: {str(e)}")
+            logger.error("Error scheduling appointment: %s", e)
             return {"status": "error", "message": str(e)}
 
-    async def _create_scheduling_link(self, session: aiohttp.ClientSession, appointment_data: Dict) -> str:
+    async def _create_scheduling_link(self, appointment_data: Dict) -> str:
         """
         Create a scheduling link for the appointment
         """
@@ -52,13 +54,18 @@ class CalendlyScheduler:
             }]
         }
         
-        async with session.post(
-            f"{self.base_url}/scheduling_links",
-            headers=self.headers,
-            json=payload
-        ) as response:
-            data = await response.json()
-            return data["booking_url"]
+        async def request():
+            session = await self.http.get_session()
+            async with session.post(
+                f"{self.base_url}/scheduling_links",
+                headers=self.headers,
+                json=payload
+            ) as response:
+                raise_for_retryable_status(response)
+                data = await response.json()
+                return data["booking_url"]
+
+        return await self.policy.call(request, idempotent=False)
 
     async def _send_scheduling_link(self, email: str, scheduling_link: str) -> None:
         """
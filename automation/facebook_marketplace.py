@@ -1,14 +1,19 @@
-import facebook
-from typing import Dict, List
+from typing import Any, Dict, List
 import logging
 from datetime import datetime
 from config import settings
+from app.models.marketplace import PublicationStatus
+from services.facebook_graph import FacebookGraphClient
+from services.marketplace_publisher import MarketplacePublisher
+from services.marketplace_sync import MarketplaceSync
 
 logger = logging.getLogger(__name__)
 
 class FacebookMarketplaceBot:
     def __init__(self):
-        self.graph = facebook.GraphAPI(access_token=settings.FACEBOOK_APP_SECRET)
+        self.graph = FacebookGraphClient()
+        self.publisher = MarketplacePublisher(graph=self.graph)
+        self.sync = MarketplaceSync(graph=self.graph)
         self.api_version = settings.FACEBOOK_API_VERSION
 
     async def post_property(self, property_data: Dict) -> Dict:
@@ -16,43 +21,48 @@ class FacebookMarketplaceBot:
         Post a property to Facebook Marketplace
         """
         try:
-            # Format property data for Facebook
-            post_data = {
-                "message": f"{property_data['title']}\n\n{property_data['description']}\n\nPrice: ${property_data['price']:,}",
-                "attached_media": [],  # Add property images here
-                "targeting": {
-                    "geo_locations": {
-                        "countries": ["US"],
-                        "regions": [{"key": property_data['location']}]
-                    }
-                }
-            }
+            result = (await self.publisher.publish([property_data]))[property_data["id"]]
+            if result["status"] != PublicationStatus.PUBLISHED.value:
+                logger.error("Error posting property %s to Facebook Marketplace: %s", property_data['id'], result["error"])
+                return {"status": "error", "message": result["error"]}
             
-            # Post to Facebook Marketplace
-            response = self.graph.put_object(
-                parent_object="me",
-                connection_name="feed",
-                **post_data
-            )
-            
-            logger.info(f"Successfully posted property {property_data['id']} to Facebook Marketplace")
-            return {"status": "success", "post_id": response["id"]}
+            logger.info("Successfully posted property %s to Facebook Marketplace", property_data['id'])
+            return {"status": "success", "post_id": result["listing_id"]}
             
         except Exception as e:
-            logger.error(f"Error posting to Facebook Marketplace: {str(e)}")
+            logger.error("Error posting to Facebook Marketplace: %s", e)
             return {"status": "error", "message": str(e)}
 
+    async def post_properties(self, properties: List[Dict]) -> Dict[Any, Dict]:
+        """
+        Post many properties to Facebook Marketplace in one batched pass
+        """
+        return await self.publisher.publish(properties)
+
     async def get_marketplace_listings(self) -> List[Dict]:
         """
         Get current marketplace listings
         """
         try:
-            response = self.graph.get_connections(
-                "me",
-                "feed",
-                fields="message,created_time,attachments"
-            )
-            return response["data"]
+            listings = []
+            async for page in self.graph.iter_pages(
+                "me/marketplace_listings",
+                fields="id,title,price,availability,updated_time",
+                limit=settings.MARKETPLACE_SYNC_PAGE_SIZE
+            ):
+                listings.extend(page)
+            return listings
+        except Exception as e:
+            logger.error("Error fetching marketplace listings: %s", e)
+            return []
+
+    async def sync_marketplace_listings(self, full: bool = False) -> Dict:
+        """
+        Reconcile Marketplace listings with our publications; see MarketplaceSync
+        """
+        try:
+            stats = await self.sync.run(full=full)
+            return {"status": "success", **stats.as_dict()}
         except Exception as e:
-            logger.error(f"Error fetching marketplace listings: {str(e)}")
-            return [] 
\ No newline at end of file
+            logger.error("Error syncing marketplace listings: %s", e)
+            return {"status": "error", "message": str(e)}
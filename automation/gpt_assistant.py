@@ -1,13 +1,79 @@
-import openai
-from typing import Dict, List, Optional
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 import logging
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from config import settings
+from services.llm_gateway import CHARS_PER_TOKEN, LLMGateway, estimate_tokens, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
+LEAD_RESPONSE_FALLBACK = "Thank you for your interest. I'll be in touch shortly to help you find your perfect property."
+
+# Completion budget for match scoring: a fixed envelope plus one short JSON entry per candidate
+MATCH_TOKENS_BASE = 20
+MATCH_TOKENS_PER_CANDIDATE = 80
+
+# What a batched match request scores against its subject
+PROPERTY_CANDIDATES = "property"
+LEAD_CANDIDATES = "lead"
+
+class MatchScore(BaseModel):
+    id: str
+    score: int = Field(ge=0, le=100)
+    matched_features: List[str] = Field(default_factory=list)
+    concerns: List[str] = Field(default_factory=list)
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def coerce_id(cls, value):
+        return str(value)
+
+class MatchResponse(BaseModel):
+    matches: List[MatchScore]
+
+def _property_line(property_data: Dict) -> str:
+    return (
+        f"- id={property_data['id']} | {property_data.get('title', '')} | ${property_data['price']:,} | "
+        f"{property_data.get('location', '')} | {property_data.get('bedrooms', 'N/A')} bd / "
+        f"{property_data.get('bathrooms', 'N/A')} ba | {property_data.get('square_feet', 'N/A')} sqft | "
+        f"{property_data.get('description', '')}"
+    )
+
+def _lead_line(lead_data: Dict) -> str:
+    return f"- id={lead_data['id']} | {lead_data.get('preferences', {})}"
+
+def _summarize_match(match: MatchScore) -> str:
+    summary = f"Match score {match.score}/100."
+    if match.matched_features:
+        summary += f" Matches: {', '.join(match.matched_features)}."
+    if match.concerns:
+        summary += f" Concerns: {', '.join(match.concerns)}."
+    return summary
+
+def _match_result(lead_data: Dict, property_data: Dict, match: Optional[MatchScore]) -> Dict:
+    if match is None:
+        return {
+            "match_score": 0,
+            "matched_features": [],
+            "concerns": [],
+            "analysis": "Error analyzing property match",
+            "property_id": property_data["id"],
+            "lead_id": lead_data["id"]
+        }
+    return {
+        "match_score": match.score,
+        "matched_features": match.matched_features,
+        "concerns": match.concerns,
+        "analysis": _summarize_match(match),
+        "property_id": property_data["id"],
+        "lead_id": lead_data["id"]
+    }
+
 class GPTAssistant:
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, llm: Optional[LLMGateway] = None):
+        self.llm = llm or get_llm_gateway()
+        self._background: Set[asyncio.Task] = set()
         self.model = "gpt-4-turbo-preview"
 
     async def enhance_property_description(self, property_data: Dict) -> str:
@@ -15,7 +81,35 @@ class GPTAssistant:
         Enhance property description using GPT
         """
         try:
-            prompt = f"""
+            response = await self.llm.complete(
+                model=self.model,
+                messages=self._description_messages(property_data),
+                temperature=0.7,
+                max_tokens=500
+            )
+
+            return response.text
+
+        except Exception as e:
+            logger.error("Error enhancing property description: %s", e)
+            return property_data.get('description', '')
+
+    async def stream_property_description(self, property_data: Dict) -> AsyncIterator[str]:
+        """
+        Enhance property description using GPT, yielding text as it is generated
+        """
+        # aclosing releases the gateway's in-flight slot as soon as our consumer stops
+        async with aclosing(self.llm.stream(
+            model=self.model,
+            messages=self._description_messages(property_data),
+            temperature=0.7,
+            max_tokens=500
+        )) as deltas:
+            async for delta in deltas:
+                yield delta
+
+    def _description_messages(self, property_data: Dict) -> List[Dict[str, str]]:
+        prompt = f"""
             Create an engaging property description for a real estate listing with the following details:
             Title: {property_data['title']}
             Price: ${property_data['price']:,}
@@ -28,134 +122,244 @@ class GPTAssistant:
             Create a compelling description that highlights the property's best features and appeals to potential buyers.
             Include details about the neighborhood, lifestyle benefits, and unique selling points.
             """
+        return [
+            {"role": "system", "content": "You are a professional real estate copywriter."},
+            {"role": "user", "content": prompt}
+        ]
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional real estate copywriter."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-
-            return response.choices[0].message.content
-
-        except Exception as e:
-            logger.error(f"Error enhancing property description: {str(e)}")
-            return property_data.get('description', '')
-
-    async def generate_lead_response(self, lead_data: Dict, property_data: Optional[Dict] = None) -> str:
+    async def generate_lead_response(self,
+                                     lead_data: Dict,
+                                     property_data: Optional[Dict] = None,
+                                     cached_only: bool = False) -> str:
         """
         Generate personalized response for a lead
+
+        With ``cached_only`` a cached response is returned immediately; on a
+        miss the generic reply is returned and the response is generated in
+        the background so the next call hits the cache.
         """
+        request = {
+            "model": self.model,
+            "messages": self._lead_response_messages(lead_data, property_data),
+            "temperature": 0.7,
+            "max_tokens": 300
+        }
         try:
-            prompt = f"""
+            if cached_only:
+                cached = await self.llm.get_cached(**request)
+                if cached is not None:
+                    return cached.text
+                self._warm_cache(request)
+                return LEAD_RESPONSE_FALLBACK
+
+            response = await self.llm.complete(**request)
+
+            return response.text
+
+        except Exception as e:
+            logger.error("Error generating lead response: %s", e)
+            return LEAD_RESPONSE_FALLBACK
+
+    def _lead_response_messages(self, lead_data: Dict, property_data: Optional[Dict]) -> List[Dict[str, str]]:
+        prompt = f"""
             Create a personalized response for a potential real estate client with the following details:
             Name: {lead_data['name']}
             Preferences: {lead_data['preferences']}
             Status: {lead_data.get('status', 'new')}
             """
 
-            if property_data:
-                prompt += f"""
+        if property_data:
+            prompt += f"""
                 Property of Interest:
                 Title: {property_data['title']}
                 Price: ${property_data['price']:,}
                 Location: {property_data['location']}
                 """
 
-            prompt += """
+        prompt += """
             Create a friendly, professional response that:
             1. Acknowledges their interest
             2. Addresses their specific preferences
             3. Offers to help them find the perfect property
             4. Includes a clear call to action
             """
+        return [
+            {"role": "system", "content": "You are a professional real estate agent assistant."},
+            {"role": "user", "content": prompt}
+        ]
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional real estate agent assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
+    def _warm_cache(self, request: Dict) -> None:
+        async def warm():
+            try:
+                await self.llm.complete(**request)
+            except Exception as e:
+                logger.warning("Error warming GPT cache: %s", e)
 
-            return response.choices[0].message.content
+        task = asyncio.create_task(warm())
+        # Keep a reference until done so the task is not garbage collected
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
-        except Exception as e:
-            logger.error(f"Error generating lead response: {str(e)}")
-            return "Thank you for your interest. I'll be in touch shortly to help you find your perfect property."
+    async def invalidate_property_description(self, property_data: Dict) -> None:
+        """
+        Drop the cached enhanced description, e.g. after the property changed
+        """
+        await self.llm.bust(
+            model=self.model,
+            messages=self._description_messages(property_data),
+            temperature=0.7,
+            max_tokens=500
+        )
 
     async def analyze_property_match(self, lead_data: Dict, property_data: Dict) -> Dict:
         """
         Analyze how well a property matches a lead's preferences using GPT
         """
-        try:
-            prompt = f"""
-            Analyze how well this property matches the lead's preferences:
+        matches = await self.analyze_property_matches(lead_data, [property_data])
+        return matches[(str(lead_data["id"]), str(property_data["id"]))]
 
-            Lead Preferences:
-            {lead_data['preferences']}
-
-            Property Details:
-            Title: {property_data['title']}
-            Price: ${property_data['price']:,}
-            Location: {property_data['location']}
-            Bedrooms: {property_data.get('bedrooms', 'N/A')}
-            Bathrooms: {property_data.get('bathrooms', 'N/A')}
-            Square Feet: {property_data.get('square_feet', 'N/A')}
-            Description: {property_data.get('description', '')}
+    async def analyze_property_matches(self,
+                                       lead_data: Dict,
+                                       properties: List[Dict],
+                                       timeout: Optional[float] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Score one lead against many properties
 
-            Provide a detailed analysis including:
-            1. Match score (0-100)
-            2. Key matching features
-            3. Potential concerns
-            4. Recommendations for follow-up
-            """
+        Properties are packed into as few structured-output requests as fit
+        LEAD_MATCH_CONTEXT_TOKENS and LEAD_MATCH_BATCH_SIZE; the requests run
+        concurrently. With ``timeout``, requests still running after that
+        many seconds are cancelled and their pairs are left out of the
+        result, while finished ones are kept.
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a real estate matchmaking expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
+        Returns:
+            Dict of (str(lead_id), str(property_id)) to a match dict with
+            match_score (0-100), matched_features, concerns, analysis,
+            property_id and lead_id. Pairs missing from an invalid or failed
+            response score 0.
+        """
+        return await self._analyze_matches(lead_data, properties, PROPERTY_CANDIDATES, timeout)
 
-            analysis = response.choices[0].message.content
-            
-            # Parse the analysis into structured data
-            return {
-                "match_score": self._extract_match_score(analysis),
-                "analysis": analysis,
-                "property_id": property_data["id"],
-                "lead_id": lead_data["id"]
-            }
+    async def analyze_lead_matches(self,
+                                   property_data: Dict,
+                                   leads: List[Dict],
+                                   timeout: Optional[float] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Score many leads against one property; see analyze_property_matches
+        """
+        return await self._analyze_matches(property_data, leads, LEAD_CANDIDATES, timeout)
 
+    async def _analyze_matches(self,
+                               subject: Dict,
+                               candidates: List[Dict],
+                               kind: str,
+                               timeout: Optional[float] = None) -> Dict[Tuple[str, str], Dict]:
+        if not candidates:
+            return {}
+        render = _property_line if kind == PROPERTY_CANDIDATES else _lead_line
+        try:
+            lines = [render(candidate) for candidate in candidates]
+            chunks = self._chunk_candidates(subject, lines, kind)
         except Exception as e:
-            logger.error(f"Error analyzing property match: {str(e)}")
-            return {
-                "match_score": 0,
-                "analysis": "Error analyzing property match",
-                "property_id": property_data["id"],
-                "lead_id": lead_data["id"]
-            }
+            logger.error("Error analyzing property match: %s", e)
+            return self._pair_results(subject, candidates, kind, {})
+        tasks = [
+            asyncio.create_task(self._score_chunk(subject, candidates[start:end], lines[start:end], kind))
+            for start, end in chunks
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if pending:
+            logger.warning("%s of %s match requests missed the deadline", len(pending), len(tasks))
+        results = {}
+        for task in tasks:
+            if task in done:
+                results.update(task.result())
+        return results
 
-    def _extract_match_score(self, analysis: str) -> int:
+    def _chunk_candidates(self, subject: Dict, lines: List[str], kind: str) -> List[Tuple[int, int]]:
         """
-        Extract match score from GPT analysis
+        Split candidates into (start, end) ranges whose estimated prompt plus
+        completion tokens fit the match context budget
         """
+        budget = settings.LEAD_MATCH_CONTEXT_TOKENS
+        fixed = estimate_tokens(self._match_messages(subject, [], kind), MATCH_TOKENS_BASE)
+        chunks = []
+        start, used = 0, fixed
+        for index, line in enumerate(lines):
+            cost = len(line) // CHARS_PER_TOKEN + 1 + MATCH_TOKENS_PER_CANDIDATE
+            if index > start and (used + cost > budget or index - start >= settings.LEAD_MATCH_BATCH_SIZE):
+                chunks.append((start, index))
+                start, used = index, fixed
+            used += cost
+        if start < len(lines):
+            chunks.append((start, len(lines)))
+        return chunks
+
+    async def _score_chunk(self,
+                           subject: Dict,
+                           candidates: List[Dict],
+                           lines: List[str],
+                           kind: str) -> Dict[Tuple[str, str], Dict]:
         try:
-            # Look for a number between 0-100 in the analysis
-            import re
-            match = re.search(r'\b\d{1,3}\b', analysis)
-            if match:
-                score = int(match.group())
-                return min(max(score, 0), 100)  # Ensure score is between 0-100
-            return 50  # Default score if no number found
-        except:
-            return 50  # Default score if error occurs 
\ No newline at end of file
+            response = await self.llm.complete(
+                model=self.model,
+                messages=self._match_messages(subject, lines, kind),
+                temperature=0,
+                max_tokens=MATCH_TOKENS_BASE + MATCH_TOKENS_PER_CANDIDATE * len(candidates),
+                response_format={"type": "json_object"}
+            )
+            scored = {match.id: match for match in MatchResponse.model_validate_json(response.text).matches}
+        except ValidationError as e:
+            logger.error("Invalid match response for %s %s: %s", kind, subject.get("id"), e)
+            scored = {}
+        except Exception as e:
+            logger.error("Error analyzing property match: %s", e)
+            scored = {}
+
+        return self._pair_results(subject, candidates, kind, scored)
+
+    def _pair_results(self,
+                      subject: Dict,
+                      candidates: List[Dict],
+                      kind: str,
+                      scored: Dict[str, MatchScore]) -> Dict[Tuple[str, str], Dict]:
+        results = {}
+        for candidate in candidates:
+            lead_data, property_data = (subject, candidate) if kind == PROPERTY_CANDIDATES else (candidate, subject)
+            results[(str(lead_data["id"]), str(property_data["id"]))] = _match_result(
+                lead_data, property_data, scored.get(str(candidate["id"]))
+            )
+        return results
+
+    def _match_messages(self, subject: Dict, lines: List[str], kind: str) -> List[Dict[str, str]]:
+        listing = "\n".join(lines)
+        if kind == PROPERTY_CANDIDATES:
+            context = f"""Score how well each property matches the lead's preferences.
+
+            Lead Preferences:
+            {subject.get('preferences', {})}
+
+            Properties:
+            {listing}"""
+        else:
+            context = f"""Score how well the property matches each lead's preferences.
+
+            Property:
+            {_property_line(subject)}
+
+            Leads:
+            {listing}"""
+        prompt = f"""
+            {context}
+
+            Respond with a JSON object of the form
+            {{"matches": [{{"id": "...", "score": 0-100, "matched_features": ["..."], "concerns": ["..."]}}]}}
+            with one entry per {kind}, id being the {kind}'s id. Keep features and concerns to a few words each, at most three of each.
+            """
+        return [
+            {"role": "system", "content": "You are a real estate matchmaking expert. You answer in JSON."},
+            {"role": "user", "content": prompt}
+        ]
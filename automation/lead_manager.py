@@ -1,18 +1,28 @@
 import logging
 from typing import Dict, List
 from datetime import datetime
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from .lead_matcher import LeadMatcher
 
 logger = logging.getLogger(__name__)
 
 class LeadManager:
     def __init__(self):
         self.leads = []
-        self.vectorizer = TfidfVectorizer()
+        self._vectorizer = None
         self.property_vectors = None
         self.properties = []
+        self.matcher = LeadMatcher()
+
+    @property
+    def vectorizer(self):
+        """
+        TF-IDF vectorizer, imported on first use so scikit-learn is only loaded
+        when recommendations are actually computed
+        """
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer()
+        return self._vectorizer
 
     async def add_lead(self, lead_data: Dict) -> Dict:
         """
@@ -26,11 +36,12 @@ class LeadManager:
                 **lead_data
             }
             self.leads.append(lead)
+            self.matcher.add([lead])
             
             # Generate recommendations for the new lead
             recommendations = await self.get_recommendations(lead["id"])
             
-            logger.info(f"Successfully added lead {lead['id']}")
+            logger.info("Successfully added lead %s", lead['id'])
             return {
                 "status": "success",
                 "lead_id": lead["id"],
@@ -38,7 +49,7 @@ class LeadManager:
             }
             
         except Exception as e:
-            logger.error(f"Error adding lead: {str(e)}")
+            logger.error("Error adding lead: %s", e)
             return {"status": "error", "message": str(e)}
 
     async def update_lead_status(self, lead_id: str, new_status: str) -> Dict:
@@ -52,7 +63,7 @@ class LeadManager:
                 return {"status": "success", "message": "Lead status updated"}
             return {"status": "error", "message": "Lead not found"}
         except Exception as e:
-            logger.error(f"Error updating lead status: {str(e)}")
+            logger.error("Error updating lead status: %s", e)
             return {"status": "error", "message": str(e)}
 
     async def get_recommendations(self, lead_id: str) -> List[Dict]:
@@ -61,9 +72,11 @@ class LeadManager:
         """
         try:
             lead = next((l for l in self.leads if l["id"] == lead_id), None)
-            if not lead:
+            if not lead or self.property_vectors is None:
                 return []
 
+            from sklearn.metrics.pairwise import cosine_similarity
+
             # Convert lead preferences to text for vectorization
             preferences_text = f"{lead['preferences'].get('location', '')} {lead['preferences'].get('price_range', '')} {lead['preferences'].get('features', '')}"
             
@@ -80,7 +93,7 @@ class LeadManager:
             return recommendations
             
         except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
+            logger.error("Error generating recommendations: %s", e)
             return []
 
     def update_property_vectors(self, properties: List[Dict]):
@@ -0,0 +1,218 @@
+import logging
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stage-one weights; they sum to 1 so scores stay in [0, 1]
+PRICE_WEIGHT = 0.35
+LOCATION_WEIGHT = 0.25
+BEDROOMS_WEIGHT = 0.15
+TEXT_WEIGHT = 0.25
+
+# Score for a criterion the lead did not state
+UNKNOWN_SCORE = 0.5
+
+# How far outside the price range (as a fraction of the range's edge) the price score reaches zero
+PRICE_TOLERANCE = 0.25
+
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?\s*[kKmM]?")
+_BEDROOMS = re.compile(r"(\d+)\s*(?:bed|br\b|bd\b)", re.IGNORECASE)
+
+def _parse_amount(text: str) -> Optional[float]:
+    text = text.strip().replace(",", "")
+    multiplier = 1.0
+    if text[-1:] in "kK":
+        multiplier, text = 1e3, text[:-1]
+    elif text[-1:] in "mM":
+        multiplier, text = 1e6, text[:-1]
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return None
+
+def parse_price_range(value: Any) -> Tuple[float, float]:
+    """
+    Parse a price range like "300000-400000", "$300k - $400k" or [300000, 400000]
+
+    Returns:
+        (low, high), with NaN for unknown bounds
+    """
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        low, high = value
+        return float(low) if low is not None else math.nan, float(high) if high is not None else math.nan
+    if isinstance(value, (int, float)):
+        return math.nan, float(value)
+    amounts = [_parse_amount(m) for m in _NUMBER.findall(str(value or ""))]
+    amounts = [a for a in amounts if a is not None]
+    if len(amounts) >= 2:
+        return min(amounts[:2]), max(amounts[:2])
+    if len(amounts) == 1:
+        return math.nan, amounts[0]
+    return math.nan, math.nan
+
+def parse_bedrooms(preferences: Dict[str, Any]) -> float:
+    if preferences.get("bedrooms") is not None:
+        try:
+            return float(preferences["bedrooms"])
+        except (TypeError, ValueError):
+            pass
+    match = _BEDROOMS.search(str(preferences.get("features", "")))
+    return float(match.group(1)) if match else math.nan
+
+def lead_text(preferences: Dict[str, Any]) -> str:
+    return f"{preferences.get('location', '')} {preferences.get('property_type', '')} {preferences.get('features', '')}"
+
+def property_text(property_data: Dict[str, Any]) -> str:
+    return (
+        f"{property_data.get('location', '')} {property_data.get('property_type', '')} "
+        f"{property_data.get('title', '')} {property_data.get('description', '')}"
+    )
+
+class LeadMatcher:
+    """
+    First stage of lead matching: scores every lead against a property at once.
+
+    Lead preferences are parsed into arrays (price bounds, desired bedrooms,
+    location) and a hashed bag-of-words matrix when leads are added, so
+    scoring a property is a handful of vectorized operations over all leads
+    rather than one LLM call per lead. Only the best few leads are worth
+    sending to the LLM for a proper analysis. numpy, scipy and scikit-learn
+    are imported on first use, so importing the matcher stays cheap.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18):
+        self.n_features = n_features
+        self._vectorizer = None
+        self._pending: List[Dict[str, Any]] = []
+        self._leads: List[Dict[str, Any]] = []
+        # Built from the first leads flushed
+        self._price_low = None
+        self._price_high = None
+        self._bedrooms = None
+        self._locations = None
+        self._text = None
+
+    @property
+    def vectorizer(self):
+        """
+        Stateless hashing vectorizer, so new leads can be added without refitting;
+        scikit-learn is imported on first use
+        """
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(n_features=self.n_features, alternate_sign=False, norm="l2")
+        return self._vectorizer
+
+    def add(self, leads: List[Dict[str, Any]]) -> None:
+        """
+        Queue leads for indexing; they are folded into the arrays on the next score
+        """
+        self._pending.extend(leads)
+
+    def __len__(self) -> int:
+        return len(self._leads) + len(self._pending)
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        import numpy as np
+        from scipy.sparse import vstack
+
+        if self._price_low is None:
+            self._price_low = np.empty(0)
+            self._price_high = np.empty(0)
+            self._bedrooms = np.empty(0)
+            self._locations = np.empty(0, dtype=object)
+
+        leads, self._pending = self._pending, []
+        preferences = [lead.get("preferences") or {} for lead in leads]
+        bounds = np.array([parse_price_range(p.get("price_range")) for p in preferences], dtype=float).reshape(-1, 2)
+        self._price_low = np.concatenate([self._price_low, bounds[:, 0]])
+        self._price_high = np.concatenate([self._price_high, bounds[:, 1]])
+        self._bedrooms = np.concatenate([self._bedrooms, [parse_bedrooms(p) for p in preferences]])
+        self._locations = np.concatenate([
+            self._locations,
+            np.array([str(p.get("location") or "").strip().lower() for p in preferences], dtype=object)
+        ])
+        text = self.vectorizer.transform([lead_text(p) for p in preferences])
+        self._text = text if self._text is None else vstack([self._text, text]).tocsr()
+        self._leads.extend(leads)
+
+    def score(self, property_data: Dict[str, Any]) -> "np.ndarray":
+        """
+        Score every lead against a property
+
+        Args:
+            property_data: Property dictionary
+
+        Returns:
+            Array of scores in [0, 1], aligned with the order leads were added
+        """
+        import numpy as np
+
+        self._flush()
+        count = len(self._leads)
+        if not count:
+            return np.empty(0)
+
+        price = property_data.get("price")
+        if price is None:
+            price_score = np.full(count, UNKNOWN_SCORE)
+        else:
+            # A missing bound never penalizes
+            low = np.where(np.isnan(self._price_low), price, self._price_low)
+            high = np.where(np.isnan(self._price_high), price, self._price_high)
+            below = np.clip((low - price) / np.maximum(low * PRICE_TOLERANCE, 1.0), 0, None)
+            above = np.clip((price - high) / np.maximum(high * PRICE_TOLERANCE, 1.0), 0, None)
+            price_score = np.clip(1.0 - below - above, 0.0, 1.0)
+            price_score[np.isnan(self._price_low) & np.isnan(self._price_high)] = UNKNOWN_SCORE
+
+        bedrooms = property_data.get("bedrooms")
+        if bedrooms is None:
+            bedrooms_score = np.full(count, UNKNOWN_SCORE)
+        else:
+            bedrooms_score = np.where(
+                np.isnan(self._bedrooms),
+                UNKNOWN_SCORE,
+                (bedrooms >= self._bedrooms).astype(float)
+            )
+
+        location = str(property_data.get("location") or "").lower()
+        has_location = self._locations != ""
+        location_score = np.full(count, UNKNOWN_SCORE)
+        if has_location.any():
+            matched = np.fromiter(
+                (lead_location in location for lead_location in self._locations[has_location]),
+                dtype=bool
+            )
+            location_score[has_location] = matched.astype(float)
+
+        property_vector = self.vectorizer.transform([property_text(property_data)])
+        text_score = (self._text @ property_vector.T).toarray().ravel()
+
+        return (
+            PRICE_WEIGHT * price_score
+            + LOCATION_WEIGHT * location_score
+            + BEDROOMS_WEIGHT * bedrooms_score
+            + TEXT_WEIGHT * text_score
+        )
+
+    def top_k(self, property_data: Dict[str, Any], k: int, min_score: float = 0.0) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Best ``k`` leads for a property
+
+        Returns:
+            List of (lead, stage-one score) pairs, best first
+        """
+        import numpy as np
+
+        scores = self.score(property_data)
+        candidates = np.flatnonzero(scores >= min_score)
+        if not len(candidates) or k <= 0:
+            return []
+        k = min(k, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [(self._leads[i], float(scores[i])) for i in top]
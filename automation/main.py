@@ -1,12 +1,12 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .facebook_marketplace import FacebookMarketplaceBot
 from .calendly_scheduler import CalendlyScheduler
 from .lead_manager import LeadManager
-from .gpt_assistant import GPTAssistant
+from .gpt_assistant import GPTAssistant, LEAD_RESPONSE_FALLBACK
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -46,57 +46,80 @@ class RealEstateAutomation:
             }
             
         except Exception as e:
-            logger.error(f"Error processing new property: {str(e)}")
+            logger.error("Error processing new property: %s", e)
             return {"status": "error", "message": str(e)}
 
-    async def process_new_lead(self, lead_data: Dict) -> Dict:
+    async def process_new_lead(self, lead_data: Dict, deadline: Optional[float] = None) -> Dict:
         """
         Process a new lead
+
+        The welcome message, the match analyses and the consultation booking
+        run concurrently. GPT work still running after ``deadline`` seconds
+        (LEAD_PROCESSING_DEADLINE by default) is cancelled and the lead is
+        answered with what finished: the generic welcome message if it was
+        late, the analyses of the chunks that completed, and unanalyzed
+        recommendations after the analyzed ones. ``partial`` is set when
+        that happens.
         """
         try:
             # Add lead to system
             lead_result = await self.lead_manager.add_lead(lead_data)
             
             if lead_result["status"] == "success":
-                # Generate personalized welcome message
-                welcome_message = await self.gpt_assistant.generate_lead_response(lead_data)
-                
-                # Get recommendations for the lead
+                lead = {**lead_data, "id": lead_result["lead_id"]}
                 recommendations = lead_result["recommendations"]
+
+                timeout = deadline or settings.LEAD_PROCESSING_DEADLINE
+                welcome_task = asyncio.create_task(self.gpt_assistant.generate_lead_response(lead))
+                # Returns by the deadline with the pairs whose chunks finished
+                analysis_task = asyncio.create_task(
+                    self.gpt_assistant.analyze_property_matches(lead, recommendations, timeout=timeout)
+                )
                 
-                # Analyze matches with GPT
-                match_analysis = []
-                for property in recommendations:
-                    analysis = await self.gpt_assistant.analyze_property_match(lead_data, property)
-                    match_analysis.append(analysis)
-                
-                # Sort recommendations by match score
-                recommendations.sort(key=lambda x: next(
-                    (a["match_score"] for a in match_analysis if a["property_id"] == x["id"]), 0
-                ), reverse=True)
-                
-                # Schedule initial consultation if needed
+                # Schedule initial consultation if needed; it is not bound by the deadline
+                consultation_task = None
                 if lead_data.get("schedule_consultation", False):
-                    await self.calendly_scheduler.schedule_appointment({
+                    consultation_task = asyncio.create_task(self.calendly_scheduler.schedule_appointment({
                         "lead_id": lead_result["lead_id"],
                         "lead_name": lead_data["name"],
                         "lead_email": lead_data["email"],
                         "scheduled_time": datetime.now(),
                         "property_address": "Office Location"  # Replace with actual office location
-                    })
+                    }))
+
+                try:
+                    done, _ = await asyncio.wait([welcome_task], timeout=timeout)
+                    if welcome_task in done:
+                        welcome_message = welcome_task.result()
+                    else:
+                        logger.warning("Lead %s: welcome message missed the deadline", lead["id"])
+                        welcome_message = LEAD_RESPONSE_FALLBACK
+                    match_analysis = list((await analysis_task).values())
+                finally:
+                    welcome_task.cancel()
+                    analysis_task.cancel()
+                    if consultation_task is not None:
+                        # Let the booking finish either way; the scheduler reports its own errors
+                        await asyncio.gather(consultation_task, return_exceptions=True)
+
+                # Sort recommendations by match score; unanalyzed ones keep their order at the end
+                scores = {analysis["property_id"]: analysis["match_score"] for analysis in match_analysis}
+                recommendations = sorted(recommendations, key=lambda x: scores.get(x["id"], -1), reverse=True)
+                partial = welcome_task not in done or len(match_analysis) < len(recommendations)
                 
                 return {
                     "status": "success",
                     "lead_id": lead_result["lead_id"],
                     "welcome_message": welcome_message,
                     "recommendations": recommendations,
-                    "match_analysis": match_analysis
+                    "match_analysis": match_analysis,
+                    "partial": partial
                 }
             
             return lead_result
             
         except Exception as e:
-            logger.error(f"Error processing new lead: {str(e)}")
+            logger.error("Error processing new lead: %s", e)
             return {"status": "error", "message": str(e)}
 
     async def schedule_property_showing(self, appointment_data: Dict) -> Dict:
@@ -126,19 +149,34 @@ class RealEstateAutomation:
             return result
             
         except Exception as e:
-            logger.error(f"Error scheduling property showing: {str(e)}")
+            logger.error("Error scheduling property showing: %s", e)
             return {"status": "error", "message": str(e)}
 
     async def _find_matching_leads(self, property_data: Dict) -> List[Dict]:
         """
         Find leads that might be interested in the property
+
+        Every lead is scored in one vectorized pass on price, location,
+        bedrooms and text similarity; only the best LEAD_MATCH_TOP_K are
+        analyzed by GPT, batched into as few requests as fit the context.
         """
-        matching_leads = []
-        for lead in self.lead_manager.leads:
-            analysis = await self.gpt_assistant.analyze_property_match(lead, property_data)
-            if analysis["match_score"] >= 70:  # Consider leads with match score >= 70
-                matching_leads.append(lead)
-        return matching_leads
+        try:
+            candidates = [
+                lead for lead, _ in self.lead_manager.matcher.top_k(
+                    property_data,
+                    settings.LEAD_MATCH_TOP_K,
+                    min_score=settings.LEAD_MATCH_MIN_PREFILTER_SCORE
+                )
+            ]
+            analyses = await self.gpt_assistant.analyze_lead_matches(property_data, candidates)
+        except Exception as e:
+            logger.error("Error finding matching leads for property %s: %s", property_data.get("id"), e)
+            return []
+        return [
+            lead for lead in candidates
+            if analyses.get((str(lead["id"]), str(property_data["id"])), {}).get("match_score", 0)
+            >= settings.LEAD_MATCH_THRESHOLD
+        ]
 
     async def _send_property_match_notification(self, lead: Dict, property_data: Dict) -> None:
         """
@@ -149,10 +187,10 @@ class RealEstateAutomation:
             message = await self.gpt_assistant.generate_lead_response(lead, property_data)
             
             # TODO: Implement actual notification sending (email, SMS, etc.)
-            logger.info(f"Would send notification to lead {lead['id']} about property {property_data['id']}")
+            logger.info("Would send notification to lead %s about property %s", lead['id'], property_data['id'])
             
         except Exception as e:
-            logger.error(f"Error sending property match notification: {str(e)}")
+            logger.error("Error sending property match notification: %s", e)
 
 # Example usage
 async def main():
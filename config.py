@@ -32,9 +32,81 @@ class Settings(BaseSettings):
     MLS_API_URL: str = "https://api.mls.com/v1"
     FOLLOWUPBOSS_API_URL: str = "https://api.followupboss.com/v1"
     
+    # MLS property details cache (seconds)
+    MLS_CACHE_TTL: int = int(os.getenv("MLS_CACHE_TTL", "300"))
+    MLS_CACHE_NEGATIVE_TTL: int = int(os.getenv("MLS_CACHE_NEGATIVE_TTL", "60"))
+    MLS_CACHE_RETENTION: int = int(os.getenv("MLS_CACHE_RETENTION", "86400"))  # kept for revalidation
+    MLS_CACHE_HOT_TTL: int = int(os.getenv("MLS_CACHE_HOT_TTL", "30"))
+    MLS_CACHE_HOT_SIZE: int = int(os.getenv("MLS_CACHE_HOT_SIZE", "2048"))
+    
+    # MLS bulk detail fetching
+    MLS_BATCH_SIZE: int = int(os.getenv("MLS_BATCH_SIZE", "50"))
+    MLS_FANOUT_CONCURRENCY: int = int(os.getenv("MLS_FANOUT_CONCURRENCY", "10"))
+    
+    # Shared HTTP client pool
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))  # seconds, whole request
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # seconds
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))  # seconds
+    
+    # MLS sync
+    MLS_SYNC_CONCURRENCY: int = int(os.getenv("MLS_SYNC_CONCURRENCY", "8"))  # pages in flight
+    MLS_SYNC_PAGE_SIZE: int = int(os.getenv("MLS_SYNC_PAGE_SIZE", "200"))
+    MLS_SYNC_UPSERT_BATCH: int = int(os.getenv("MLS_SYNC_UPSERT_BATCH", "1000"))  # rows per statement
+    
+    # Upstream resilience: per-provider timeouts, retries, circuit breakers and bulkheads
+    MLS_TIMEOUT: float = float(os.getenv("MLS_TIMEOUT", "10"))  # seconds per attempt
+    FOLLOWUPBOSS_TIMEOUT: float = float(os.getenv("FOLLOWUPBOSS_TIMEOUT", "10"))
+    CALENDLY_TIMEOUT: float = float(os.getenv("CALENDLY_TIMEOUT", "10"))
+    FACEBOOK_TIMEOUT: float = float(os.getenv("FACEBOOK_TIMEOUT", "15"))
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "30"))
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # idempotent calls only
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # seconds open
+    BULKHEAD_MAX_CONCURRENCY: int = int(os.getenv("BULKHEAD_MAX_CONCURRENCY", "20"))  # calls in flight per upstream
+    BULKHEAD_WAIT_TIMEOUT: float = float(os.getenv("BULKHEAD_WAIT_TIMEOUT", "1"))  # seconds to wait for a slot
+    
+    # Facebook Marketplace publishing
+    MARKETPLACE_UPLOAD_CONCURRENCY: int = int(os.getenv("MARKETPLACE_UPLOAD_CONCURRENCY", "5"))  # images in flight
+    MARKETPLACE_MAX_IMAGE_BYTES: int = int(os.getenv("MARKETPLACE_MAX_IMAGE_BYTES", str(10 * 1024 * 1024)))
+    MARKETPLACE_SYNC_PAGE_SIZE: int = int(os.getenv("MARKETPLACE_SYNC_PAGE_SIZE", "100"))
+    MARKETPLACE_SYNC_OVERLAP: int = int(os.getenv("MARKETPLACE_SYNC_OVERLAP", "300"))  # seconds re-read before the watermark
+    
+    # Messenger webhook
+    MESSENGER_VERIFY_TOKEN: str = os.getenv("MESSENGER_VERIFY_TOKEN", "")
+    MESSENGER_CONVERSATION_TTL: int = int(os.getenv("MESSENGER_CONVERSATION_TTL", "86400"))  # seconds
+    MESSENGER_INGEST_CONCURRENCY: int = int(os.getenv("MESSENGER_INGEST_CONCURRENCY", "20"))  # senders in flight
+    MESSENGER_LEAD_BATCH_SIZE: int = int(os.getenv("MESSENGER_LEAD_BATCH_SIZE", "500"))  # leads per insert
+    MESSENGER_LEAD_MAX_ATTEMPTS: int = int(os.getenv("MESSENGER_LEAD_MAX_ATTEMPTS", "5"))  # failed inserts before dead-lettering
+    
+    # OpenAI gateway
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")  # any OpenAI-compatible server; empty for api.openai.com
+    OPENAI_MAX_IN_FLIGHT: int = int(os.getenv("OPENAI_MAX_IN_FLIGHT", "8"))  # requests per process
+    OPENAI_TOKENS_PER_MINUTE: int = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "90000"))  # shared across replicas
+    OPENAI_TOKEN_BUDGET_MAX_WAIT: float = float(os.getenv("OPENAI_TOKEN_BUDGET_MAX_WAIT", "30"))  # seconds
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds a cached completion is reused
+    
+    # Lead matching
+    LEAD_MATCH_TOP_K: int = int(os.getenv("LEAD_MATCH_TOP_K", "20"))  # leads sent to GPT per property
+    LEAD_MATCH_MIN_PREFILTER_SCORE: float = float(os.getenv("LEAD_MATCH_MIN_PREFILTER_SCORE", "0.4"))  # 0-1, stage one
+    LEAD_MATCH_THRESHOLD: int = int(os.getenv("LEAD_MATCH_THRESHOLD", "70"))  # 0-100, GPT match score
+    LEAD_MATCH_BATCH_SIZE: int = int(os.getenv("LEAD_MATCH_BATCH_SIZE", "20"))  # candidates scored per GPT request
+    LEAD_MATCH_CONTEXT_TOKENS: int = int(os.getenv("LEAD_MATCH_CONTEXT_TOKENS", "8000"))  # prompt + completion per request
+    LEAD_PROCESSING_DEADLINE: float = float(os.getenv("LEAD_PROCESSING_DEADLINE", "15"))  # seconds of GPT work per new lead
+    
     # Rate limiting
     FACEBOOK_RATE_LIMIT: int = 200  # requests per hour
     CALENDLY_RATE_LIMIT: int = 100  # requests per minute
+    FACEBOOK_RATE_BURST: int = int(os.getenv("FACEBOOK_RATE_BURST", "20"))  # bucket size
+    CALENDLY_RATE_BURST: int = int(os.getenv("CALENDLY_RATE_BURST", "10"))
+    FACEBOOK_RATE_MAX_WAIT: float = float(os.getenv("FACEBOOK_RATE_MAX_WAIT", "60"))  # seconds queued for a token
+    CALENDLY_RATE_MAX_WAIT: float = float(os.getenv("CALENDLY_RATE_MAX_WAIT", "10"))
+    # Send API replies have their own Messenger limit, separate from the Graph budget above
+    MESSENGER_RATE_LIMIT: int = int(os.getenv("MESSENGER_RATE_LIMIT", "250"))  # requests per second
+    MESSENGER_RATE_BURST: int = int(os.getenv("MESSENGER_RATE_BURST", "250"))
+    MESSENGER_RATE_MAX_WAIT: float = float(os.getenv("MESSENGER_RATE_MAX_WAIT", "5"))
     
     class Config:
         env_file = ".env"
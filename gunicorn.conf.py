@@ -0,0 +1,35 @@
+"""Gunicorn settings for the production API server.
+
+Every value can be overridden through the environment so the same image
+runs on machines of any size:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# One uvicorn worker per core by default; uvicorn[standard] brings uvloop
+# and httptools, which UvicornWorker picks up automatically.
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Recycle workers after a jittered number of requests so slow leaks cannot
+# accumulate and workers do not all restart at the same time.
+max_requests = _env_int("MAX_REQUESTS", 10000)
+max_requests_jitter = _env_int("MAX_REQUESTS_JITTER", 1000)
+
+# Graceful shutdown: in-flight requests get this long after SIGTERM.
+graceful_timeout = _env_int("GRACEFUL_TIMEOUT", 30)
+timeout = _env_int("WORKER_TIMEOUT", 60)
+keepalive = _env_int("KEEPALIVE", 5)
+
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
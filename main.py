@@ -2,23 +2,50 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
+from contextlib import asynccontextmanager
+import atexit
 import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from api.routes import router
 
 from config import settings
+from services.cache import close_redis
+from services.http_client import http_session_manager
 
-# Configure logging
+# Configure logging; records are written to stderr by a background listener
+# thread so handlers never block the event loop
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.basicConfig(
     level=settings.LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The pooled HTTP session and Redis pool are opened on first use and closed on shutdown
+    yield
+    await http_session_manager.close()
+    # Only close the LLM gateway if something created it; importing it here
+    # would load the OpenAI SDK just to shut it down
+    llm_gateway = sys.modules.get("services.llm_gateway")
+    if llm_gateway is not None and llm_gateway.get_llm_gateway.cache_info().currsize:
+        await llm_gateway.get_llm_gateway().close()
+    await close_redis()
+
 app = FastAPI(
     title="Real Estate Automation System",
     description="API for automating real estate processes",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -72,7 +99,7 @@ async def get_properties():
         # TODO: Implement property fetching from MLS
         return {"message": "Properties endpoint"}
     except Exception as e:
-        logger.error(f"Error fetching properties: {str(e)}")
+        logger.error("Error fetching properties: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching properties")
 
 @app.post("/properties/facebook")
@@ -82,7 +109,7 @@ async def post_to_facebook(property_id: str):
         # TODO: Implement Facebook Marketplace posting
         return {"message": "Property posted to Facebook"}
     except Exception as e:
-        logger.error(f"Error posting to Facebook: {str(e)}")
+        logger.error("Error posting to Facebook: %s", e)
         raise HTTPException(status_code=500, detail="Error posting to Facebook")
 
 @app.post("/leads")
@@ -92,7 +119,7 @@ async def create_lead(lead: Lead):
         # TODO: Implement lead creation and storage
         return {"message": "Lead created successfully"}
     except Exception as e:
-        logger.error(f"Error creating lead: {str(e)}")
+        logger.error("Error creating lead: %s", e)
         raise HTTPException(status_code=500, detail="Error creating lead")
 
 @app.post("/appointments")
@@ -102,7 +129,7 @@ async def schedule_appointment(appointment: Appointment):
         # TODO: Implement Calendly integration
         return {"message": "Appointment scheduled successfully"}
     except Exception as e:
-        logger.error(f"Error scheduling appointment: {str(e)}")
+        logger.error("Error scheduling appointment: %s", e)
         raise HTTPException(status_code=500, detail="Error scheduling appointment")
 
 @app.get("/recommendations/{lead_id}")
@@ -112,7 +139,7 @@ async def get_recommendations(lead_id: str):
         # TODO: Implement recommendation engine
         return {"message": "Recommendations endpoint"}
     except Exception as e:
-        logger.error(f"Error generating recommendations: {str(e)}")
+        logger.error("Error generating recommendations: %s", e)
         raise HTTPException(status_code=500, detail="Error generating recommendations")
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+"""
+Benchmark streaming lead exports (app.core.serialization.export_response).
+
+Seeds leads into the configured Postgres database, then drains the export
+body the way the server would, sampling the process RSS as it goes. Peak
+RSS should stay flat whatever the row count, since rows come through a
+server-side cursor and leave as encoded chunks. Needs the POSTGRES_*
+settings app.core.config reads; seeded rows are deleted afterwards.
+
+    python scripts/bench_export.py [--rows 10000 100000 1000000] [--format csv] [--gzip]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.serialization import ExportFormat, export_response  # noqa: E402
+from app.db.repositories.lead import LeadRepository  # noqa: E402
+from app.models import appointment, marketplace, property, user  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from app.schemas.lead import Lead as LeadSchema  # noqa: E402
+
+SOURCE = "bench-export"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+SEED_SQL = text("""
+    INSERT INTO leads (name, email, phone, source, status, preferences, notes, created_at, updated_at)
+    SELECT 'Lead ' || n, 'lead' || n || '@example.com', '555-0100', :source, 'NEW',
+           json_build_object('location', 'San Francisco', 'price_range', '300000-400000',
+                             'features', '3 bedrooms, garage, backyard'),
+           'Imported for the export benchmark', now(), now()
+    FROM generate_series(1, :count) AS n
+""")
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+async def seed(factory, count: int) -> None:
+    async with factory() as db:
+        await db.execute(delete(Lead).where(Lead.source == SOURCE))
+        await db.execute(SEED_SQL, {"source": SOURCE, "count": count})
+        await db.commit()
+
+async def export(factory, fmt: ExportFormat, compress: bool):
+    async with factory() as db:
+        rows = LeadRepository().stream_filtered(db, source=SOURCE)
+        response = export_response(rows, LeadSchema, fmt=fmt, filename="leads", compress=compress)
+        baseline = peak = rss_bytes()
+        sent = chunks = 0
+        started = time.perf_counter()
+        async for chunk in response.body_iterator:
+            sent += len(chunk)
+            chunks += 1
+            if chunks % 20 == 0:
+                peak = max(peak, rss_bytes())
+        return time.perf_counter() - started, sent, baseline, max(peak, rss_bytes())
+
+async def run(args) -> None:
+    engine = create_async_engine(get_settings().SQLALCHEMY_DATABASE_URI)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    fmt = ExportFormat(args.format)
+    try:
+        for count in args.rows:
+            await seed(factory, count)
+            elapsed, sent, baseline, peak = await export(factory, fmt, args.gzip)
+            print(
+                f"{count:>9} rows | {elapsed:6.1f} s | {count / elapsed:8.0f} rows/s | "
+                f"{sent / 2 ** 20:7.1f} MiB sent | RSS {baseline / 2 ** 20:6.1f} -> peak {peak / 2 ** 20:6.1f} MiB"
+            )
+    finally:
+        async with factory() as db:
+            await db.execute(delete(Lead).where(Lead.source == SOURCE))
+            await db.commit()
+        await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--format", choices=[f.value for f in ExportFormat], default=ExportFormat.NDJSON.value)
+    parser.add_argument("--gzip", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
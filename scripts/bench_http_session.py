@@ -0,0 +1,123 @@
+"""
+Benchmark per-call aiohttp sessions against the shared pooled session.
+
+Runs a local HTTPS stub of the MLS /properties endpoint with a throwaway
+self-signed certificate (made with the openssl CLI), then makes the same
+sequential calls two ways:
+
+- before: a new aiohttp.ClientSession per call, as the service clients did
+- after: MLSService on services.http_client's pooled session
+
+Reports the TCP+TLS connections the server accepted and per-call latency.
+
+    python scripts/bench_http_session.py [--calls 200] [--plain-http]
+"""
+import argparse
+import asyncio
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SETTINGS_DEFAULTS = {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "SECRET_KEY": "bench-http-session",
+}
+
+def make_certificate(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1",
+            "-keyout", key, "-out", cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+async def run(args, ssl_context) -> None:
+    # Imported here so aiohttp builds its default SSL context after SSL_CERT_FILE is set
+    import aiohttp
+    from aiohttp import web
+
+    from services.http_client import HTTPSessionManager
+    from services.mls_service import MLSService
+    from services.resilience import UpstreamPolicy
+
+    connections = set()
+
+    async def properties(request):
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"properties": [], "total": 0})
+
+    app = web.Application()
+    app.router.add_get("/properties", properties)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"{'https' if ssl_context else 'http'}://127.0.0.1:{port}"
+
+    async def per_call_session(page):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/properties", params={"page": page}) as response:
+                response.raise_for_status()
+                return await response.json()
+
+    session_manager = HTTPSessionManager()
+    service = MLSService(session_manager=session_manager)
+    service.base_url = base_url
+    service.policy = UpstreamPolicy("mls", timeout=10.0)
+
+    async def shared_session(page):
+        return await service.fetch_properties_page(page=page)
+
+    try:
+        for name, call in (("before", per_call_session), ("after", shared_session)):
+            connections.clear()
+            await call(0)  # warm up
+            timings = []
+            for page in range(args.calls):
+                started = time.perf_counter()
+                await call(page + 1)
+                timings.append(time.perf_counter() - started)
+            print(
+                f"{name:>6}: {len(connections):4d} connections for {args.calls + 1} calls | "
+                f"median {statistics.median(timings) * 1000:6.2f} ms | "
+                f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1000:6.2f} ms"
+            )
+    finally:
+        await session_manager.close()
+        await runner.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--plain-http", action="store_true", help="skip TLS (no openssl needed)")
+    args = parser.parse_args()
+    for name, value in SETTINGS_DEFAULTS.items():
+        os.environ.setdefault(name, value)
+
+    with tempfile.TemporaryDirectory() as directory:
+        ssl_context = None
+        if not args.plain_http:
+            cert, key = make_certificate(directory)
+            os.environ["SSL_CERT_FILE"] = cert
+            ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_context.load_cert_chain(cert, key)
+        asyncio.run(run(args, ssl_context))
+
+if __name__ == "__main__":
+    main()
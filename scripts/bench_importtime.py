@@ -0,0 +1,71 @@
+"""
+Measure the import cost of the legacy app and its automation stack with -X importtime.
+
+Imports each module in a fresh interpreter and reports the total and the
+heaviest imports. It also checks that the recommendation stack (pandas,
+scikit-learn, numpy, scipy) and the OpenAI SDK stay unloaded until they are
+used. Exits non-zero if one of them was loaded, or if --budget is exceeded.
+
+    python scripts/bench_importtime.py [--modules main automation.main] [--top 10] [--budget 1.0]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first recommendation or LLM call, never just to boot
+DEFERRED_MODULES = ("pandas", "sklearn", "numpy", "scipy", "openai")
+
+# app.core.config requires these; importing does not connect to anything
+SETTINGS_DEFAULTS = {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "SECRET_KEY": "bench-importtime",
+}
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import the module triggers"""
+    env = {**SETTINGS_DEFAULTS, **os.environ, "PYTHONPATH": ROOT}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(own), int(cumulative)))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["main", "automation.main"])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=None, help="fail if a module takes longer to import (s)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        entries = import_times(module)
+        total = next(cumulative for name, _, cumulative in entries if name == module) / 1e6
+        loaded = [name for name, _, _ in entries if name in DEFERRED_MODULES]
+        print(f"import {module}: {total:.2f} s, {len(entries)} modules")
+        print(f"  deferred modules imported: {', '.join(loaded) or 'none'}")
+        print("  heaviest (self time):")
+        for name, own, cumulative in sorted(entries, key=lambda e: -e[1])[:args.top]:
+            print(f"    {own / 1000:7.1f} ms self {cumulative / 1000:8.1f} ms cumulative  {name}")
+        failed = failed or bool(loaded) or (args.budget is not None and total > args.budget)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark stage-one lead matching (automation.lead_matcher.LeadMatcher).
+
+Indexes synthetic leads, then times scoring a property against all of them
+and picking the top K. Before the matcher, _find_matching_leads made one GPT
+call per lead; the last column shows how many calls remain.
+
+    python scripts/bench_lead_matcher.py [--leads 10000 100000] [--top-k 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.lead_matcher import LeadMatcher  # noqa: E402
+
+CITIES = ["San Francisco", "Oakland", "San Jose", "Austin", "Denver", "Seattle", "Portland", "Boston"]
+FEATURES = ["modern kitchen", "garage", "backyard", "pool", "hardwood floors", "view", "fireplace", "quiet street"]
+
+def synthetic_leads(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    leads = []
+    for i in range(count):
+        low = rng.randrange(150_000, 1_500_000, 25_000)
+        leads.append({
+            "id": str(i + 1),
+            "preferences": {
+                "location": rng.choice(CITIES),
+                "price_range": f"{low}-{low + rng.randrange(50_000, 400_000, 25_000)}",
+                "features": f"{rng.randint(1, 5)} bedrooms, " + ", ".join(rng.sample(FEATURES, 2)),
+            },
+        })
+    return leads
+
+PROPERTY = {
+    "id": "1",
+    "title": "Beautiful 3 Bedroom Home",
+    "description": "Modern home with updated kitchen, garage and a backyard",
+    "price": 350000,
+    "location": "San Francisco, CA",
+    "bedrooms": 3,
+}
+
+def run(count: int, top_k: int, repeats: int) -> None:
+    matcher = LeadMatcher()
+    matcher.add(synthetic_leads(count))
+
+    started = time.perf_counter()
+    matcher.score(PROPERTY)  # first call folds the leads into the arrays
+    index_time = time.perf_counter() - started
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        top = matcher.top_k(PROPERTY, top_k, min_score=0.4)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(
+        f"{count:>8} leads | index {index_time * 1000:8.1f} ms | "
+        f"score+top-{top_k} median {timings[len(timings) // 2] * 1000:7.2f} ms | "
+        f"GPT calls {count} -> {len(top)}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--leads", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for count in args.leads:
+        run(count, args.top_k, args.repeats)
+
+if __name__ == "__main__":
+    main()
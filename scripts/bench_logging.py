@@ -0,0 +1,149 @@
+"""
+Benchmark per-request logging overhead (app.core.logging).
+
+Each mode runs in a child process whose stdout is a pipe drained by this
+script, as it would be under Docker. The child times what the calling
+thread pays for the logging a typical request does: two info events, a
+rate-limit info event with sample_rate and a debug event below the level.
+
+- before: structlog rendering JSON and printing to stdout on the caller,
+  with no sampling (how get_logger was configured originally)
+- after: app.core.logging, which filters and samples on the caller and
+  renders and writes from a queue listener thread
+
+Each mode runs once with a reader that keeps up and once with one that
+pauses every 1000 lines.
+
+    python scripts/bench_logging.py [--requests 20000] [--stall-ms 20]
+"""
+import argparse
+import atexit
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETTINGS_DEFAULTS = {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "SECRET_KEY": "bench-logging",
+    "LOG_LEVEL": "INFO",
+    "LOG_SAMPLE_RATE": "0.01",
+}
+
+def before_logger():
+    import structlog
+
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(),
+        ],
+        context_class=dict,
+        logger_factory=structlog.PrintLoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        cache_logger_on_first_use=True,
+    )
+    return structlog.get_logger("bench"), lambda: None
+
+def after_logger():
+    from app.core import logging as app_logging
+
+    def drain():
+        # Waits for the listener to write everything queued so far
+        app_logging._listener.stop()
+        atexit.unregister(app_logging._listener.stop)
+
+    return app_logging.get_logger("bench"), drain
+
+def handle_request(logger, number: int) -> None:
+    logger.info("request_started", method="GET", path="/api/v1/properties", request_id=number)
+    logger.debug("rate_limit_allowed", client_ip="10.0.0.1", remaining=42, sample_rate=0.01)
+    logger.info("rate_limit_exceeded", client_ip="10.0.0.2", limit=100, sample_rate=0.01)
+    logger.info("request_finished", status=200, duration_ms=12.5, request_id=number)
+
+def child(mode: str, requests: int) -> None:
+    logger, drain = before_logger() if mode == "before" else after_logger()
+    for number in range(1000):
+        handle_request(logger, number)
+    timings = []
+    for number in range(requests):
+        started = time.perf_counter()
+        handle_request(logger, number)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    drain_started = time.perf_counter()
+    drain()
+    sys.stdout.flush()
+    result = {
+        "mean": sum(timings) / requests,
+        "p99": timings[int(requests * 0.99)],
+        "max": timings[-1],
+        "drain": time.perf_counter() - drain_started,
+    }
+    sys.stderr.write(json.dumps(result) + "\n")
+
+def run_mode(mode: str, requests: int, stall: float) -> dict:
+    env = {**SETTINGS_DEFAULTS, **os.environ, "PYTHONPATH": ROOT}
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, "--requests", str(requests)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    lines = 0
+
+    def consume():
+        # A stalling reader stands in for a log collector that falls behind
+        nonlocal lines
+        for _ in process.stdout:
+            lines += 1
+            if stall and lines % 1000 == 0:
+                time.sleep(stall)
+
+    reader = threading.Thread(target=consume)
+    reader.start()
+    stderr = process.stderr.read().decode()
+    process.wait()
+    reader.join()
+    if process.returncode:
+        raise RuntimeError(stderr)
+    result = json.loads(stderr.strip().splitlines()[-1])
+    result["lines"] = lines
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--stall-ms", type=float, default=20, help="reader pause every 1000 lines")
+    parser.add_argument("--child", choices=["before", "after"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.requests)
+        return
+
+    for stall in (0, args.stall_ms / 1000):
+        for mode in ("before", "after"):
+            result = run_mode(mode, args.requests, stall)
+            print(
+                f"{mode:>6}, reader stall {stall * 1000:3.0f} ms: "
+                f"caller mean {result['mean'] * 1e6:6.1f} us, p99 {result['p99'] * 1e6:7.1f} us, "
+                f"max {result['max'] * 1e3:6.1f} ms | "
+                f"{result['lines'] / (args.requests + 1000):4.2f} lines/request | "
+                f"listener drain {result['drain']:.2f} s"
+            )
+
+if __name__ == "__main__":
+    main()
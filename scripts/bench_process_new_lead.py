@@ -0,0 +1,145 @@
+"""
+Benchmark RealEstateAutomation.process_new_lead with a stubbed, delayed LLM.
+
+The LLM gateway is replaced by a stub that answers after an injected delay:
+lognormal jitter around --delay, with a --slow-rate share of requests taking
+--slow-factor times longer. Stage-one matching is stubbed too, so only the
+GPT pipeline is timed:
+
+- before: welcome message, then one match request per recommendation, in
+  sequence (the original pipeline)
+- after: process_new_lead, which runs them concurrently in batched
+  requests under --deadline and returns partial results when it passes
+
+    python scripts/bench_process_new_lead.py [--recommendations 5 20 50] [--delay 0.2] [--deadline 1.0]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for _name, _value in {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "SECRET_KEY": "bench-process-new-lead",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from automation.gpt_assistant import GPTAssistant  # noqa: E402
+from automation.main import RealEstateAutomation  # noqa: E402
+from services.llm_gateway import Completion  # noqa: E402
+
+_CANDIDATE_ID = re.compile(r"- id=(\S+) \|")
+
+class DelayedLLM:
+    """Stands in for LLMGateway.complete with injected latency"""
+
+    def __init__(self, delay: float, slow_rate: float, slow_factor: float, seed: int = 7):
+        self.delay = delay
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def complete(self, *, messages, response_format=None, **kwargs) -> Completion:
+        self.calls += 1
+        delay = self.delay * self.rng.lognormvariate(0, 0.25)
+        if self.rng.random() < self.slow_rate:
+            delay *= self.slow_factor
+        await asyncio.sleep(delay)
+        if response_format:
+            ids = _CANDIDATE_ID.findall(messages[-1]["content"])
+            text = json.dumps({"matches": [
+                {"id": candidate, "score": self.rng.randint(0, 100), "matched_features": ["garage"], "concerns": []}
+                for candidate in ids
+            ]})
+        else:
+            text = "Thanks for reaching out! Here are a few homes you might like."
+        return Completion(text=text, prompt_tokens=200, completion_tokens=100)
+
+class StubLeadManager:
+    def __init__(self, recommendations: int):
+        self.recommendations = [
+            {"id": str(i), "title": f"Listing {i}", "price": 350_000 + i * 1000, "location": "San Francisco, CA",
+             "bedrooms": 3, "bathrooms": 2, "square_feet": 1800, "description": "Updated kitchen, garage"}
+            for i in range(recommendations)
+        ]
+
+    async def add_lead(self, lead_data):
+        return {"status": "success", "lead_id": "lead-1", "recommendations": list(self.recommendations)}
+
+LEAD = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "preferences": {"location": "San Francisco", "price_range": "300000-400000", "features": "3 bedrooms, garage"},
+}
+
+async def before(automation: RealEstateAutomation) -> dict:
+    lead_result = await automation.lead_manager.add_lead(LEAD)
+    lead = {**LEAD, "id": lead_result["lead_id"]}
+    welcome_message = await automation.gpt_assistant.generate_lead_response(lead)
+    recommendations = lead_result["recommendations"]
+    match_analysis = []
+    for property_data in recommendations:
+        match_analysis.append(await automation.gpt_assistant.analyze_property_match(lead, property_data))
+    recommendations.sort(key=lambda x: next(
+        (a["match_score"] for a in match_analysis if a["property_id"] == x["id"]), 0
+    ), reverse=True)
+    return {"welcome_message": welcome_message, "match_analysis": match_analysis, "partial": False}
+
+async def after(automation: RealEstateAutomation, deadline: float) -> dict:
+    return await automation.process_new_lead(LEAD, deadline=deadline)
+
+async def measure(args, recommendations: int, pipeline: str):
+    timings, analyzed, partial, calls = [], [], 0, 0
+    for run in range(args.runs):
+        llm = DelayedLLM(args.delay, args.slow_rate, args.slow_factor, seed=run)
+        automation = RealEstateAutomation.__new__(RealEstateAutomation)
+        automation.lead_manager = StubLeadManager(recommendations)
+        automation.gpt_assistant = GPTAssistant(llm=llm)
+        started = time.perf_counter()
+        result = await (before(automation) if pipeline == "before" else after(automation, args.deadline))
+        timings.append(time.perf_counter() - started)
+        analyzed.append(len(result["match_analysis"]))
+        partial += bool(result.get("partial"))
+        calls += llm.calls
+    return timings, analyzed, partial, calls / args.runs
+
+async def run(args) -> None:
+    print(
+        f"LLM delay ~{args.delay * 1000:.0f} ms, {args.slow_rate:.0%} of requests x{args.slow_factor:g}; "
+        f"deadline {args.deadline:g} s; {args.runs} runs each"
+    )
+    for recommendations in args.recommendations:
+        for pipeline in ("before", "after"):
+            timings, analyzed, partial, calls = await measure(args, recommendations, pipeline)
+            print(
+                f"{recommendations:>3} recs {pipeline:>6}: median {statistics.median(timings):6.2f} s | "
+                f"max {max(timings):6.2f} s | {calls:5.1f} LLM calls | "
+                f"analyzed {min(analyzed)}-{max(analyzed)}/{recommendations} | partial {partial}/{args.runs}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recommendations", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--delay", type=float, default=0.2, help="typical LLM latency (s)")
+    parser.add_argument("--slow-rate", type=float, default=0.1)
+    parser.add_argument("--slow-factor", type=float, default=10)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=5)
+    # Missed-deadline warnings are expected here; the summary counts them
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark list-endpoint serialization (app.core.serialization).
+
+Serves the same ORM rows from two FastAPI routes and times full requests:
+"before" returns the rows with response_model=List[Property], so FastAPI
+validates each one from attributes and encodes it with the stdlib encoder;
+"after" returns orm_list_response(), which copies the schema's fields and
+encodes them with orjson.
+
+    python scripts/bench_serialization.py [--rows 100] [--requests 300]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.serialization import orm_list_response  # noqa: E402
+from app.models import appointment, lead, marketplace, user  # noqa: E402,F401
+from app.models.property import Property  # noqa: E402
+from app.schemas.property import Property as PropertySchema  # noqa: E402
+
+def make_rows(count: int) -> List[Property]:
+    now = datetime.now(timezone.utc)
+    return [
+        Property(
+            id=i,
+            title=f"Listing {i}",
+            description="Bright three bedroom home with an updated kitchen and a large backyard. " * 3,
+            price=350_000 + i,
+            location="San Francisco, CA",
+            bedrooms=3,
+            bathrooms=2,
+            square_feet=1800.0,
+            available=True,
+            property_type="house",
+            listing_type="sale",
+            features={"garage": True, "pool": False, "parking": 2, "amenities": ["gym", "laundry", "storage"]},
+            images=[f"https://images.example.com/{i}/{n}.jpg" for n in range(8)],
+            mls_id=f"MLS{i}",
+            owner_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+def build_app(rows: List[Property]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=List[PropertySchema])
+    def before():
+        return rows
+
+    @app.get("/after", response_model=List[PropertySchema])
+    def after():
+        return orm_list_response(rows, PropertySchema)
+
+    return app
+
+def time_route(client: TestClient, path: str, requests: int) -> List[float]:
+    client.get(path)  # warm up
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(make_rows(args.rows)))
+    # Pydantic writes UTC as "Z" and orjson as "+00:00"; otherwise the payloads match
+    before = client.get("/before").text.replace('Z"', '+00:00"')
+    assert orjson.loads(before) == client.get("/after").json(), "payloads differ"
+
+    results = {path: time_route(client, path, args.requests) for path in ("/before", "/after")}
+    for path, timings in results.items():
+        print(
+            f"{path:>8}: median {statistics.median(timings) * 1000:6.2f} ms | "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1000:6.2f} ms "
+            f"({args.rows} rows, {args.requests} requests)"
+        )
+    speedup = statistics.median(results["/before"]) / statistics.median(results["/after"])
+    print(f"speedup: {speedup:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark API cold start: fresh interpreter -> import app.main -> first 200.
+
+Each run starts a new Python process, imports app.main, runs the lifespan
+and serves GET / through TestClient. The script reports median timings and
+lists modules that should stay deferred (the sync engine's psycopg2 driver,
+the recommendation and LLM stacks) but were imported anyway. Exits non-zero
+if one was, or if --budget is exceeded, so it can guard regressions. GET /
+goes through the rate limit middleware, so Redis must be reachable.
+
+    python scripts/bench_startup.py [--runs 5] [--budget 3.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by migrations, recommendations or LLM calls, never to serve a request
+DEFERRED_MODULES = ("psycopg2", "sklearn", "numpy", "pandas", "scipy", "openai")
+
+# app.core.config requires these; nothing connects to the database for GET /
+SETTINGS_DEFAULTS = {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "SECRET_KEY": "bench-startup",
+}
+
+def child() -> None:
+    started = time.perf_counter()
+    import app.main
+
+    imported = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    with TestClient(app.main.app) as client:
+        status = client.get("/").status_code
+        first_response = time.perf_counter()
+    print(json.dumps({
+        "import": imported - started,
+        "first_200": first_response - started,
+        "status": status,
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in sys.modules],
+    }))
+
+def run_once() -> dict:
+    env = {**SETTINGS_DEFAULTS, **os.environ, "PYTHONPATH": ROOT, "LOG_LEVEL": "WARNING"}
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None, help="fail if the median first 200 takes longer (s)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    results = [run_once() for _ in range(args.runs)]
+    statuses = {r["status"] for r in results}
+    loaded = sorted({name for r in results for name in r["deferred_loaded"]})
+    first_200 = statistics.median(r["first_200"] for r in results)
+    print(
+        f"import app.main: median {statistics.median(r['import'] for r in results):.2f} s | "
+        f"first 200: median {first_200:.2f} s | statuses {sorted(statuses)} ({args.runs} runs)"
+    )
+    print(f"deferred modules imported: {', '.join(loaded) or 'none'}")
+
+    failed = statuses != {200} or loaded or (args.budget is not None and first_200 > args.budget)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Load-test the production server setup (gunicorn.conf.py) by worker count.
+
+For each worker count, starts gunicorn with gunicorn.conf.py, serving a
+stub app whose list endpoint waits on a fake database query and then
+serializes 100 listings. The script then drives it with concurrent
+keep-alive clients and reports requests/s and latency. Pass --app to load
+another ASGI app (e.g. app.main:app, which needs Postgres and Redis).
+
+    python scripts/bench_workers.py [--workers 1 2 4] [--duration 10] [--connections 64]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stub app, imported by the gunicorn workers as bench_workers:app
+try:
+    from fastapi import FastAPI
+    from fastapi.responses import ORJSONResponse
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+    LISTINGS = [
+        {
+            "id": i,
+            "title": f"Listing {i}",
+            "price": 350_000 + i,
+            "location": "San Francisco, CA",
+            "features": {"garage": True, "parking": 2},
+            "images": [f"https://images.example.com/{i}/{n}.jpg" for n in range(8)],
+        }
+        for i in range(100)
+    ]
+
+    @app.get("/properties")
+    async def properties():
+        await asyncio.sleep(0.005)  # stub database round trip
+        return [dict(listing) for listing in LISTINGS]
+except ImportError:  # pragma: no cover - only the load generator is needed
+    app = None
+
+async def wait_until_up(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server at {url} did not come up")
+            await asyncio.sleep(0.2)
+
+async def drive(url: str, connections: int, duration: float):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=connections)
+
+    async def client(session):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    if response.status >= 400:
+                        errors += 1
+                        continue
+            except aiohttp.ClientError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.monotonic()
+        await asyncio.gather(*(client(session) for _ in range(connections)))
+        elapsed = time.monotonic() - started
+    return latencies, errors, elapsed
+
+def start_server(target: str, workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}", "LOG_LEVEL": "warning"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--pythonpath", "scripts", target],
+        cwd=ROOT,
+        env=env,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--app", default="bench_workers:app")
+    parser.add_argument("--path", default="/properties")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    print(f"{os.cpu_count()} CPUs; the load generator shares them with the server")
+    for workers in args.workers:
+        server = start_server(args.app, workers, args.port)
+        try:
+            asyncio.run(wait_until_up(url))
+            latencies, errors, elapsed = asyncio.run(drive(url, args.connections, args.duration))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else float("nan")
+        print(
+            f"{workers:>3} workers | {len(latencies) / elapsed:8.0f} req/s | "
+            f"p50 {statistics.median(latencies) * 1000:6.1f} ms | p99 {p99 * 1000:6.1f} ms | {errors} errors"
+        )
+
+if __name__ == "__main__":
+    main()
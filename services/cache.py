@@ -0,0 +1,97 @@
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import logging
+from redis.exceptions import RedisError
+# One Redis pool per process, shared with the API; re-exported for the services
+from app.core.cache import close_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+class TieredCache:
+    """
+    JSON cache with an in-process hot tier in front of Redis.
+
+    Redis is shared by every replica; the hot tier is a small LRU with a
+    short TTL that absorbs repeated reads within one process. Values go in
+    and come out of the hot tier as copies, so callers can change what they
+    get without changing the cache. Redis errors are logged and treated as
+    misses so callers fall back to the upstream.
+    """
+
+    def __init__(self,
+                 namespace: str,
+                 hot_ttl: float = 30,
+                 hot_max_entries: int = 1024):
+        self.namespace = namespace
+        self.hot_ttl = hot_ttl
+        self.hot_max_entries = hot_max_entries
+        self._hot: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _hot_get(self, key: str) -> Optional[Any]:
+        item = self._hot.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._hot[key]
+            return None
+        self._hot.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def _hot_set(self, key: str, value: Any) -> None:
+        self._hot[key] = (time.monotonic() + self.hot_ttl, copy.deepcopy(value))
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_max_entries:
+            self._hot.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look a key up in the hot tier, then in Redis
+
+        Args:
+            key: Cache key within this cache's namespace
+
+        Returns:
+            The cached value or None on a miss
+        """
+        value = self._hot_get(key)
+        if value is not None:
+            return value
+        try:
+            raw = await get_redis().get(self._key(key))
+        except RedisError as e:
+            logger.warning("Redis read failed for %s: %s", self._key(key), e)
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self._hot_set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """
+        Store a value in both tiers
+
+        Args:
+            key: Cache key within this cache's namespace
+            value: JSON-serializable value
+            ttl: How long Redis keeps the value, in seconds
+        """
+        self._hot_set(key, value)
+        try:
+            await get_redis().set(self._key(key), json.dumps(value), ex=ttl)
+        except RedisError as e:
+            logger.warning("Redis write failed for %s: %s", self._key(key), e)
+
+    async def delete(self, key: str) -> None:
+        self._hot.pop(key, None)
+        try:
+            await get_redis().delete(self._key(key))
+        except RedisError as e:
+            logger.warning("Redis delete failed for %s: %s", self._key(key), e)
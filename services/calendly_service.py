@@ -1,13 +1,16 @@
-import aiohttp
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime, timedelta
 from config import settings
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.resilience import get_policy, raise_for_retryable_status
 
 logger = logging.getLogger(__name__)
 
 class CalendlyService:
-    def __init__(self):
+    def __init__(self, session_manager: Optional[HTTPSessionManager] = None):
+        self.http = session_manager or http_session_manager
+        self.policy = get_policy("calendly")
         self.api_key = settings.CALENDLY_API_KEY
         self.base_url = settings.CALENDLY_API_URL
         self.headers = {
@@ -31,27 +34,31 @@ class CalendlyService:
             List of available time slots
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 params = {
                     "start_time": start_time.isoformat(),
                     "end_time": end_time.isoformat(),
                     "event_type": event_type
                 }
-                
+            
                 async with session.get(
                     f"{self.base_url}/scheduled_events/available_times",
                     headers=self.headers,
                     params=params
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         data = await response.json()
                         return data.get("available_times", [])
                     else:
-                        logger.error(f"Error getting available times: {response.status}")
+                        logger.error("Error getting available times: %s", response.status)
                         return []
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching available times: {str(e)}")
+            logger.error("Error fetching available times: %s", e)
             return []
 
     async def schedule_appointment(self,
@@ -72,27 +79,31 @@ class CalendlyService:
             Dict containing the scheduled appointment details
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "start_time": start_time.isoformat(),
                     "event_type": event_type,
                     "email": email,
                     "custom_data": custom_data or {}
                 }
-                
+            
                 async with session.post(
                     f"{self.base_url}/scheduled_events",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 201:
                         return await response.json()
                     else:
-                        logger.error(f"Error scheduling appointment: {response.status}")
+                        logger.error("Error scheduling appointment: %s", response.status)
                         raise Exception("Failed to schedule appointment")
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error scheduling appointment: {str(e)}")
+            logger.error("Error scheduling appointment: %s", e)
             raise
 
     async def cancel_appointment(self, event_uuid: str) -> bool:
@@ -106,19 +117,23 @@ class CalendlyService:
             bool: True if cancellation was successful
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.delete(
                     f"{self.base_url}/scheduled_events/{event_uuid}",
                     headers=self.headers
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 204:
                         return True
                     else:
-                        logger.error(f"Error canceling appointment: {response.status}")
+                        logger.error("Error canceling appointment: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error canceling appointment: {str(e)}")
+            logger.error("Error canceling appointment: %s", e)
             return False
 
     async def get_appointment_details(self, event_uuid: str) -> Optional[Dict[str, Any]]:
@@ -132,19 +147,23 @@ class CalendlyService:
             Dict containing appointment details or None if not found
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.get(
                     f"{self.base_url}/scheduled_events/{event_uuid}",
                     headers=self.headers
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return await response.json()
                     else:
-                        logger.error(f"Error getting appointment details: {response.status}")
+                        logger.error("Error getting appointment details: %s", response.status)
                         return None
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching appointment details: {str(e)}")
+            logger.error("Error fetching appointment details: %s", e)
             return None
 
     async def send_reminder(self, event_uuid: str, reminder_type: str = "email") -> bool:
@@ -159,22 +178,26 @@ class CalendlyService:
             bool: True if reminder was sent successfully
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "reminder_type": reminder_type
                 }
-                
+            
                 async with session.post(
                     f"{self.base_url}/scheduled_events/{event_uuid}/reminder",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return True
                     else:
-                        logger.error(f"Error sending reminder: {response.status}")
+                        logger.error("Error sending reminder: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error sending reminder: {str(e)}")
+            logger.error("Error sending reminder: %s", e)
             return False 
\ No newline at end of file
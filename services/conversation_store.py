@@ -0,0 +1,81 @@
+import json
+from typing import Any, Dict, List, Optional
+import logging
+from config import settings
+from services.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+COMPLETED_LEADS_KEY = "messenger:completed_leads"
+# Captures that kept failing to insert, kept for inspection
+DEAD_LEADS_KEY = "messenger:dead_leads"
+
+class ConversationStore:
+    """
+    Messenger conversation state in Redis, one JSON document per sender.
+
+    Every write refreshes the TTL, so abandoned conversations expire on
+    their own. Completed lead captures are pushed onto a shared list and
+    drained in batches by whichever replica flushes next.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.MESSENGER_CONVERSATION_TTL
+
+    @staticmethod
+    def _key(sender_id: str) -> str:
+        return f"messenger:conversation:{sender_id}"
+
+    async def get(self, sender_id: str) -> Optional[Dict[str, Any]]:
+        raw = await get_redis().get(self._key(sender_id))
+        return json.loads(raw) if raw else None
+
+    async def save(self, sender_id: str, state: Dict[str, Any]) -> None:
+        await get_redis().set(self._key(sender_id), json.dumps(state), ex=self.ttl)
+
+    async def delete(self, sender_id: str) -> None:
+        await get_redis().delete(self._key(sender_id))
+
+    async def complete(self, sender_id: str, lead_data: Dict[str, Any]) -> None:
+        """
+        Queue a finished lead capture for the next batched insert and drop the conversation
+        """
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.rpush(COMPLETED_LEADS_KEY, json.dumps({"sender_id": sender_id, **lead_data}))
+            pipe.delete(self._key(sender_id))
+            await pipe.execute()
+
+    async def pop_completed(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Take up to ``limit`` completed lead captures off the queue
+        """
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.lrange(COMPLETED_LEADS_KEY, 0, limit - 1)
+            pipe.ltrim(COMPLETED_LEADS_KEY, limit, -1)
+            items, _ = await pipe.execute()
+        return [json.loads(item) for item in items]
+
+    async def requeue(self, leads: List[Dict[str, Any]], max_attempts: Optional[int] = None) -> int:
+        """
+        Put lead captures back at the head of the queue after a failed insert
+
+        Captures that have now failed ``max_attempts`` times are moved to the
+        dead-letter list instead, so one bad row cannot block the queue forever.
+
+        Returns:
+            Number of captures dead-lettered
+        """
+        if not leads:
+            return 0
+        max_attempts = max_attempts or settings.MESSENGER_LEAD_MAX_ATTEMPTS
+        retry, dead = [], []
+        for lead in leads:
+            lead = {**lead, "insert_attempts": lead.get("insert_attempts", 0) + 1}
+            (dead if lead["insert_attempts"] >= max_attempts else retry).append(lead)
+        async with get_redis().pipeline(transaction=True) as pipe:
+            if retry:
+                pipe.lpush(COMPLETED_LEADS_KEY, *(json.dumps(lead) for lead in reversed(retry)))
+            if dead:
+                pipe.rpush(DEAD_LEADS_KEY, *(json.dumps(lead) for lead in dead))
+            await pipe.execute()
+        return len(dead)
@@ -0,0 +1,248 @@
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from urllib.parse import urlencode
+import logging
+import aiohttp
+from config import settings
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.rate_governor import RateLimitTimeout
+from services.resilience import UpstreamPolicy, get_policy, raise_for_retryable_status
+
+logger = logging.getLogger(__name__)
+
+GRAPH_URL = "https://graph.facebook.com"
+
+# The Graph API accepts at most this many operations per batch request
+MAX_BATCH_SIZE = 50
+
+class GraphAPIError(Exception):
+    """Error returned by the Graph API"""
+
+    def __init__(self,
+                 message: str,
+                 code: Optional[int] = None,
+                 subcode: Optional[int] = None,
+                 error_type: Optional[str] = None,
+                 status: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+        self.subcode = subcode
+        self.error_type = error_type
+        self.status = status
+
+    @classmethod
+    def from_payload(cls, payload: Any, status: Optional[int] = None) -> "GraphAPIError":
+        error = payload.get("error") if isinstance(payload, dict) else None
+        if not isinstance(error, dict):
+            return cls(f"Unexpected Graph API response ({status}): {payload!r}", status=status)
+        return cls(
+            error.get("message", "Unknown Graph API error"),
+            code=error.get("code"),
+            subcode=error.get("error_subcode"),
+            error_type=error.get("type"),
+            status=status
+        )
+
+def _encode(params: Dict[str, Any]) -> Dict[str, str]:
+    # Graph expects nested values (targeting, location, ...) as JSON strings
+    return {
+        key: value if isinstance(value, str) else json.dumps(value)
+        for key, value in params.items()
+        if value is not None
+    }
+
+class FacebookGraphClient:
+    """
+    Async Graph API client on the shared aiohttp session.
+
+    Mirrors the parts of facebook-sdk's GraphAPI we use (get_object,
+    get_connections, put_object) without blocking the event loop, and adds
+    batch requests. Every call goes through the facebook upstream policy,
+    so it is rate governed, retried when idempotent and circuit broken.
+    """
+
+    def __init__(self,
+                 access_token: Optional[str] = None,
+                 version: Optional[str] = None,
+                 session_manager: Optional[HTTPSessionManager] = None,
+                 policy: Optional[UpstreamPolicy] = None):
+        self.access_token = access_token or settings.FACEBOOK_APP_SECRET
+        self.version = version or settings.FACEBOOK_API_VERSION
+        self.base_url = f"{GRAPH_URL}/{self.version}"
+        self.http = session_manager or http_session_manager
+        self.policy = policy or get_policy("facebook")
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      data: Optional[Dict[str, Any]] = None,
+                      form: Optional[Callable[[], aiohttp.FormData]] = None,
+                      idempotent: Optional[bool] = None,
+                      cost: int = 1) -> Any:
+        """
+        Make one Graph API call
+
+        Args:
+            method: HTTP method
+            path: Graph path, e.g. "me/feed" (empty for the batch endpoint), or an
+                absolute ``paging.next`` URL, which already carries its parameters
+            params: Query string parameters
+            data: Form body parameters
+            form: Builds a multipart body instead of ``data``; called per attempt
+                since a FormData can only be sent once
+            idempotent: Whether to retry (defaults to GET only)
+            cost: Graph calls this request counts as against the rate limit
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            GraphAPIError: If the Graph API returns an error
+        """
+        body = _encode(data) if data is not None else None
+        if path.startswith(("https://", "http://")):
+            url, query = path, None
+        else:
+            url = f"{self.base_url}/{path}" if path else self.base_url
+            query = {**_encode(params or {}), "access_token": self.access_token}
+
+        async def attempt():
+            session = await self.http.get_session()
+            async with session.request(method, url, params=query, data=form() if form else body) as response:
+                raise_for_retryable_status(response)
+                payload = await response.json(content_type=None)
+                if response.status >= 400 or (isinstance(payload, dict) and "error" in payload):
+                    raise GraphAPIError.from_payload(payload, response.status)
+                return payload
+
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        return await self.policy.call(attempt, idempotent=idempotent, cost=cost)
+
+    async def get(self, path: str, **params) -> Any:
+        return await self.request("GET", path, params=params)
+
+    async def post(self, path: str, **data) -> Any:
+        return await self.request("POST", path, data=data)
+
+    async def get_object(self, object_id: str, **params) -> Any:
+        return await self.get(object_id, **params)
+
+    async def get_connections(self, object_id: str, connection_name: str, **params) -> Any:
+        return await self.get(f"{object_id}/{connection_name}", **params)
+
+    async def iter_pages(self, path: str, **params) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield the ``data`` of each page of a connection, following ``paging.next``
+
+        Only one page is held at a time, so callers can walk large edges in
+        bounded memory.
+        """
+        payload = await self.get(path, **params)
+        while True:
+            yield payload.get("data", [])
+            next_url = (payload.get("paging") or {}).get("next")
+            if not next_url:
+                return
+            payload = await self.get(next_url)
+
+    async def put_object(self, parent_object: str, connection_name: str, **data) -> Any:
+        return await self.post(f"{parent_object}/{connection_name}", **data)
+
+    async def upload_photo(self, content: bytes, filename: str = "image.jpg", published: bool = False) -> str:
+        """
+        Upload image bytes as a photo
+
+        Args:
+            content: Raw image bytes
+            filename: File name sent with the upload
+            published: Whether the photo shows up on the page's timeline
+
+        Returns:
+            str: The Facebook photo ID
+        """
+        def form() -> aiohttp.FormData:
+            data = aiohttp.FormData()
+            data.add_field("published", "true" if published else "false")
+            data.add_field("source", content, filename=filename)
+            return data
+
+        # Unpublished photos are harmless to duplicate, so uploads are retried
+        response = await self.request("POST", "me/photos", form=form, idempotent=not published)
+        return response["id"]
+
+    @property
+    def batch_size(self) -> int:
+        """Operations per batch request: never more than one full rate limit bucket"""
+        governor = self.policy.governor
+        return min(MAX_BATCH_SIZE, governor.burst) if governor is not None else MAX_BATCH_SIZE
+
+    async def batch(self, operations: List[Dict[str, Any]]) -> List[Union[Any, Exception]]:
+        """
+        Run many operations through Graph batch requests
+
+        Operations are sent ``batch_size`` per request, one request at a
+        time, so each waits for the rate limit budget the previous one
+        used. Once the budget does not free up in time, the remaining
+        operations are not sent and get the RateLimitTimeout.
+
+        Args:
+            operations: Batch operations, e.g.
+                {"method": "POST", "relative_url": "me/feed", "body": {"message": "..."}}.
+                A dict ``body`` is form-encoded for you.
+
+        Returns:
+            One entry per operation, in order: the decoded body, or the
+            exception for that operation. A GraphAPIError if Graph rejected
+            the operation; if a whole batch request failed, each of its
+            operations gets that request's error, while other chunks are
+            unaffected.
+        """
+        size = self.batch_size
+        chunks = [operations[start:start + size] for start in range(0, len(operations), size)]
+        items: List[Union[Any, Exception]] = []
+        for index, chunk in enumerate(chunks):
+            try:
+                items.extend(await self._batch_chunk(chunk))
+            except RateLimitTimeout as e:
+                unsent = sum(len(rest) for rest in chunks[index:])
+                logger.warning("Graph rate limit budget exhausted, %s batch operations not sent", unsent)
+                items.extend([e] * unsent)
+                break
+            except Exception as e:
+                logger.error("Graph batch of %s operations failed: %s", len(chunk), e)
+                items.extend([e] * len(chunk))
+        return items
+
+    async def _batch_chunk(self, operations: List[Dict[str, Any]]) -> List[Union[Any, GraphAPIError]]:
+        encoded = []
+        for operation in operations:
+            operation = dict(operation)
+            if isinstance(operation.get("body"), dict):
+                operation["body"] = urlencode(_encode(operation["body"]))
+            encoded.append(operation)
+
+        # Graph counts every operation in a batch against the rate limit
+        responses = await self.request(
+            "POST",
+            "",
+            data={"batch": encoded, "include_headers": "false"},
+            cost=len(encoded)
+        )
+        results: List[Union[Any, GraphAPIError]] = []
+        for response in responses:
+            if response is None:
+                # Graph returns null for operations it did not get to (e.g. timeouts)
+                results.append(GraphAPIError("Batch operation was not executed"))
+                continue
+            status = response.get("code")
+            try:
+                body = json.loads(response.get("body") or "null")
+            except ValueError:
+                body = response.get("body")
+            if status is None or status >= 400:
+                results.append(GraphAPIError.from_payload(body, status))
+            else:
+                results.append(body)
+        return results
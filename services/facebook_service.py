@@ -1,17 +1,29 @@
-import facebook
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 from config import settings
+from app.models.marketplace import PublicationStatus
+from services.conversation_store import ConversationStore
+from services.facebook_graph import FacebookGraphClient, GraphAPIError
+from services.marketplace_publisher import MarketplacePublisher
+from services.resilience import get_policy
 
 logger = logging.getLogger(__name__)
 
 class FacebookService:
     def __init__(self):
-        self.graph = facebook.GraphAPI(
+        self.graph = FacebookGraphClient(
             access_token=settings.FACEBOOK_APP_SECRET,
             version=settings.FACEBOOK_API_VERSION
         )
+        # Send API replies are limited separately, so they never wait behind Marketplace publishing
+        self.messenger = FacebookGraphClient(
+            access_token=settings.FACEBOOK_APP_SECRET,
+            version=settings.FACEBOOK_API_VERSION,
+            policy=get_policy("messenger")
+        )
+        self.publisher = MarketplacePublisher(graph=self.graph)
+        self.conversations = ConversationStore()
         
     async def post_to_marketplace(self, property_data: Dict[str, Any]) -> str:
         """
@@ -23,39 +35,33 @@ class FacebookService:
         Returns:
             str: The ID of the created marketplace listing
         """
-        try:
-            # Format the listing data according to Facebook's requirements
-            listing_data = {
-                "title": property_data["title"],
-                "description": property_data["description"],
-                "price": property_data["price"],
-                "category": "RENTAL",
-                "location": {
-                    "latitude": property_data.get("latitude"),
-                    "longitude": property_data.get("longitude"),
-                    "city": property_data.get("city"),
-                    "state": property_data.get("state"),
-                    "zip": property_data.get("zip")
-                },
-                "images": property_data.get("images", []),
-                "availability": "AVAILABLE" if property_data.get("available", True) else "SOLD"
-            }
-            
-            # Create the marketplace listing
-            response = self.graph.put_object(
-                parent_object="me",
-                connection_name="marketplace_listings",
-                **listing_data
-            )
-            
-            logger.info(f"Successfully posted property to Facebook Marketplace: {response['id']}")
-            return response["id"]
+        results = await self.post_many_to_marketplace([property_data])
+        result = results[property_data["id"]]
+        if result["status"] != PublicationStatus.PUBLISHED.value:
+            logger.error("Facebook API error: %s", result["error"])
+            raise GraphAPIError(result["error"] or "Marketplace listing was not published")
+        
+        logger.info("Successfully posted property to Facebook Marketplace: %s", result["listing_id"])
+        return result["listing_id"]
+
+    async def post_many_to_marketplace(self, properties: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Post many property listings to Facebook Marketplace
+        
+        Images are uploaded once per distinct image and listings are created
+        in Graph batch requests; listings that fail can be retried by calling
+        this again with the same properties.
+        
+        Args:
+            properties: Property dictionaries, each with an ``id`` (matched on mls_id when present)
             
-        except facebook.GraphAPIError as e:
-            logger.error(f"Facebook API error: {str(e)}")
-            raise
+        Returns:
+            Dict mapping property ID to its publication status, listing ID and error
+        """
+        try:
+            return await self.publisher.publish(properties)
         except Exception as e:
-            logger.error(f"Error posting to Facebook Marketplace: {str(e)}")
+            logger.error("Error posting to Facebook Marketplace: %s", e)
             raise
 
     async def handle_messenger_message(self, sender_id: str, message: str) -> Dict[str, Any]:
@@ -101,44 +107,47 @@ class FacebookService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error handling Messenger message: {str(e)}")
+            logger.error("Error handling Messenger message: %s", e)
             return {
                 "type": "error",
                 "message": "I apologize, but I'm having trouble processing your request. Please try again later."
             }
 
-    async def collect_lead_info(self, sender_id: str, step: str, user_input: str) -> Dict[str, Any]:
+    async def collect_lead_info(self, sender_id: str, step: Optional[str], user_input: str) -> Dict[str, Any]:
         """
         Collect lead information through a conversational flow
         
+        Answers are kept in Redis between messages; once the last step is
+        answered the lead is queued for the next batched insert.
+        
         Args:
             sender_id: The ID of the message sender
-            step: The current step in the lead collection process
+            step: The current step in the lead collection process (defaults to the stored one)
             user_input: The user's input for the current step
             
         Returns:
             Dict containing the next step and response
         """
         try:
-            # Store user input in a temporary storage (implement your own storage solution)
-            # This is a simplified example
-            lead_data = {}
+            state = await self.conversations.get(sender_id) or {"step": "name", "lead_data": {}}
+            step = step or state["step"]
+            lead_data = state["lead_data"]
             
             if step == "name":
                 lead_data["name"] = user_input
-                return {
+                response = {
                     "next_step": "email",
                     "message": "Great! What's your email address?"
                 }
             elif step == "email":
                 lead_data["email"] = user_input
-                return {
+                response = {
                     "next_step": "phone",
                     "message": "Thanks! What's your phone number?"
                 }
             elif step == "phone":
                 lead_data["phone"] = user_input
-                return {
+                response = {
                     "next_step": "preferences",
                     "message": "What type of property are you looking for?",
                     "quick_replies": [
@@ -149,16 +158,30 @@ class FacebookService:
                 }
             elif step == "preferences":
                 lead_data["property_type"] = user_input
-                # Save the complete lead data
-                # await save_lead_data(sender_id, lead_data)
+                await self.conversations.complete(sender_id, lead_data)
                 return {
                     "next_step": "complete",
                     "message": "Thank you for providing your information! An agent will contact you soon."
                 }
+            else:
+                raise ValueError(f"Unknown lead collection step: {step}")
+            
+            await self.conversations.save(sender_id, {"step": response["next_step"], "lead_data": lead_data})
+            return response
                 
         except Exception as e:
-            logger.error(f"Error collecting lead information: {str(e)}")
+            logger.error("Error collecting lead information: %s", e)
             return {
                 "next_step": "error",
                 "message": "I apologize, but I'm having trouble processing your information. Please try again later."
-            } 
\ No newline at end of file
+            }
+
+    async def start_lead_collection(self, sender_id: str) -> Dict[str, Any]:
+        """
+        Begin the lead collection flow for a sender
+        """
+        await self.conversations.save(sender_id, {"step": "name", "lead_data": {}})
+        return {
+            "next_step": "name",
+            "message": "I'd be happy to connect you with an agent. What's your name?"
+        }
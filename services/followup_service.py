@@ -1,13 +1,16 @@
-import aiohttp
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime, timedelta
 from config import settings
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.resilience import get_policy, raise_for_retryable_status
 
 logger = logging.getLogger(__name__)
 
 class FollowUpService:
-    def __init__(self):
+    def __init__(self, session_manager: Optional[HTTPSessionManager] = None):
+        self.http = session_manager or http_session_manager
+        self.policy = get_policy("followupboss")
         self.api_key = settings.FOLLOWUPBOSS_API_KEY
         self.base_url = settings.FOLLOWUPBOSS_API_URL
         self.headers = {
@@ -26,20 +29,24 @@ class FollowUpService:
             Dict containing created lead details or None if failed
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.post(
                     f"{self.base_url}/leads",
                     headers=self.headers,
                     json=lead_data
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 201:
                         return await response.json()
                     else:
-                        logger.error(f"Error creating lead: {response.status}")
+                        logger.error("Error creating lead: %s", response.status)
                         return None
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error creating lead: {str(e)}")
+            logger.error("Error creating lead: %s", e)
             return None
 
     async def get_lead_details(self, lead_id: str) -> Optional[Dict[str, Any]]:
@@ -53,19 +60,23 @@ class FollowUpService:
             Dict containing lead details or None if not found
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.get(
                     f"{self.base_url}/leads/{lead_id}",
                     headers=self.headers
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return await response.json()
                     else:
-                        logger.error(f"Error fetching lead details: {response.status}")
+                        logger.error("Error fetching lead details: %s", response.status)
                         return None
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching lead details: {str(e)}")
+            logger.error("Error fetching lead details: %s", e)
             return None
 
     async def update_lead_status(self,
@@ -84,25 +95,29 @@ class FollowUpService:
             bool: True if update was successful
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "status": status,
                     "notes": notes
                 }
-                
+            
                 async with session.patch(
                     f"{self.base_url}/leads/{lead_id}",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return True
                     else:
-                        logger.error(f"Error updating lead status: {response.status}")
+                        logger.error("Error updating lead status: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error updating lead status: {str(e)}")
+            logger.error("Error updating lead status: %s", e)
             return False
 
     async def schedule_follow_up(self,
@@ -123,27 +138,31 @@ class FollowUpService:
             bool: True if scheduling was successful
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "lead_id": lead_id,
                     "scheduled_time": follow_up_time.isoformat(),
                     "type": follow_up_type,
                     "notes": notes
                 }
-                
+            
                 async with session.post(
                     f"{self.base_url}/follow-ups",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 201:
                         return True
                     else:
-                        logger.error(f"Error scheduling follow-up: {response.status}")
+                        logger.error("Error scheduling follow-up: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error scheduling follow-up: {str(e)}")
+            logger.error("Error scheduling follow-up: %s", e)
             return False
 
     async def get_lead_activity(self, lead_id: str) -> List[Dict[str, Any]]:
@@ -157,19 +176,23 @@ class FollowUpService:
             List of activity events
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.get(
                     f"{self.base_url}/leads/{lead_id}/activity",
                     headers=self.headers
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return await response.json()
                     else:
-                        logger.error(f"Error fetching lead activity: {response.status}")
+                        logger.error("Error fetching lead activity: %s", response.status)
                         return []
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching lead activity: {str(e)}")
+            logger.error("Error fetching lead activity: %s", e)
             return []
 
     async def send_automated_message(self,
@@ -188,26 +211,30 @@ class FollowUpService:
             bool: True if message was sent successfully
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "lead_id": lead_id,
                     "message": message,
                     "type": message_type
                 }
-                
+            
                 async with session.post(
                     f"{self.base_url}/messages",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 201:
                         return True
                     else:
-                        logger.error(f"Error sending message: {response.status}")
+                        logger.error("Error sending message: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error sending message: {str(e)}")
+            logger.error("Error sending message: %s", e)
             return False
 
     async def get_leads_needing_follow_up(self) -> List[Dict[str, Any]]:
@@ -218,23 +245,27 @@ class FollowUpService:
             List of leads needing follow-up
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 params = {
                     "status": "active",
                     "last_activity_before": (datetime.now() - timedelta(days=3)).isoformat()
                 }
-                
+            
                 async with session.get(
                     f"{self.base_url}/leads",
                     headers=self.headers,
                     params=params
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return await response.json()
                     else:
-                        logger.error(f"Error fetching leads needing follow-up: {response.status}")
+                        logger.error("Error fetching leads needing follow-up: %s", response.status)
                         return []
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching leads needing follow-up: {str(e)}")
+            logger.error("Error fetching leads needing follow-up: %s", e)
             return [] 
\ No newline at end of file
@@ -0,0 +1,65 @@
+import asyncio
+import aiohttp
+from typing import Optional
+import logging
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class HTTPSessionManager:
+    """
+    Owns one long-lived aiohttp session shared by every external service client.
+
+    Reusing the session keeps TCP/TLS connections alive between calls and
+    caches DNS lookups, instead of paying a fresh handshake per request.
+    """
+
+    def __init__(self,
+                 limit: Optional[int] = None,
+                 limit_per_host: Optional[int] = None,
+                 dns_cache_ttl: Optional[int] = None,
+                 keepalive_timeout: Optional[float] = None,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        self.limit = limit if limit is not None else settings.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host if limit_per_host is not None else settings.HTTP_POOL_LIMIT_PER_HOST
+        self.dns_cache_ttl = dns_cache_ttl if dns_cache_ttl is not None else settings.HTTP_DNS_CACHE_TTL
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else settings.HTTP_KEEPALIVE_TIMEOUT
+        self.timeout = timeout or aiohttp.ClientTimeout(
+            total=settings.HTTP_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it on first use
+
+        Returns:
+            aiohttp.ClientSession: The pooled session
+        """
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(
+                        limit=self.limit,
+                        limit_per_host=self.limit_per_host,
+                        ttl_dns_cache=self.dns_cache_ttl,
+                        keepalive_timeout=self.keepalive_timeout
+                    )
+                    self._session = aiohttp.ClientSession(
+                        connector=connector,
+                        timeout=self.timeout
+                    )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the shared session and its connection pool
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# Shared session manager, closed by the application lifespan
+http_session_manager = HTTPSessionManager()
@@ -0,0 +1,100 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+import logging
+from redis.exceptions import RedisError
+from config import settings
+from services.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+def prompt_hash(messages: List[Dict[str, str]], **params: Any) -> str:
+    """
+    Hash everything besides model and temperature that shapes the output
+    """
+    canonical = json.dumps({"messages": messages, **params}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class LLMCache:
+    """
+    Content-addressed cache of chat completions in Redis.
+
+    Entries are keyed on (model, temperature, prompt hash), so any caller
+    sending an identical request shares the result. Redis errors are logged
+    and treated as misses. Hit rate and the tokens that hits saved are
+    counted per process.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, namespace: str = "llm"):
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    def key_for(self, model: str, temperature: float, messages: List[Dict[str, str]], **params: Any) -> str:
+        return f"{self.namespace}:{model}:{temperature:g}:{prompt_hash(messages, **params)}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion
+
+        Returns:
+            Dict with text, prompt_tokens and completion_tokens, or None on a miss
+        """
+        try:
+            raw = await get_redis().get(key)
+        except RedisError as e:
+            logger.warning("LLM cache read failed for %s: %s", key, e)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        entry = json.loads(raw)
+        self.hits += 1
+        self.saved_prompt_tokens += entry.get("prompt_tokens", 0)
+        self.saved_completion_tokens += entry.get("completion_tokens", 0)
+        return entry
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        try:
+            await get_redis().set(key, json.dumps(entry), ex=ttl or self.ttl)
+        except RedisError as e:
+            logger.warning("LLM cache write failed for %s: %s", key, e)
+
+    async def bust(self, key: str) -> None:
+        await get_redis().delete(key)
+
+    async def bust_model(self, model: Optional[str] = None) -> int:
+        """
+        Drop every cached completion, or every one for ``model``
+
+        Returns:
+            Number of entries removed
+        """
+        pattern = f"{self.namespace}:{model}:*" if model else f"{self.namespace}:*"
+        redis = get_redis()
+        removed = 0
+        batch = []
+        async for key in redis.scan_iter(match=pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                removed += await redis.delete(*batch)
+                batch = []
+        if batch:
+            removed += await redis.delete(*batch)
+        return removed
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+        }
+
+# Shared by every gateway in the process so metrics cover all callers
+llm_cache = LLMCache()
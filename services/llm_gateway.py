@@ -0,0 +1,220 @@
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, NamedTuple, Optional
+import logging
+from config import settings
+from services.llm_cache import LLMCache, llm_cache
+from services.rate_governor import RateGovernor
+from services.resilience import RETRYABLE_ERRORS, UpstreamPolicy, build_policy
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger(__name__)
+
+# Rough but conservative: English text averages ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+class Completion(NamedTuple):
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached: bool = False
+
+def _cached_completion(entry: Dict[str, Any]) -> Completion:
+    return Completion(
+        text=entry["text"],
+        prompt_tokens=entry.get("prompt_tokens", 0),
+        completion_tokens=entry.get("completion_tokens", 0),
+        cached=True
+    )
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Upper-bound the tokens a chat completion will use, for budgeting before the call
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + len(messages) * 4 + max_tokens
+
+class LLMGateway:
+    """
+    Single way out to the OpenAI API.
+
+    Wraps openai.AsyncOpenAI with:
+    - at most ``max_in_flight`` requests per process; extra callers queue
+    - a tokens-per-minute budget shared across replicas (a Redis token
+      bucket, charged the estimated prompt plus ``max_tokens`` up front)
+    - the openai upstream policy: per-attempt timeout, retries on
+      connection errors, 429s and 5xx, and a circuit breaker
+    - a content-addressed completion cache, checked before any of the above
+    ``base_url`` can point at any OpenAI-compatible server. The OpenAI SDK
+    is imported when the first gateway is built.
+    """
+
+    def __init__(self,
+                 client: Optional["openai.AsyncOpenAI"] = None,
+                 max_in_flight: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 policy: Optional[UpstreamPolicy] = None,
+                 cache: Optional[LLMCache] = None):
+        import openai
+
+        timeout = timeout or settings.OPENAI_TIMEOUT
+        # Retries and timeouts are owned by the policy, not the SDK
+        self.client = client or openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            timeout=timeout,
+            max_retries=0
+        )
+        self.policy = policy or build_policy(
+            "openai",
+            timeout,
+            retry_on=RETRYABLE_ERRORS + (
+                openai.APIConnectionError,
+                openai.RateLimitError,
+                openai.InternalServerError,
+            )
+        )
+        self.budget = RateGovernor(
+            "openai_tokens",
+            limit=tokens_per_minute or settings.OPENAI_TOKENS_PER_MINUTE,
+            period=60,
+            max_wait=settings.OPENAI_TOKEN_BUDGET_MAX_WAIT
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight or settings.OPENAI_MAX_IN_FLIGHT)
+        self.cache = cache or llm_cache
+
+    async def complete(self,
+                       *,
+                       model: str,
+                       messages: List[Dict[str, str]],
+                       temperature: float = 0.7,
+                       max_tokens: int = 500,
+                       use_cache: bool = True,
+                       cache_ttl: Optional[int] = None,
+                       **kwargs: Any) -> Completion:
+        """
+        Run a chat completion, answering from the cache when the same request was made before
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            use_cache: Whether to read and write the completion cache
+            cache_ttl: Seconds to cache the result (defaults to LLM_CACHE_TTL)
+            **kwargs: Passed through to chat.completions.create
+
+        Returns:
+            Completion with the text and token usage
+
+        Raises:
+            RateLimitTimeout: If the token budget does not free up in time
+            CircuitOpenError: If the OpenAI circuit is open
+        """
+        key = self.cache.key_for(model, temperature, messages, max_tokens=max_tokens, **kwargs)
+        if use_cache:
+            entry = await self.cache.get(key)
+            if entry is not None:
+                return _cached_completion(entry)
+
+        await self.budget.acquire(estimate_tokens(messages, max_tokens))
+        async with self._in_flight:
+            response = await self.policy.call(lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            ))
+        usage = response.usage
+        completion = Completion(
+            text=response.choices[0].message.content or "",
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0
+        )
+        if use_cache and completion.text:
+            entry = {
+                "text": completion.text,
+                "prompt_tokens": completion.prompt_tokens,
+                "completion_tokens": completion.completion_tokens,
+            }
+            await self.cache.set(key, entry, ttl=cache_ttl)
+        return completion
+
+    async def get_cached(self,
+                         *,
+                         model: str,
+                         messages: List[Dict[str, str]],
+                         temperature: float = 0.7,
+                         max_tokens: int = 500,
+                         **kwargs: Any) -> Optional[Completion]:
+        """
+        Return the cached completion for a request without calling the API
+        """
+        entry = await self.cache.get(
+            self.cache.key_for(model, temperature, messages, max_tokens=max_tokens, **kwargs)
+        )
+        return _cached_completion(entry) if entry is not None else None
+
+    async def bust(self,
+                   *,
+                   model: str,
+                   messages: List[Dict[str, str]],
+                   temperature: float = 0.7,
+                   max_tokens: int = 500,
+                   **kwargs: Any) -> None:
+        """
+        Drop the cached completion for a request
+        """
+        await self.cache.bust(self.cache.key_for(model, temperature, messages, max_tokens=max_tokens, **kwargs))
+
+    async def stream(self,
+                     *,
+                     model: str,
+                     messages: List[Dict[str, str]],
+                     temperature: float = 0.7,
+                     max_tokens: int = 500,
+                     **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Run a chat completion, yielding text deltas as they arrive
+
+        Opening the stream is retried like any other call; once tokens have
+        been yielded a failure is raised to the caller. The SDK timeout
+        applies to each read, so a stalled stream is cut off.
+
+        The in-flight slot and the connection are held until the generator
+        finishes or is closed. Callers that may stop iterating early must
+        consume it inside ``contextlib.aclosing`` so both are released right
+        away rather than when the generator is garbage collected.
+        """
+        await self.budget.acquire(estimate_tokens(messages, max_tokens))
+        await self._in_flight.acquire()
+        try:
+            response = await self.policy.call(lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            ))
+            try:
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Drop the HTTP stream if the consumer stopped early
+                await response.response.aclose()
+        finally:
+            self._in_flight.release()
+
+    async def close(self) -> None:
+        await self.client.close()
+
+@lru_cache()
+def get_llm_gateway() -> LLMGateway:
+    """Build the shared gateway on first use instead of at import time"""
+    return LLMGateway()
@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.models.property import Property
+from app.models.marketplace import MarketplaceMedia, MarketplacePublication, PublicationStatus
+from config import settings
+from services.facebook_graph import FacebookGraphClient
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.mls_sync import listing_to_row
+from services.rate_governor import RateLimitTimeout
+
+logger = logging.getLogger(__name__)
+
+def property_key(property_data: Dict[str, Any]) -> str:
+    """The mls_id a property is stored under; see listing_to_row"""
+    return str(property_data.get("mls_id") or property_data["id"])
+
+def _deferred() -> Dict[str, Any]:
+    return {"status": PublicationStatus.PENDING, "error": "Deferred: Facebook rate limit budget exhausted"}
+
+def listing_payload(property_data: Dict[str, Any], photo_ids: List[str]) -> Dict[str, Any]:
+    """
+    Format a property as a Marketplace listing
+
+    Args:
+        property_data: Dictionary containing property details
+        photo_ids: Facebook photo IDs of the already uploaded images
+
+    Returns:
+        Dict of listing fields for the marketplace_listings edge
+    """
+    return {
+        "title": property_data["title"],
+        "description": property_data["description"],
+        "price": property_data["price"],
+        "category": "RENTAL",
+        "location": {
+            "latitude": property_data.get("latitude"),
+            "longitude": property_data.get("longitude"),
+            "city": property_data.get("city"),
+            "state": property_data.get("state"),
+            "zip": property_data.get("zip")
+        },
+        "attached_media": [{"media_fbid": photo_id} for photo_id in photo_ids],
+        "availability": "AVAILABLE" if property_data.get("available", True) else "SOLD"
+    }
+
+class MarketplacePublisher:
+    """
+    Publishes many properties to Facebook Marketplace at once.
+
+    Images are downloaded and uploaded as unpublished photos with bounded
+    concurrency, deduplicated by the sha256 of their bytes so an image
+    shared between listings, or already uploaded by an earlier run, is
+    uploaded once. Listing creates are then sent as Graph batch requests.
+    Uploaded media and per-listing status are stored in the database, so
+    re-running after a partial failure only retries the failed listings
+    and does not upload their images again.
+    """
+
+    def __init__(self,
+                 graph: Optional[FacebookGraphClient] = None,
+                 session_factory=AsyncSessionLocal,
+                 session_manager: Optional[HTTPSessionManager] = None,
+                 upload_concurrency: Optional[int] = None):
+        self.graph = graph or FacebookGraphClient()
+        self.session_factory = session_factory
+        self.http = session_manager or http_session_manager
+        self.upload_concurrency = upload_concurrency or settings.MARKETPLACE_UPLOAD_CONCURRENCY
+
+    async def publish(self, properties: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Publish properties that are not already live on Marketplace
+
+        Properties are matched to rows in the properties table by ``mls_id``,
+        or by their ``id`` when they have none (the same key the MLS sync
+        uses), and rows are created for properties we have not stored yet.
+        No database transaction is held open while images upload or while
+        the listings are created. Listings that could not go out because the
+        Facebook rate limit budget ran out stay PENDING, without counting an
+        attempt, and are picked up by the next run.
+
+        Args:
+            properties: Property dicts, each with an ``id`` and ``images`` URLs
+
+        Returns:
+            Dict mapping each property's ``id`` as given to {"status", "listing_id", "error"}
+        """
+        async with self.session_factory() as db:
+            property_ids = await self._resolve_properties(db, properties)
+            publications = await self._load_publications(db, list(set(property_ids.values())))
+            todo = [
+                p for p in properties
+                if publications[property_ids[property_key(p)]].status != PublicationStatus.PUBLISHED
+            ]
+            await db.commit()
+
+        photo_ids, deferred_urls = await self._upload_media({url for p in todo for url in p.get("images") or []})
+
+        # Outcome per properties.id, written back in one transaction at the end
+        outcomes: Dict[int, Dict[str, Any]] = {}
+        operations = []
+        pending = []
+        for property_data in todo:
+            property_id = property_ids[property_key(property_data)]
+            urls = property_data.get("images") or []
+            if any(url in deferred_urls for url in urls):
+                outcomes[property_id] = _deferred()
+                continue
+            failed_urls = [url for url in urls if not photo_ids.get(url)]
+            if failed_urls:
+                outcomes[property_id] = {
+                    "status": PublicationStatus.FAILED,
+                    "error": f"Could not upload {len(failed_urls)} of {len(urls)} images",
+                    "attempted": True
+                }
+                continue
+            listing_photo_ids = [photo_ids[url] for url in urls]
+            outcomes[property_id] = {"photo_ids": listing_photo_ids, "attempted": True}
+            operations.append({
+                "method": "POST",
+                "relative_url": "me/marketplace_listings",
+                "body": listing_payload(property_data, listing_photo_ids)
+            })
+            pending.append(property_id)
+
+        if operations:
+            # batch() reports failures per operation, so listings created in
+            # other chunks are still recorded when one chunk fails; an error
+            # here means nothing was sent (e.g. the rate limit wait timed out)
+            try:
+                results = await self.graph.batch(operations)
+            except Exception as e:
+                logger.error("Error publishing Marketplace listings: %s", e)
+                results = [e] * len(pending)
+            now = datetime.now(timezone.utc)
+            for property_id, result in zip(pending, results):
+                if isinstance(result, RateLimitTimeout):
+                    outcomes[property_id] = _deferred()
+                elif isinstance(result, Exception):
+                    outcomes[property_id].update(status=PublicationStatus.FAILED, error=str(result))
+                else:
+                    outcomes[property_id].update(
+                        status=PublicationStatus.PUBLISHED,
+                        listing_id=str(result["id"]),
+                        published_at=now,
+                        error=None
+                    )
+
+        async with self.session_factory() as db:
+            publications = await self._load_publications(db, list(set(property_ids.values())))
+            for property_id, outcome in outcomes.items():
+                publication = publications[property_id]
+                if outcome.pop("attempted", False):
+                    publication.attempts = (publication.attempts or 0) + 1
+                for field, value in outcome.items():
+                    setattr(publication, field, value)
+            await db.commit()
+
+        created = sum(1 for outcome in outcomes.values() if outcome.get("status") == PublicationStatus.PUBLISHED)
+        deferred = sum(1 for outcome in outcomes.values() if outcome.get("status") == PublicationStatus.PENDING)
+        logger.info(
+            "Marketplace publish: %s listings created, %s failed, %s deferred by the rate limit, %s already live",
+            created, len(todo) - created - deferred, deferred, len(properties) - len(todo)
+        )
+        return {
+            property_data["id"]: {
+                "status": publications[property_ids[property_key(property_data)]].status.value,
+                "listing_id": publications[property_ids[property_key(property_data)]].listing_id,
+                "error": publications[property_ids[property_key(property_data)]].error
+            }
+            for property_data in properties
+        }
+
+    async def _resolve_properties(self, db: AsyncSession, properties: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Find, or create, the properties row for each property
+
+        Returns:
+            Dict mapping property_key() to properties.id
+        """
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for property_data in properties:
+            row = listing_to_row(property_data, now)
+            rows[row["mls_id"]] = row
+        await db.execute(
+            insert(Property)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(index_elements=[Property.mls_id])
+        )
+        result = await db.execute(select(Property.mls_id, Property.id).filter(Property.mls_id.in_(rows)))
+        return {mls_id: property_id for mls_id, property_id in result.all()}
+
+    async def _load_publications(self,
+                                 db: AsyncSession,
+                                 property_ids: List[int]) -> Dict[int, MarketplacePublication]:
+        result = await db.execute(
+            select(MarketplacePublication).filter(MarketplacePublication.property_id.in_(property_ids))
+        )
+        publications = {p.property_id: p for p in result.scalars().all()}
+        for property_id in property_ids:
+            if property_id not in publications:
+                publication = MarketplacePublication(property_id=property_id, status=PublicationStatus.PENDING)
+                db.add(publication)
+                publications[property_id] = publication
+        await db.flush()
+        return publications
+
+    async def _upload_media(self, urls: set) -> Tuple[Dict[str, Optional[str]], Set[str]]:
+        """
+        Make sure every image URL has an uploaded photo
+
+        Returns:
+            Dict mapping URL to Facebook photo ID, or None if the image could
+            not be uploaded, and the URLs that were not tried because the
+            rate limit budget ran out
+        """
+        deferred: Set[str] = set()
+        if not urls:
+            return {}, deferred
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(MarketplaceMedia.source_url, MarketplaceMedia.photo_id)
+                .filter(MarketplaceMedia.source_url.in_(urls))
+            )
+            photo_ids: Dict[str, Optional[str]] = {url: photo_id for url, photo_id in result.all()}
+
+        slots = asyncio.Semaphore(self.upload_concurrency)
+        uploads: Dict[str, asyncio.Task] = {}
+
+        async def upload_one(url: str) -> Optional[str]:
+            try:
+                async with slots:
+                    content = await self._download(url)
+                    digest = hashlib.sha256(content).hexdigest()
+                    if digest not in uploads:
+                        uploads[digest] = asyncio.ensure_future(self._upload_once(url, digest, content))
+                # Wait outside the slot so a duplicate does not hold one up
+                return await uploads[digest]
+            except RateLimitTimeout:
+                deferred.add(url)
+                return None
+            except Exception as e:
+                logger.error("Error uploading Marketplace image %s: %s", url, e)
+                return None
+
+        missing = [url for url in urls if url not in photo_ids]
+        for url, photo_id in zip(missing, await asyncio.gather(*(upload_one(url) for url in missing))):
+            photo_ids[url] = photo_id
+        return photo_ids, deferred
+
+    async def _download(self, url: str) -> bytes:
+        session = await self.http.get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            if (response.content_length or 0) > settings.MARKETPLACE_MAX_IMAGE_BYTES:
+                raise ValueError(f"Image is larger than {settings.MARKETPLACE_MAX_IMAGE_BYTES} bytes")
+            return await response.read()
+
+    async def _upload_once(self, url: str, digest: str, content: bytes) -> str:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(MarketplaceMedia.photo_id).filter(MarketplaceMedia.content_hash == digest)
+            )
+            photo_id = result.scalar_one_or_none()
+            if photo_id:
+                return photo_id
+
+            photo_id = await self.graph.upload_photo(content)
+            # Another replica may have uploaded the same image meanwhile; keep the first
+            await db.execute(
+                insert(MarketplaceMedia)
+                .values(content_hash=digest, source_url=url, photo_id=photo_id)
+                .on_conflict_do_nothing(index_elements=[MarketplaceMedia.content_hash])
+            )
+            await db.commit()
+            return photo_id
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+import logging
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.models.marketplace import MarketplacePublication, PublicationStatus
+from app.models.property import Property
+from app.models.sync_checkpoint import SyncCheckpoint
+from config import settings
+from services.facebook_graph import FacebookGraphClient
+from services.http_client import http_session_manager
+
+logger = logging.getLogger(__name__)
+
+# Only what reconciliation needs; titles, descriptions and media stay upstream
+LISTING_FIELDS = "id,availability,updated_time"
+
+@dataclass
+class MarketplaceSyncStats:
+    pages: int = 0
+    listings: int = 0
+    matched: int = 0
+    missing: int = 0
+    stale: int = 0  # live upstream although the property is no longer available
+    full: bool = False
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("started")
+        return data
+
+class MarketplaceSync:
+    """
+    Syncs our Marketplace listings back from Facebook.
+
+    Walks the marketplace_listings edge page by page via ``paging.next``,
+    asking only for the fields reconciliation needs and committing each page
+    before fetching the next, so memory stays bounded by the page size.
+    Incremental runs only ask for listings updated since the watermark (the
+    start of the last completed run, minus a small overlap). A full run
+    reads every listing and marks publications that no longer appear
+    upstream as missing.
+    """
+
+    def __init__(self,
+                 graph: Optional[FacebookGraphClient] = None,
+                 session_factory=AsyncSessionLocal,
+                 name: str = "facebook_marketplace",
+                 page_size: Optional[int] = None):
+        self.graph = graph or FacebookGraphClient()
+        self.session_factory = session_factory
+        self.name = name
+        self.page_size = page_size or settings.MARKETPLACE_SYNC_PAGE_SIZE
+
+    async def run(self, full: bool = False) -> MarketplaceSyncStats:
+        """
+        Run a sync
+
+        Args:
+            full: Read every listing and mark publications missing upstream
+
+        Returns:
+            MarketplaceSyncStats with page/listing counts
+        """
+        stats = MarketplaceSyncStats()
+        started_at = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            checkpoint = await self._load_checkpoint(db)
+            full = full or checkpoint.watermark is None
+            stats.full = full
+
+            params = {
+                "fields": LISTING_FIELDS,
+                "limit": self.page_size,
+                "until": int(started_at.timestamp()),
+            }
+            if not full:
+                since = checkpoint.watermark - timedelta(seconds=settings.MARKETPLACE_SYNC_OVERLAP)
+                params["since"] = int(since.timestamp())
+
+            # IDs only, so a full run stays small even with many listings
+            seen: Set[str] = set()
+            async for listings in self.graph.iter_pages("me/marketplace_listings", **params):
+                await self._apply_page(db, listings, started_at, stats)
+                if full:
+                    seen.update(str(listing["id"]) for listing in listings)
+
+            if full:
+                await self._mark_missing(db, seen, started_at, stats)
+
+            checkpoint.watermark = started_at
+            stats.elapsed = time.monotonic() - stats.started
+            checkpoint.stats = stats.as_dict()
+            await db.commit()
+
+        logger.info(
+            "Marketplace sync finished (%s): %s listings, %s matched, %s missing, %s stale",
+            "full" if full else "incremental",
+            stats.listings, stats.matched, stats.missing, stats.stale
+        )
+        return stats
+
+    async def _load_checkpoint(self, db: AsyncSession) -> SyncCheckpoint:
+        result = await db.execute(select(SyncCheckpoint).filter(SyncCheckpoint.name == self.name))
+        checkpoint = result.scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = SyncCheckpoint(name=self.name)
+            db.add(checkpoint)
+            await db.flush()
+        return checkpoint
+
+    async def _apply_page(self,
+                          db: AsyncSession,
+                          listings: List[Dict[str, Any]],
+                          seen_at: datetime,
+                          stats: MarketplaceSyncStats) -> None:
+        """
+        Reconcile one page of listings with their publications and properties
+        """
+        stats.pages += 1
+        stats.listings += len(listings)
+        if not listings:
+            return
+        upstream = {str(listing["id"]): listing for listing in listings}
+        result = await db.execute(
+            select(MarketplacePublication, Property.available)
+            .join(Property, Property.id == MarketplacePublication.property_id)
+            .filter(MarketplacePublication.listing_id.in_(list(upstream)))
+        )
+        rows = result.all()
+        for publication, property_available in rows:
+            listing = upstream[publication.listing_id]
+            publication.last_seen_at = seen_at
+            publication.upstream_status = listing.get("availability")
+            if publication.status == PublicationStatus.MISSING:
+                publication.status = PublicationStatus.PUBLISHED
+            if not property_available and listing.get("availability") == "AVAILABLE":
+                stats.stale += 1
+            stats.matched += 1
+        await db.commit()
+        # Drop this page's rows from the identity map so memory does not grow per page
+        for publication, _ in rows:
+            db.expunge(publication)
+
+    async def _mark_missing(self,
+                            db: AsyncSession,
+                            seen: Set[str],
+                            started_at: datetime,
+                            stats: MarketplaceSyncStats) -> None:
+        # Listings published while the sync ran fall after ``until`` and were not read
+        result = await db.execute(
+            select(MarketplacePublication.id, MarketplacePublication.listing_id)
+            .filter(
+                MarketplacePublication.status == PublicationStatus.PUBLISHED,
+                MarketplacePublication.published_at < started_at
+            )
+        )
+        missing = [row.id for row in result.all() if row.listing_id not in seen]
+        for start in range(0, len(missing), 1000):
+            await db.execute(
+                update(MarketplacePublication)
+                .where(MarketplacePublication.id.in_(missing[start:start + 1000]))
+                .values(status=PublicationStatus.MISSING)
+            )
+        stats.missing = len(missing)
+        if missing:
+            logger.warning("%s Marketplace listings are missing upstream", len(missing))
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync Facebook Marketplace listings back into the database")
+    parser.add_argument("--full", action="store_true", help="read every listing and mark missing ones")
+    args = parser.parse_args()
+    try:
+        stats = await MarketplaceSync().run(full=args.full)
+        print(f"Marketplace sync result: {stats.as_dict()}")
+    finally:
+        await http_session_manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
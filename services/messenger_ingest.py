@@ -0,0 +1,202 @@
+import asyncio
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import logging
+from sqlalchemy import insert
+from app.db.session import AsyncSessionLocal
+from app.models.lead import Lead, LeadStatus
+from config import settings
+from services.facebook_service import FacebookService
+
+logger = logging.getLogger(__name__)
+
+# Per-sender locks, dropped automatically once no task holds them
+_sender_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _sender_lock(sender_id: str) -> asyncio.Lock:
+    lock = _sender_locks.get(sender_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _sender_locks[sender_id] = lock
+    return lock
+
+def parse_events(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten a Messenger webhook payload into message events
+
+    Args:
+        payload: Webhook body as sent by Facebook
+
+    Returns:
+        List of {"sender_id", "timestamp", "text", "payload"} dicts; echoes
+        of our own messages and non-message events are skipped
+    """
+    events = []
+    for entry in payload.get("entry", []):
+        for messaging in entry.get("messaging", []):
+            message = messaging.get("message") or {}
+            postback = messaging.get("postback") or {}
+            if message.get("is_echo") or not (message or postback):
+                continue
+            events.append({
+                "sender_id": str(messaging["sender"]["id"]),
+                "timestamp": messaging.get("timestamp", 0),
+                "text": message.get("text") or postback.get("title") or "",
+                "payload": (message.get("quick_reply") or {}).get("payload") or postback.get("payload"),
+            })
+    return events
+
+class MessengerIngestor:
+    """
+    Processes Messenger webhook deliveries.
+
+    Events are grouped by sender; senders are handled concurrently, at most
+    ``concurrency`` at a time, while each sender's events run one after
+    another in timestamp order under a per-sender lock, so overlapping
+    deliveries for the same sender cannot interleave within a process.
+    Conversations that complete are inserted as leads in batches at the
+    end of each delivery.
+    """
+
+    def __init__(self,
+                 facebook_service: Optional[FacebookService] = None,
+                 session_factory=AsyncSessionLocal,
+                 concurrency: Optional[int] = None,
+                 lead_batch_size: Optional[int] = None):
+        self.facebook = facebook_service or FacebookService()
+        self.conversations = self.facebook.conversations
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.MESSENGER_INGEST_CONCURRENCY
+        self.lead_batch_size = lead_batch_size or settings.MESSENGER_LEAD_BATCH_SIZE
+
+    async def ingest(self, payload: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Handle one webhook delivery
+
+        Args:
+            payload: Webhook body as sent by Facebook
+
+        Returns:
+            Dict with counts of events, senders, failed senders and leads inserted
+        """
+        by_sender: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for event in parse_events(payload):
+            by_sender[event["sender_id"]].append(event)
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_sender(sender_id: str, events: List[Dict[str, Any]]) -> None:
+            async with slots, _sender_lock(sender_id):
+                for event in sorted(events, key=lambda e: e["timestamp"]):
+                    await self._handle_event(event)
+
+        results = await asyncio.gather(
+            *(run_sender(sender_id, events) for sender_id, events in by_sender.items()),
+            return_exceptions=True
+        )
+        failed = 0
+        for sender_id, result in zip(by_sender, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.error("Error handling Messenger events from %s: %s", sender_id, result)
+
+        return {
+            "events": sum(len(events) for events in by_sender.values()),
+            "senders": len(by_sender),
+            "failed_senders": failed,
+            "leads": await self.flush_leads(),
+        }
+
+    async def _handle_event(self, event: Dict[str, Any]) -> None:
+        sender_id = event["sender_id"]
+        text = event["text"] or event["payload"] or ""
+        state = await self.conversations.get(sender_id)
+        if state:
+            reply = await self.facebook.collect_lead_info(sender_id, state["step"], text)
+        elif event["payload"] == "CONTACT":
+            reply = await self.facebook.start_lead_collection(sender_id)
+        else:
+            reply = await self.facebook.handle_messenger_message(sender_id, text)
+        await self._send(sender_id, reply)
+
+    async def _send(self, sender_id: str, reply: Dict[str, Any]) -> None:
+        message: Dict[str, Any] = {"text": reply["message"]}
+        if reply.get("quick_replies"):
+            message["quick_replies"] = [
+                {"content_type": "text", "title": option["title"], "payload": option["payload"]}
+                for option in reply["quick_replies"]
+            ]
+        await self.facebook.messenger.post(
+            "me/messages",
+            recipient={"id": sender_id},
+            messaging_type="RESPONSE",
+            message=message
+        )
+
+    async def flush_leads(self) -> int:
+        """
+        Insert queued lead captures in batches of ``lead_batch_size``
+
+        Returns:
+            Number of leads inserted
+        """
+        inserted = 0
+        while True:
+            captures = await self.conversations.pop_completed(self.lead_batch_size)
+            if not captures:
+                break
+            rows = [
+                {
+                    "name": capture.get("name"),
+                    "email": capture.get("email"),
+                    "phone": capture.get("phone"),
+                    "source": "facebook_messenger",
+                    "status": LeadStatus.NEW,
+                    "preferences": {"property_type": capture.get("property_type")},
+                    "notes": f"Messenger sender {capture['sender_id']}",
+                }
+                for capture in captures
+            ]
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(insert(Lead), rows)
+                    await db.commit()
+            except Exception as e:
+                logger.error("Error inserting %s Messenger leads, retrying one by one: %s", len(rows), e)
+                failed = await self._insert_each(captures, rows)
+                inserted += len(rows) - len(failed)
+                if failed:
+                    dead = await self.conversations.requeue(failed)
+                    logger.error(
+                        "Requeued %s Messenger leads, dead-lettered %s after repeated failures",
+                        len(failed) - dead, dead
+                    )
+                    break
+                continue
+            inserted += len(rows)
+            if len(captures) < self.lead_batch_size:
+                break
+        if inserted:
+            logger.info("Inserted %s leads from Messenger", inserted)
+        return inserted
+
+    async def _insert_each(self,
+                           captures: List[Dict[str, Any]],
+                           rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert rows one at a time so a bad row does not fail the rest of its batch
+
+        Returns:
+            The captures whose rows could not be inserted
+        """
+        failed = []
+        for capture, row in zip(captures, rows):
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(insert(Lead), [row])
+                    await db.commit()
+            except Exception as e:
+                logger.error("Error inserting Messenger lead from %s: %s", capture["sender_id"], e)
+                failed.append(capture)
+        return failed
@@ -1,13 +1,39 @@
 import aiohttp
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
+import time
 from datetime import datetime
 from config import settings
+from services.cache import TieredCache
+from services.http_client import HTTPSessionManager, http_session_manager
+from services.resilience import get_policy, raise_for_retryable_status
 
 logger = logging.getLogger(__name__)
 
+# Property details shared by every MLSService in the process (hot tier) and
+# across replicas (Redis)
+property_details_cache = TieredCache(
+    "mls:property",
+    hot_ttl=settings.MLS_CACHE_HOT_TTL,
+    hot_max_entries=settings.MLS_CACHE_HOT_SIZE
+)
+
+# Detail requests currently in flight, keyed by property ID, so concurrent
+# callers asking for the same listing share one upstream request
+_inflight_details: Dict[str, asyncio.Future] = {}
+
+class BatchNotSupported(Exception):
+    """Raised when the MLS does not expose the batch details endpoint"""
+
 class MLSService:
-    def __init__(self):
+    def __init__(self,
+                 session_manager: Optional[HTTPSessionManager] = None,
+                 details_cache: Optional[TieredCache] = None):
+        self.http = session_manager or http_session_manager
+        self.policy = get_policy("mls")
+        self.details_cache = details_cache or property_details_cache
+        self._batch_supported: Optional[bool] = None
         self.api_key = settings.MLS_API_KEY
         self.base_url = settings.MLS_API_URL
         self.headers = {
@@ -15,6 +41,45 @@ class MLSService:
             "Content-Type": "application/json"
         }
 
+    async def fetch_properties_page(self,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    page: int = 1,
+                                    page_size: int = 20) -> Dict[str, Any]:
+        """
+        Fetch one page of properties, raising on any upstream failure
+        
+        Args:
+            filters: Dictionary of filters to apply
+            page: Page number for pagination
+            page_size: Number of items per page
+            
+        Returns:
+            Dict containing properties and pagination info
+            
+        Raises:
+            aiohttp.ClientError: If the request fails or returns a non-2xx status
+            UpstreamServerError: If the MLS keeps returning 5xx/429 after retries
+            CircuitOpenError: If the MLS circuit is open
+        """
+        async def request():
+            session = await self.http.get_session()
+            params = {
+                "page": page,
+                "page_size": page_size,
+                **(filters or {})
+            }
+        
+            async with session.get(
+                f"{self.base_url}/properties",
+                headers=self.headers,
+                params=params
+            ) as response:
+                raise_for_retryable_status(response)
+                response.raise_for_status()
+                return await response.json()
+
+        return await self.policy.call(request)
+
     async def get_properties(self,
                            filters: Optional[Dict[str, Any]] = None,
                            page: int = 1,
@@ -31,32 +96,21 @@ class MLSService:
             Dict containing properties and pagination info
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "page": page,
-                    "page_size": page_size,
-                    **(filters or {})
-                }
-                
-                async with session.get(
-                    f"{self.base_url}/properties",
-                    headers=self.headers,
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Error fetching properties: {response.status}")
-                        return {"properties": [], "total": 0, "page": page, "page_size": page_size}
-                        
+            return await self.fetch_properties_page(filters=filters, page=page, page_size=page_size)
+        except aiohttp.ClientResponseError as e:
+            logger.error("Error fetching properties: %s", e.status)
+            return {"properties": [], "total": 0, "page": page, "page_size": page_size}
         except Exception as e:
-            logger.error(f"Error fetching properties: {str(e)}")
+            logger.error("Error fetching properties: %s", e)
             return {"properties": [], "total": 0, "page": page, "page_size": page_size}
 
     async def get_property_details(self, property_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a specific property
         
+        Results (including 404s) are cached; stale entries are revalidated
+        with If-None-Match/If-Modified-Since when the upstream sent validators.
+        
         Args:
             property_id: ID of the property to get details for
             
@@ -64,21 +118,217 @@ class MLSService:
             Dict containing property details or None if not found
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/properties/{property_id}",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Error fetching property details: {response.status}")
-                        return None
-                        
+            entry = await self.details_cache.get(property_id)
+            if entry and entry["expires_at"] > time.time():
+                return entry["data"]
+            return await self._coalesced_fetch(property_id, entry)
+                    
         except Exception as e:
-            logger.error(f"Error fetching property details: {str(e)}")
+            logger.error("Error fetching property details: %s", e)
             return None
 
+    async def get_property_details_many(self, property_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get details for many properties at once
+        
+        Cached ids are served locally, ids already being fetched join the
+        in-flight request, and the rest go through the MLS batch endpoint when
+        it exists or a bounded-concurrency fan-out when it does not.
+        
+        Args:
+            property_ids: IDs of the properties to get details for
+            
+        Returns:
+            Dict mapping each requested ID to its details, or None if not found
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        stale: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending: Dict[str, asyncio.Future] = {}
+        now = time.time()
+
+        for property_id in dict.fromkeys(property_ids):
+            entry = await self.details_cache.get(property_id)
+            if entry and entry["expires_at"] > now:
+                results[property_id] = entry["data"]
+            elif property_id in _inflight_details:
+                pending[property_id] = _inflight_details[property_id]
+            else:
+                stale[property_id] = entry
+
+        # Claim the ids before the first await so concurrent callers, batched
+        # or single, join these requests instead of sending their own
+        owned: Dict[str, asyncio.Future] = {}
+        for property_id in stale:
+            if property_id in _inflight_details:
+                pending[property_id] = _inflight_details[property_id]
+            else:
+                owned[property_id] = self._claim_inflight(property_id)
+
+        try:
+            missing = list(owned)
+            if missing and self._batch_supported is not False:
+                try:
+                    for start in range(0, len(missing), settings.MLS_BATCH_SIZE):
+                        chunk = await self._fetch_details_batch(missing[start:start + settings.MLS_BATCH_SIZE])
+                        for property_id, details in chunk.items():
+                            owned[property_id].set_result(details)
+                            results[property_id] = details
+                except BatchNotSupported:
+                    logger.info("MLS batch endpoint not available, falling back to concurrent fetches")
+                    self._batch_supported = False
+                except Exception as e:
+                    logger.error("Error fetching property details batch: %s", e)
+                missing = [property_id for property_id in missing if property_id not in results]
+
+            if missing:
+                semaphore = asyncio.Semaphore(settings.MLS_FANOUT_CONCURRENCY)
+
+                async def fetch_one(property_id: str) -> Optional[Dict[str, Any]]:
+                    async with semaphore:
+                        return await self._fetch_property_details(property_id, stale[property_id])
+
+                fetched = await asyncio.gather(*(fetch_one(i) for i in missing), return_exceptions=True)
+                for property_id, details in zip(missing, fetched):
+                    if isinstance(details, Exception):
+                        logger.error("Error fetching property details for %s: %s", property_id, details)
+                        details = None
+                    owned[property_id].set_result(details)
+                    results[property_id] = details
+        finally:
+            for future in owned.values():
+                if not future.done():
+                    # Only reached if we were cancelled; let joined callers fail instead of hang
+                    future.set_exception(RuntimeError("MLS details request was abandoned"))
+                    future.exception()
+
+        for property_id, future in pending.items():
+            try:
+                results[property_id] = await asyncio.shield(future)
+            except Exception as e:
+                logger.error("Error fetching property details for %s: %s", property_id, e)
+                results[property_id] = None
+
+        return results
+
+    def _claim_inflight(self, property_id: str) -> asyncio.Future:
+        """
+        Register a future other callers can join while we fetch ``property_id`` ourselves
+        """
+        future = asyncio.get_running_loop().create_future()
+        _inflight_details[property_id] = future
+
+        def release(done: asyncio.Future) -> None:
+            if _inflight_details.get(property_id) is done:
+                del _inflight_details[property_id]
+
+        future.add_done_callback(release)
+        return future
+
+    async def _coalesced_fetch(self,
+                               property_id: str,
+                               entry: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch property details, sharing one request between concurrent callers for the same ID
+        """
+        future = _inflight_details.get(property_id)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_property_details(property_id, entry))
+            _inflight_details[property_id] = future
+            future.add_done_callback(lambda _: _inflight_details.pop(property_id, None))
+        # Shield so one caller being cancelled does not cancel the shared request
+        return await asyncio.shield(future)
+
+    async def _fetch_details_batch(self, property_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch details for up to MLS_BATCH_SIZE properties in one request
+        
+        Raises:
+            BatchNotSupported: If the MLS does not expose a batch endpoint
+        """
+        async def request():
+            session = await self.http.get_session()
+            async with session.post(
+                f"{self.base_url}/properties/batch",
+                headers=self.headers,
+                json={"ids": property_ids}
+            ) as response:
+                if response.status in (404, 405, 501):
+                    raise BatchNotSupported()
+                raise_for_retryable_status(response)
+                response.raise_for_status()
+                return await response.json()
+
+        # Read-only despite being a POST, so safe to retry
+        data = await self.policy.call(request)
+
+        self._batch_supported = True
+        found = {
+            str(details.get("id")): details
+            for details in data.get("properties", [])
+        }
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for property_id in property_ids:
+            details = found.get(str(property_id))
+            # Ids missing from a batch response do not exist upstream
+            await self._cache_details(property_id, details)
+            results[property_id] = details
+        return results
+
+    async def _fetch_property_details(self,
+                                      property_id: str,
+                                      entry: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch property details from the MLS, revalidating a stale cache entry if given
+        """
+        headers = dict(self.headers)
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        async def request():
+            session = await self.http.get_session()
+            async with session.get(
+                f"{self.base_url}/properties/{property_id}",
+                headers=headers
+            ) as response:
+                raise_for_retryable_status(response)
+                if response.status == 304 and entry:
+                    await self._cache_details(property_id, entry["data"], entry.get("etag"), entry.get("last_modified"))
+                    return entry["data"]
+                elif response.status == 200:
+                    data = await response.json()
+                    await self._cache_details(
+                        property_id,
+                        data,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified")
+                    )
+                    return data
+                elif response.status == 404:
+                    await self._cache_details(property_id, None)
+                    return None
+                else:
+                    logger.error("Error fetching property details: %s", response.status)
+                    return None
+
+        return await self.policy.call(request)
+
+    async def _cache_details(self,
+                             property_id: str,
+                             data: Optional[Dict[str, Any]],
+                             etag: Optional[str] = None,
+                             last_modified: Optional[str] = None) -> None:
+        fresh_for = settings.MLS_CACHE_TTL if data is not None else settings.MLS_CACHE_NEGATIVE_TTL
+        entry = {
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": time.time() + fresh_for
+        }
+        # Keep stale entries around so they can be revalidated cheaply
+        await self.details_cache.set(property_id, entry, ttl=max(settings.MLS_CACHE_RETENTION, fresh_for))
+
     async def check_availability(self, property_id: str) -> bool:
         """
         Check if a property is currently available
@@ -96,7 +346,7 @@ class MLSService:
             return False
             
         except Exception as e:
-            logger.error(f"Error checking property availability: {str(e)}")
+            logger.error("Error checking property availability: %s", e)
             return False
 
     async def get_similar_properties(self,
@@ -105,13 +355,25 @@ class MLSService:
         """
         Get similar properties based on a reference property
         
+        Listings already synced into our properties table are ranked locally
+        by the similarity index; the MLS search is only used as a fallback
+        for listings we do not hold.
+        
         Args:
-            property_id: ID of the reference property
+            property_id: MLS ID of the reference property
             limit: Maximum number of similar properties to return
             
         Returns:
-            List of similar properties
+            List of similar properties, most similar first
         """
+        try:
+            local = await self._get_similar_local(property_id, limit)
+        except Exception as e:
+            logger.warning("Local similarity lookup failed for %s, using MLS search: %s", property_id, e)
+            local = None
+        if local is not None:
+            return local
+
         try:
             property_details = await self.get_property_details(property_id)
             if not property_details:
@@ -140,9 +402,37 @@ class MLSService:
             return results.get("properties", [])
             
         except Exception as e:
-            logger.error(f"Error finding similar properties: {str(e)}")
+            logger.error("Error finding similar properties: %s", e)
             return []
 
+    async def _get_similar_local(self, property_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rank similar listings from the local properties table, or None if the listing is not held locally
+        """
+        from app.db.session import AsyncSessionLocal
+        from utils.similarity import similarity_index
+
+        async with AsyncSessionLocal() as db:
+            ranked = await similarity_index.similar_to(db, mls_id=property_id, k=limit)
+        if ranked is None:
+            return None
+        return [
+            {
+                "id": prop.mls_id,
+                "title": prop.title,
+                "description": prop.description,
+                "price": prop.price,
+                "location": prop.location,
+                "property_type": prop.property_type,
+                "bedrooms": prop.bedrooms,
+                "bathrooms": prop.bathrooms,
+                "square_feet": prop.square_feet,
+                "images": prop.images,
+                "similarity": round(score, 4)
+            }
+            for prop, score in ranked
+        ]
+
     async def update_property_status(self,
                                    property_id: str,
                                    status: str,
@@ -159,25 +449,30 @@ class MLSService:
             bool: True if update was successful
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 payload = {
                     "status": status,
                     **(additional_info or {})
                 }
-                
+            
                 async with session.patch(
                     f"{self.base_url}/properties/{property_id}",
                     headers=self.headers,
                     json=payload
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
+                        await self.details_cache.delete(property_id)
                         return True
                     else:
-                        logger.error(f"Error updating property status: {response.status}")
+                        logger.error("Error updating property status: %s", response.status)
                         return False
-                        
+
+            return await self.policy.call(request, idempotent=False)
+                    
         except Exception as e:
-            logger.error(f"Error updating property status: {str(e)}")
+            logger.error("Error updating property status: %s", e)
             return False
 
     async def get_property_history(self, property_id: str) -> List[Dict[str, Any]]:
@@ -191,17 +486,21 @@ class MLSService:
             List of historical events
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async def request():
+                session = await self.http.get_session()
                 async with session.get(
                     f"{self.base_url}/properties/{property_id}/history",
                     headers=self.headers
                 ) as response:
+                    raise_for_retryable_status(response)
                     if response.status == 200:
                         return await response.json()
                     else:
-                        logger.error(f"Error fetching property history: {response.status}")
+                        logger.error("Error fetching property history: %s", response.status)
                         return []
-                        
+
+            return await self.policy.call(request)
+                    
         except Exception as e:
-            logger.error(f"Error fetching property history: {str(e)}")
+            logger.error("Error fetching property history: %s", e)
             return [] 
\ No newline at end of file
@@ -0,0 +1,247 @@
+import asyncio
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import response_cache
+from app.db.session import AsyncSessionLocal
+from app.models.property import Property
+from app.models.sync_checkpoint import SyncCheckpoint
+from config import settings
+from services.http_client import http_session_manager
+from services.mls_service import MLSService
+
+logger = logging.getLogger(__name__)
+
+# Property columns owned by the MLS feed; everything else is left untouched on update
+SYNCED_COLUMNS = (
+    "title",
+    "description",
+    "price",
+    "location",
+    "bedrooms",
+    "bathrooms",
+    "square_feet",
+    "available",
+    "property_type",
+    "listing_type",
+    "features",
+    "images",
+)
+
+@dataclass
+class SyncStats:
+    pages: int = 0
+    listings: int = 0
+    upserted: int = 0
+    resumed_from_page: Optional[int] = None
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    @property
+    def listings_per_second(self) -> float:
+        return self.listings / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("started")
+        data["listings_per_second"] = round(self.listings_per_second, 2)
+        return data
+
+def listing_to_row(listing: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """
+    Map an MLS listing payload onto Property columns
+
+    Args:
+        listing: Listing as returned by the MLS API
+        now: Timestamp to stamp on created_at/updated_at
+
+    Returns:
+        Dict of column values keyed by Property attribute name
+    """
+    return {
+        "mls_id": str(listing.get("mls_id") or listing["id"]),
+        "title": listing.get("title") or listing.get("address", ""),
+        "description": listing.get("description", ""),
+        "price": listing.get("price"),
+        "location": listing.get("location") or listing.get("address", ""),
+        "bedrooms": listing.get("bedrooms"),
+        "bathrooms": listing.get("bathrooms"),
+        "square_feet": listing.get("square_feet"),
+        "available": str(listing.get("status", "available")).lower() == "available",
+        "property_type": listing.get("property_type"),
+        "listing_type": listing.get("listing_type"),
+        "features": listing.get("features") or {},
+        "images": listing.get("images") or [],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+class MLSSyncEngine:
+    """
+    Pulls listings from the MLS into the properties table.
+
+    Pages are fetched with bounded concurrency in windows of ``concurrency``
+    pages. Each window is upserted on ``mls_id`` with bulk INSERT ... ON
+    CONFLICT statements and committed together with the checkpoint, so a run
+    that dies part-way resumes from the first page that was not persisted.
+    Incremental runs only ask for listings updated since the start of the
+    last completed run.
+    """
+
+    def __init__(self,
+                 mls_service: Optional[MLSService] = None,
+                 session_factory=AsyncSessionLocal,
+                 name: str = "mls",
+                 concurrency: Optional[int] = None,
+                 page_size: Optional[int] = None,
+                 upsert_batch: Optional[int] = None):
+        self.mls = mls_service or MLSService()
+        self.session_factory = session_factory
+        self.name = name
+        self.concurrency = concurrency or settings.MLS_SYNC_CONCURRENCY
+        self.page_size = page_size or settings.MLS_SYNC_PAGE_SIZE
+        self.upsert_batch = upsert_batch or settings.MLS_SYNC_UPSERT_BATCH
+
+    async def run(self, full: bool = False) -> SyncStats:
+        """
+        Run (or resume) a sync
+
+        Args:
+            full: Ignore the watermark and pull every listing
+
+        Returns:
+            SyncStats with page/listing counts and throughput
+        """
+        stats = SyncStats()
+        async with self.session_factory() as db:
+            checkpoint = await self._load_checkpoint(db)
+
+            if checkpoint.run_started_at and not full:
+                # A previous run died part-way: continue where it stopped
+                start_page = checkpoint.next_page or 1
+                stats.resumed_from_page = start_page
+                logger.info("Resuming MLS sync from page %s", start_page)
+            else:
+                checkpoint.run_started_at = datetime.now(timezone.utc)
+                checkpoint.updated_since = None if full else checkpoint.watermark
+                checkpoint.next_page = 1
+                checkpoint.total_pages = None
+                start_page = 1
+                await db.commit()
+
+            filters = {}
+            if checkpoint.updated_since:
+                filters["updated_since"] = checkpoint.updated_since.isoformat()
+
+            first = await self.mls.fetch_properties_page(filters=filters, page=start_page, page_size=self.page_size)
+            checkpoint.total_pages = max(math.ceil(first.get("total", 0) / self.page_size), start_page)
+            await self._persist(db, checkpoint, [first], start_page, stats)
+
+            page = start_page + 1
+            while page <= checkpoint.total_pages:
+                window = range(page, min(page + self.concurrency, checkpoint.total_pages + 1))
+                results = await asyncio.gather(*(
+                    self.mls.fetch_properties_page(filters=filters, page=p, page_size=self.page_size)
+                    for p in window
+                ))
+                await self._persist(db, checkpoint, results, window[-1], stats)
+                page = window[-1] + 1
+
+            stats.elapsed = time.monotonic() - stats.started
+            checkpoint.watermark = checkpoint.run_started_at
+            checkpoint.run_started_at = None
+            checkpoint.updated_since = None
+            checkpoint.next_page = 1
+            checkpoint.stats = stats.as_dict()
+            await db.commit()
+
+        logger.info(
+            "MLS sync finished: %s listings in %s pages, %.1f listings/s",
+            stats.listings, stats.pages, stats.listings_per_second
+        )
+        return stats
+
+    async def _load_checkpoint(self, db: AsyncSession) -> SyncCheckpoint:
+        result = await db.execute(select(SyncCheckpoint).filter(SyncCheckpoint.name == self.name))
+        checkpoint = result.scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = SyncCheckpoint(name=self.name, next_page=1)
+            db.add(checkpoint)
+            await db.flush()
+        return checkpoint
+
+    async def _persist(self,
+                       db: AsyncSession,
+                       checkpoint: SyncCheckpoint,
+                       pages: List[Dict[str, Any]],
+                       last_page: int,
+                       stats: SyncStats) -> None:
+        """
+        Upsert one window of pages and advance the checkpoint in the same transaction
+        """
+        now = datetime.now(timezone.utc)
+        rows: Dict[str, Dict[str, Any]] = {}
+        for page in pages:
+            for listing in page.get("properties", []):
+                row = listing_to_row(listing, now)
+                # ON CONFLICT cannot touch the same row twice in one statement
+                rows[row["mls_id"]] = row
+            stats.pages += 1
+            stats.listings += len(page.get("properties", []))
+
+        batch = list(rows.values())
+        for start in range(0, len(batch), self.upsert_batch):
+            await self._upsert(db, batch[start:start + self.upsert_batch])
+        stats.upserted += len(batch)
+
+        checkpoint.next_page = last_page + 1
+        await db.commit()
+        if batch:
+            await self._purge_listing_cache()
+        stats.elapsed = time.monotonic() - stats.started
+        logger.info(
+            "MLS sync page %s/%s: %s listings, %.1f listings/s",
+            last_page, checkpoint.total_pages, stats.listings, stats.listings_per_second
+        )
+
+    async def _purge_listing_cache(self) -> None:
+        # Bulk upserts bypass PropertyRepository, so drop cached listings here
+        try:
+            await response_cache.purge("properties")
+        except RedisError as e:
+            logger.warning("Could not purge listing cache: %s", e)
+
+    async def _upsert(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        stmt = insert(Property).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Property.mls_id],
+            set_={
+                **{column: stmt.excluded[column] for column in SYNCED_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await db.execute(stmt)
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync MLS listings into the properties table")
+    parser.add_argument("--full", action="store_true", help="ignore the watermark and pull every listing")
+    args = parser.parse_args()
+    try:
+        stats = await MLSSyncEngine().run(full=args.full)
+        print(f"MLS sync result: {stats.as_dict()}")
+    finally:
+        await http_session_manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import logging
+from redis.exceptions import RedisError
+from config import settings
+from services.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket from the time elapsed since the last call, then either take
+# the requested tokens (returns 0) or report how many ms until enough have
+# accrued. Redis' own clock is used so replicas with skewed clocks agree.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_ms)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = math.ceil((requested - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms) + 1000)
+return wait
+"""
+
+class RateLimitTimeout(Exception):
+    """Raised when a call cannot get a token before its deadline"""
+
+class RateGovernor:
+    """
+    Outbound token bucket for one provider, shared across replicas through Redis.
+
+    The bucket holds up to ``burst`` tokens and refills at ``limit`` tokens
+    per ``period`` seconds. Callers in one process queue in FIFO order and
+    wait for a token for at most ``max_wait`` seconds before giving up with
+    RateLimitTimeout. If Redis is unavailable calls are let through rather
+    than blocked.
+    """
+
+    def __init__(self,
+                 name: str,
+                 limit: int,
+                 period: float,
+                 burst: Optional[int] = None,
+                 max_wait: float = 30):
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.burst = burst or limit
+        self.max_wait = max_wait
+        self.key = f"rate:{name}"
+        self._queue = asyncio.Lock()
+        self._script = None
+        # Metrics
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    @property
+    def refill_per_ms(self) -> float:
+        return self.limit / (self.period * 1000)
+
+    async def _take(self, tokens: int) -> int:
+        if self._script is None:
+            self._script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+        try:
+            return int(await self._script(keys=[self.key], args=[self.burst, self.refill_per_ms, tokens]))
+        except RedisError as e:
+            logger.warning("Rate governor %s could not reach Redis, letting call through: %s", self.name, e)
+            return 0
+
+    async def acquire(self, tokens: int = 1, max_wait: Optional[float] = None) -> float:
+        """
+        Wait for tokens
+
+        Args:
+            tokens: Number of upstream calls about to be made. More than the
+                burst size are taken in burst-sized slices, so the full cost
+                is always charged.
+            max_wait: Seconds to wait before giving up (defaults to the governor's max_wait)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If the tokens did not become available in time.
+                Slices already taken are not returned.
+        """
+        started = time.monotonic()
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = started + max_wait
+        # Beyond one full bucket, every token has to be refilled first
+        if (tokens - self.burst) / (self.refill_per_ms * 1000) > max_wait:
+            self.timed_out += 1
+            raise RateLimitTimeout(
+                f"{tokens} {self.name} rate limit tokens cannot refill within {max_wait:.1f}s"
+            )
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._queue:
+                remaining_tokens = tokens
+                while remaining_tokens > 0:
+                    chunk = min(remaining_tokens, self.burst)
+                    wait_ms = await self._take(chunk)
+                    if wait_ms <= 0:
+                        remaining_tokens -= chunk
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if wait_ms / 1000 > remaining:
+                        self.timed_out += 1
+                        raise RateLimitTimeout(
+                            f"No {self.name} rate limit token within {deadline - started:.1f}s"
+                        )
+                    await asyncio.sleep(wait_ms / 1000)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+        return waited
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "period": self.period,
+            "burst": self.burst,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "timed_out": self.timed_out,
+            "avg_wait": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            "max_wait": round(self.max_wait_seen, 3),
+        }
+
+# One governor per rate-limited provider, shared by every client in the process
+governors: Dict[str, RateGovernor] = {
+    "facebook": RateGovernor(
+        "facebook",
+        limit=settings.FACEBOOK_RATE_LIMIT,
+        period=3600,
+        burst=settings.FACEBOOK_RATE_BURST,
+        max_wait=settings.FACEBOOK_RATE_MAX_WAIT
+    ),
+    "calendly": RateGovernor(
+        "calendly",
+        limit=settings.CALENDLY_RATE_LIMIT,
+        period=60,
+        burst=settings.CALENDLY_RATE_BURST,
+        max_wait=settings.CALENDLY_RATE_MAX_WAIT
+    ),
+    "messenger": RateGovernor(
+        "messenger",
+        limit=settings.MESSENGER_RATE_LIMIT,
+        period=1,
+        burst=settings.MESSENGER_RATE_BURST,
+        max_wait=settings.MESSENGER_RATE_MAX_WAIT
+    ),
+}
+
+def governor_metrics() -> Dict[str, Dict[str, Any]]:
+    return {name: governor.metrics() for name, governor in governors.items()}
@@ -0,0 +1,199 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+import logging
+import aiohttp
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from config import settings
+from services.rate_governor import RateGovernor, governors
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class UpstreamServerError(Exception):
+    """Raised for 5xx/429 responses so they count as failures and can be retried"""
+
+    def __init__(self, status: int):
+        super().__init__(f"Upstream returned {status}")
+        self.status = status
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the upstream's circuit is open"""
+
+class BulkheadFullError(Exception):
+    """Raised when no concurrency slot for the upstream frees up in time"""
+
+RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+    UpstreamServerError,
+)
+
+def raise_for_retryable_status(response: aiohttp.ClientResponse) -> None:
+    """
+    Turn server errors and throttling into UpstreamServerError; other statuses are left to the caller
+    """
+    if response.status >= 500 or response.status == 429:
+        raise UpstreamServerError(response.status)
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds; then a single trial call
+    is let through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def release_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning("Opening circuit for %s after %s failures", self.name, self.failures)
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+class UpstreamPolicy:
+    """
+    Timeout, retry, circuit breaker and bulkhead for one external provider.
+
+    Every attempt waits at most ``bulkhead_timeout`` for one of
+    ``max_concurrency`` slots, so a slow provider can only tie up its own
+    share of the event loop, and is cut off after ``timeout`` seconds.
+    Idempotent calls are retried with jittered exponential backoff on
+    connection errors, timeouts and 5xx/429 responses. With a ``governor``,
+    every attempt first waits for a rate limit token; that wait does not
+    hold a bulkhead slot or count toward the timeout.
+    """
+
+    def __init__(self,
+                 name: str,
+                 timeout: float,
+                 max_attempts: int = 3,
+                 max_concurrency: int = 20,
+                 bulkhead_timeout: float = 1.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+                 governor: Optional[RateGovernor] = None):
+        self.name = name
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.bulkhead_timeout = bulkhead_timeout
+        self.retry_on = retry_on
+        self.governor = governor
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def call(self, func: Callable[[], Awaitable[T]], idempotent: bool = True, cost: int = 1) -> T:
+        """
+        Run ``func`` under this policy
+
+        Args:
+            func: Zero-argument coroutine function performing one attempt
+            idempotent: Whether the call is safe to retry
+            cost: Rate limit tokens one attempt uses (e.g. operations in a batch)
+
+        Returns:
+            Whatever ``func`` returns
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            BulkheadFullError: If no concurrency slot frees up in time
+            RateLimitTimeout: If no rate limit token frees up in time
+        """
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts if idempotent else 1),
+            wait=wait_random_exponential(multiplier=0.2, max=5),
+            retry=retry_if_exception_type(self.retry_on),
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                return await self._attempt(func, cost)
+
+    async def _attempt(self, func: Callable[[], Awaitable[T]], cost: int) -> T:
+        if self.governor is not None:
+            await self.governor.acquire(cost)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.bulkhead_timeout)
+        except asyncio.TimeoutError:
+            raise BulkheadFullError(f"Too many concurrent calls to {self.name}")
+        try:
+            self.breaker.before_call()
+            try:
+                result = await asyncio.wait_for(func(), self.timeout)
+            except self.retry_on:
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Not the provider's fault (bad input, 4xx, cancellation)
+                self.breaker.release_trial()
+                raise
+        finally:
+            self._slots.release()
+        self.breaker.record_success()
+        return result
+
+def build_policy(name: str,
+                 timeout: float,
+                 retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+                 governor: Optional[RateGovernor] = None) -> UpstreamPolicy:
+    """
+    Build a policy for one upstream using the shared retry/breaker/bulkhead settings
+    """
+    return UpstreamPolicy(
+        name,
+        timeout=timeout,
+        max_attempts=settings.RETRY_MAX_ATTEMPTS,
+        max_concurrency=settings.BULKHEAD_MAX_CONCURRENCY,
+        bulkhead_timeout=settings.BULKHEAD_WAIT_TIMEOUT,
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+        retry_on=retry_on,
+        governor=governor
+    )
+
+# One policy per upstream, shared by every client talking to it
+policies: Dict[str, UpstreamPolicy] = {
+    "mls": build_policy("mls", settings.MLS_TIMEOUT),
+    "followupboss": build_policy("followupboss", settings.FOLLOWUPBOSS_TIMEOUT),
+    "calendly": build_policy("calendly", settings.CALENDLY_TIMEOUT, governor=governors["calendly"]),
+    "facebook": build_policy("facebook", settings.FACEBOOK_TIMEOUT, governor=governors["facebook"]),
+    "messenger": build_policy("messenger", settings.FACEBOOK_TIMEOUT, governor=governors["messenger"]),
+}
+
+def get_policy(name: str) -> UpstreamPolicy:
+    return policies[name]
@@ -0,0 +1,48 @@
+import os
+
+# app.core.config requires these; the defaults match the CI Postgres service
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "test_db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ENVIRONMENT", "test")
+
+import pytest_asyncio  # noqa: E402
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from app.core.cache import close_redis  # noqa: E402
+from services.http_client import HTTPSessionManager  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    """
+    Start an aiohttp app on a local port; returns a factory taking the app
+    """
+    servers = []
+
+    async def start(app: web.Application) -> TestServer:
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
+@pytest_asyncio.fixture
+async def session_manager():
+    manager = HTTPSessionManager()
+    yield manager
+    await manager.close()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def shared_redis_pool():
+    """Drop the shared Redis pool; the next test runs on a new event loop"""
+    yield
+    await close_redis()
@@ -0,0 +1,154 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from services.facebook_graph import FacebookGraphClient, GraphAPIError
+from services.rate_governor import RateGovernor, RateLimitTimeout
+from services.resilience import UpstreamPolicy, UpstreamServerError
+
+
+class BudgetGovernor(RateGovernor):
+    """Governor with a fixed token budget instead of a Redis bucket"""
+
+    def __init__(self, budget: int, burst: int):
+        super().__init__("stub", limit=burst, period=3600, burst=burst)
+        self.max_wait = 0.1
+        self.budget = budget
+        self.charged = []
+
+    async def _take(self, tokens: int) -> int:
+        if tokens > self.budget:
+            return 60_000
+        self.budget -= tokens
+        self.charged.append(tokens)
+        return 0
+
+
+class Graph:
+    """Stub Graph API: a batch endpoint and a paged connection"""
+
+    def __init__(self, pages: int = 3, failing_batches=()):
+        self.pages = pages
+        self.failing_batches = set(failing_batches)
+        self.batches = []
+
+    async def handle_batch(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        operations = json.loads(form["batch"])
+        self.batches.append([op["relative_url"] for op in operations])
+        if len(self.batches) in self.failing_batches:
+            return web.json_response({}, status=500)
+        return web.json_response([self.run(op) for op in operations])
+
+    @staticmethod
+    def run(operation):
+        url = operation["relative_url"]
+        if url == "skipped":
+            return None
+        if url == "missing":
+            error = {"message": "Unsupported get request", "code": 100}
+            return {"code": 400, "body": json.dumps({"error": error})}
+        return {"code": 200, "body": json.dumps({"id": url})}
+
+    async def handle_feed(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("page", "1"))
+        payload = {"data": [{"id": f"{page}-{i}"} for i in range(2)]}
+        if page < self.pages:
+            next_url = request.url.with_query(page=page + 1)
+            payload["paging"] = {"next": str(next_url)}
+        return web.json_response(payload)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v18.0", self.handle_batch)
+        app.router.add_get("/v18.0/me/feed", self.handle_feed)
+        return app
+
+
+@pytest.fixture
+def graph_client(stub_server, session_manager):
+    async def start(graph: Graph, governor=None) -> FacebookGraphClient:
+        server = await stub_server(graph.app())
+        policy = UpstreamPolicy(
+            "facebook", timeout=2.0, max_attempts=1, governor=governor
+        )
+        client = FacebookGraphClient(
+            access_token="token",
+            version="v18.0",
+            session_manager=session_manager,
+            policy=policy,
+        )
+        client.base_url = str(server.make_url("/v18.0"))
+        return client
+
+    return start
+
+
+def get(url: str):
+    return {"method": "GET", "relative_url": url}
+
+
+@pytest.mark.asyncio
+async def test_batch_is_chunked_to_the_rate_limit_burst(graph_client):
+    graph = Graph()
+    governor = BudgetGovernor(budget=100, burst=3)
+    client = await graph_client(graph, governor)
+
+    results = await client.batch([get(str(i)) for i in range(7)])
+
+    assert results == [{"id": str(i)} for i in range(7)]
+    assert [len(batch) for batch in graph.batches] == [3, 3, 1]
+    assert governor.charged == [3, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_maps_errors_to_their_operations(graph_client):
+    client = await graph_client(Graph())
+
+    ok, missing, skipped = await client.batch(
+        [get("1"), get("missing"), get("skipped")]
+    )
+
+    assert ok == {"id": "1"}
+    assert isinstance(missing, GraphAPIError)
+    assert (missing.status, missing.code) == (400, 100)
+    assert isinstance(skipped, GraphAPIError)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_request_only_fails_its_chunk(graph_client):
+    graph = Graph(failing_batches={2})
+    client = await graph_client(graph, BudgetGovernor(budget=100, burst=2))
+
+    results = await client.batch([get(str(i)) for i in range(5)])
+
+    assert results[:2] == [{"id": "0"}, {"id": "1"}]
+    assert all(isinstance(r, UpstreamServerError) for r in results[2:4])
+    assert results[4] == {"id": "4"}
+
+
+@pytest.mark.asyncio
+async def test_batch_stops_once_the_rate_budget_runs_out(graph_client):
+    graph = Graph()
+    client = await graph_client(graph, BudgetGovernor(budget=4, burst=2))
+
+    results = await client.batch([get(str(i)) for i in range(7)])
+
+    assert results[:4] == [{"id": str(i)} for i in range(4)]
+    assert all(isinstance(r, RateLimitTimeout) for r in results[4:])
+    assert len(results) == 7
+    assert len(graph.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_follows_paging_next(graph_client):
+    client = await graph_client(Graph(pages=3))
+
+    pages = [page async for page in client.iter_pages("me/feed")]
+
+    assert [[item["id"] for item in page] for page in pages] == [
+        ["1-0", "1-1"],
+        ["2-0", "2-1"],
+        ["3-0", "3-1"],
+    ]
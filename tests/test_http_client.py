@@ -0,0 +1,50 @@
+import pytest
+from aiohttp import web
+
+from services.mls_service import MLSService
+from services.resilience import UpstreamPolicy
+
+
+class CountingServer:
+    """Stub MLS that records which client connection each request came on"""
+
+    def __init__(self):
+        self.connections = set()
+        self.requests = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.connections.add(request.transport.get_extra_info("peername"))
+        self.requests += 1
+        return web.json_response({"properties": [], "total": 0})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/properties", self.handle)
+        return app
+
+
+@pytest.mark.asyncio
+async def test_clients_reuse_pooled_connections(stub_server, session_manager):
+    counter = CountingServer()
+    server = await stub_server(counter.app())
+    services = [MLSService(session_manager=session_manager) for _ in range(2)]
+    for service in services:
+        service.base_url = str(server.make_url("")).rstrip("/")
+        service.policy = UpstreamPolicy("mls", timeout=2.0)
+
+    for page in range(10):
+        await services[page % 2].fetch_properties_page(page=page + 1)
+
+    assert counter.requests == 10
+    assert len(counter.connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_session_is_rebuilt_on_next_use(session_manager):
+    session = await session_manager.get_session()
+    await session_manager.close()
+
+    assert session.closed
+    rebuilt = await session_manager.get_session()
+    assert rebuilt is not session
+    assert not rebuilt.closed
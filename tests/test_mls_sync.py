@@ -0,0 +1,160 @@
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.models import appointment, lead, marketplace, user  # noqa: F401
+from app.models.base import Base
+from app.models.property import Property
+from app.models.sync_checkpoint import SyncCheckpoint
+from services.mls_service import MLSService
+from services.mls_sync import MLSSyncEngine
+from services.resilience import UpstreamPolicy
+
+SYNC_NAME = "mls-test"
+MLS_PREFIX = "test-sync-"
+
+
+class MLS:
+    """Stub MLS serving ``total`` listings, failing the pages in ``failing``"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.price = 100_000
+        self.failing = set()
+        self.requested = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        page = int(request.query["page"])
+        size = int(request.query["page_size"])
+        self.requested.append(page)
+        if page in self.failing:
+            return web.json_response({"error": "bad page"}, status=400)
+        numbers = range((page - 1) * size, min(page * size, self.total))
+        listings = [self.listing(n) for n in numbers]
+        payload = {"properties": listings, "total": self.total}
+        return web.json_response(payload)
+
+    def listing(self, number: int) -> dict:
+        return {
+            "id": f"{MLS_PREFIX}{number}",
+            "title": f"Listing {number}",
+            "price": self.price,
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/properties", self.handle)
+        return app
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    # The model imports above register every class Property's relationships use
+    engine = create_async_engine(get_settings().SQLALCHEMY_DATABASE_URI)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"Postgres is not available: {e}")
+
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def clean():
+        async with factory() as db:
+            await db.execute(
+                delete(Property).where(Property.mls_id.like(f"{MLS_PREFIX}%"))
+            )
+            await db.execute(
+                delete(SyncCheckpoint).where(SyncCheckpoint.name == SYNC_NAME)
+            )
+            await db.commit()
+
+    await clean()
+    yield factory
+    await clean()
+    await engine.dispose()
+
+
+@pytest.fixture
+def sync_engine(stub_server, session_manager, session_factory):
+    async def start(mls: MLS) -> MLSSyncEngine:
+        server = await stub_server(mls.app())
+        service = MLSService(session_manager=session_manager)
+        service.base_url = str(server.make_url("")).rstrip("/")
+        service.policy = UpstreamPolicy("mls", timeout=2.0, max_attempts=1)
+        return MLSSyncEngine(
+            mls_service=service,
+            session_factory=session_factory,
+            name=SYNC_NAME,
+            concurrency=2,
+            page_size=5,
+        )
+
+    return start
+
+
+async def synced(factory):
+    async with factory() as db:
+        count = await db.scalar(
+            select(func.count())
+            .select_from(Property)
+            .where(Property.mls_id.like(f"{MLS_PREFIX}%"))
+        )
+        prices = await db.scalars(
+            select(Property.price)
+            .where(Property.mls_id.like(f"{MLS_PREFIX}%"))
+            .distinct()
+        )
+        checkpoint = await db.scalar(
+            select(SyncCheckpoint).where(SyncCheckpoint.name == SYNC_NAME)
+        )
+        return count, set(prices), checkpoint
+
+
+@pytest.mark.asyncio
+async def test_sync_resumes_after_a_crash(sync_engine, session_factory):
+    mls = MLS(total=25)
+    engine = await sync_engine(mls)
+
+    # Pages 1-3 are committed before the window holding page 4 fails
+    mls.failing = {4}
+    with pytest.raises(aiohttp.ClientResponseError):
+        await engine.run()
+    count, _, checkpoint = await synced(session_factory)
+    assert count == 15
+    assert checkpoint.next_page == 4
+    assert checkpoint.run_started_at is not None
+
+    mls.failing = set()
+    mls.requested = []
+    stats = await engine.run()
+
+    assert stats.resumed_from_page == 4
+    assert sorted(mls.requested) == [4, 5]
+    count, _, checkpoint = await synced(session_factory)
+    assert count == 25
+    assert checkpoint.run_started_at is None
+    assert checkpoint.watermark is not None
+    assert checkpoint.next_page == 1
+
+
+@pytest.mark.asyncio
+async def test_full_sync_updates_listings(sync_engine, session_factory):
+    mls = MLS(total=12)
+    engine = await sync_engine(mls)
+    await engine.run()
+
+    mls.price = 125_000
+    stats = await engine.run(full=True)
+
+    assert stats.upserted == 12
+    count, prices, _ = await synced(session_factory)
+    assert count == 12
+    assert prices == {125_000}
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from services import resilience
+from services.resilience import UpstreamPolicy, UpstreamServerError
+
+
+class Upstream:
+    """Stub provider answering with a scripted list of statuses"""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.hits = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        await self.release.wait()
+        status = self.statuses.pop(0) if self.statuses else 200
+        return web.json_response({"hit": self.hits}, status=status)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/", self.handle)
+        return app
+
+
+@pytest.fixture
+def upstream(stub_server, session_manager):
+    async def start(*statuses: int):
+        provider = Upstream(*statuses)
+        server = await stub_server(provider.app())
+        url = str(server.make_url("/"))
+
+        async def call():
+            session = await session_manager.get_session()
+            async with session.get(url) as response:
+                resilience.raise_for_retryable_status(response)
+                response.raise_for_status()
+                return await response.json()
+
+        return provider, call
+
+    return start
+
+
+def make_policy(**kwargs) -> UpstreamPolicy:
+    options = {"timeout": 2.0, "max_attempts": 1, "failure_threshold": 5}
+    options.update(kwargs)
+    return UpstreamPolicy("stub", **options)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_calls_are_retried(upstream):
+    provider, call = await upstream(503, 429)
+    policy = make_policy(max_attempts=3)
+
+    assert await policy.call(call, idempotent=True) == {"hit": 3}
+    assert provider.hits == 3
+    assert policy.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_calls_are_not_retried(upstream):
+    provider, call = await upstream(503)
+    policy = make_policy(max_attempts=3)
+
+    with pytest.raises(UpstreamServerError):
+        await policy.call(call, idempotent=False)
+    assert provider.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried_or_counted(upstream):
+    provider, call = await upstream(404)
+    policy = make_policy(max_attempts=3, failure_threshold=1)
+
+    with pytest.raises(Exception) as raised:
+        await policy.call(call)
+    assert not isinstance(raised.value, UpstreamServerError)
+    assert provider.hits == 1
+    assert policy.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures(upstream):
+    provider, call = await upstream(500, 500, 200)
+    policy = make_policy(failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(UpstreamServerError):
+            await policy.call(call)
+    assert policy.breaker.state == "open"
+
+    with pytest.raises(resilience.CircuitOpenError):
+        await policy.call(call)
+    assert provider.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_success_closes_circuit(upstream):
+    provider, call = await upstream(500)
+    policy = make_policy(failure_threshold=1, reset_timeout=0.05)
+
+    with pytest.raises(UpstreamServerError):
+        await policy.call(call)
+    await asyncio.sleep(0.06)
+    assert policy.breaker.state == "half_open"
+
+    # Only one trial call is let through while half open
+    provider.release.clear()
+    trial = asyncio.create_task(policy.call(call))
+    await asyncio.sleep(0.05)
+    with pytest.raises(resilience.CircuitOpenError):
+        await policy.call(call)
+    provider.release.set()
+
+    assert await trial == {"hit": 2}
+    assert policy.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_failure_reopens_circuit(upstream):
+    provider, call = await upstream(500, 500)
+    policy = make_policy(failure_threshold=1, reset_timeout=0.05)
+
+    with pytest.raises(UpstreamServerError):
+        await policy.call(call)
+    await asyncio.sleep(0.06)
+
+    with pytest.raises(UpstreamServerError):
+        await policy.call(call)
+    assert policy.breaker.state == "open"
+    with pytest.raises(resilience.CircuitOpenError):
+        await policy.call(call)
+    assert provider.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_calls_beyond_its_slots(upstream):
+    provider, call = await upstream()
+    policy = make_policy(max_concurrency=1, bulkhead_timeout=0.05)
+
+    provider.release.clear()
+    first = asyncio.create_task(policy.call(call))
+    await asyncio.sleep(0.05)
+    with pytest.raises(resilience.BulkheadFullError):
+        await policy.call(call)
+    provider.release.set()
+
+    assert await first == {"hit": 1}
+    assert provider.hits == 1
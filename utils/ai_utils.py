@@ -1,18 +1,24 @@
 from typing import Dict, Any, List, Optional
 import logging
+import random
 from datetime import datetime
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
 class PropertyRecommender:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+        self._vectorizer = None
         self.property_vectors = None
         self.properties = []
 
+    @property
+    def vectorizer(self):
+        """TF-IDF vectorizer, imported on first use to keep scikit-learn off the import path"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer()
+        return self._vectorizer
+
     def train(self, properties: List[Dict[str, Any]]):
         """
         Train the recommender system with property data
@@ -34,7 +40,7 @@ class PropertyRecommender:
             self.property_vectors = self.vectorizer.fit_transform(descriptions)
             
         except Exception as e:
-            logger.error(f"Error training recommender: {str(e)}")
+            logger.error("Error training recommender: %s", e)
             raise
 
     def get_recommendations(self,
@@ -51,9 +57,12 @@ class PropertyRecommender:
             List of recommended properties
         """
         try:
-            if not self.property_vectors or not self.properties:
+            if self.property_vectors is None or not self.properties:
                 return []
 
+            import numpy as np
+            from sklearn.metrics.pairwise import cosine_similarity
+
             # Create preference description
             pref_description = (
                 f"{preferences.get('property_type', '')} "
@@ -74,7 +83,7 @@ class PropertyRecommender:
             return recommendations
 
         except Exception as e:
-            logger.error(f"Error getting recommendations: {str(e)}")
+            logger.error("Error getting recommendations: %s", e)
             return []
 
 class LeadScorer:
@@ -115,7 +124,7 @@ class LeadScorer:
             return min(max(total_score, 0), 1)  # Ensure score is between 0 and 1
 
         except Exception as e:
-            logger.error(f"Error scoring lead: {str(e)}")
+            logger.error("Error scoring lead: %s", e)
             return 0.0
 
     def _score_response_time(self, lead_data: Dict[str, Any]) -> float:
@@ -130,7 +139,7 @@ class LeadScorer:
             return 1 / (1 + avg_response_time)
 
         except Exception as e:
-            logger.error(f"Error scoring response time: {str(e)}")
+            logger.error("Error scoring response time: %s", e)
             return 0.5
 
     def _score_engagement(self, lead_data: Dict[str, Any]) -> float:
@@ -145,7 +154,7 @@ class LeadScorer:
             return min(len(activity_types) / 5, 1)  # Normalize to 0-1
 
         except Exception as e:
-            logger.error(f"Error scoring engagement: {str(e)}")
+            logger.error("Error scoring engagement: %s", e)
             return 0.5
 
     def _score_property_interest(self, lead_data: Dict[str, Any]) -> float:
@@ -160,7 +169,7 @@ class LeadScorer:
             return min((len(viewed_properties) * total_time) / 1000, 1)  # Normalize
 
         except Exception as e:
-            logger.error(f"Error scoring property interest: {str(e)}")
+            logger.error("Error scoring property interest: %s", e)
             return 0.5
 
     def _score_budget_alignment(self, lead_data: Dict[str, Any]) -> float:
@@ -179,7 +188,7 @@ class LeadScorer:
             return 1 / (1 + price_diff / lead_budget)
 
         except Exception as e:
-            logger.error(f"Error scoring budget alignment: {str(e)}")
+            logger.error("Error scoring budget alignment: %s", e)
             return 0.5
 
     def _score_timeline(self, lead_data: Dict[str, Any]) -> float:
@@ -196,7 +205,7 @@ class LeadScorer:
             return min(urgency_score / len(urgency_keywords), 1)
 
         except Exception as e:
-            logger.error(f"Error scoring timeline: {str(e)}")
+            logger.error("Error scoring timeline: %s", e)
             return 0.5
 
 class MessageGenerator:
@@ -242,11 +251,11 @@ class MessageGenerator:
                 raise ValueError(f"Unknown message type: {message_type}")
 
             # Select a random template for the message type
-            template = np.random.choice(self.templates[message_type])
+            template = random.choice(self.templates[message_type])
             
             # Format the template with context
             return template.format(**context)
 
         except Exception as e:
-            logger.error(f"Error generating message: {str(e)}")
+            logger.error("Error generating message: %s", e)
             return "I apologize, but I'm having trouble generating a message. Please try again later." 
\ No newline at end of file